@@ -40,11 +40,7 @@ if LOCAL_WORLD_SIZE > 1 and len(GPU_LIST):
 
 
 from vlmeval.config import supported_VLM
-from vlmeval.dataset.video_dataset_config import supported_video_datasets
 from vlmeval.dataset import build_dataset
-from vlmeval.inference import infer_data_job
-from vlmeval.inference_video import infer_data_job_video
-from vlmeval.inference_mt import infer_data_job_mt
 from vlmeval.smp import *
 from vlmeval.utils.result_transfer import MMMU_result_transfer, MMTBench_result_transfer
 
@@ -78,6 +74,7 @@ def build_dataset_from_config(cfg, dataset_name):
     import inspect
     config = cp.deepcopy(cfg[dataset_name])
     if config == {}:
+        from vlmeval.dataset.video_dataset_config import supported_video_datasets
         return supported_video_datasets[dataset_name]()
     assert 'class' in config
     cls_name = config.pop('class')
@@ -95,6 +92,40 @@ def build_dataset_from_config(cfg, dataset_name):
         raise ValueError(f'Class {cls_name} is not supported in `vlmeval.dataset`')
 
 
+def build_dataset_distributed(build_fn, dataset_name, work_dir=None):
+    """Build the dataset when WORLD_SIZE > 1: rank 0 builds it first (to do the preparation works, e.g. download).
+
+    With `VLMEVAL_SHARE_DATASET=1`, the dataset is built once per node (by local rank 0) and handed over to the
+    other local ranks, which attach to it (the images are memory-mapped from `/dev/shm`) instead of rebuilding it.
+    Otherwise, every rank builds the dataset again after rank 0.
+    """
+    import torch.distributed as dist
+    dataset = build_fn() if RANK == 0 else None
+    dist.barrier()
+    if os.environ.get('VLMEVAL_SHARE_DATASET', '0') != '1':
+        return dataset if RANK == 0 else build_fn()
+
+    from vlmeval.dataset.shared import shared_prefix, share_dataset, attach_dataset
+    local_rank = int(os.environ.get('LOCAL_RANK', 0))
+    prefix = shared_prefix(dataset_name, work_dir)
+    files = []
+    if local_rank == 0:
+        if RANK != 0:
+            dataset = build_fn()
+        if dataset is not None:
+            files = share_dataset(dataset, prefix)
+    dist.barrier()
+    if local_rank != 0:
+        dataset = attach_dataset(prefix)
+        if dataset is None:
+            dataset = build_fn()
+    dist.barrier()
+    # The attached ranks keep the memory-mapped files open, removing them only unlinks the names
+    for f in files:
+        os.remove(f)
+    return dataset
+
+
 def parse_args():
     help_msg = """\
 You can launch the evaluation by setting either --data and --model or --config.
@@ -195,6 +226,12 @@ You can launch the evaluation by setting either --data and --model or --config.
     parser.add_argument(
         '--use-vllm', action='store_true', help='use vllm to generate, the flag is only supported in Llama4 for now')
     parser.add_argument('--use-verifier', action='store_true', help='use verifier to evaluate')
+    parser.add_argument(
+        '--batch-size', type=int, default=1,
+        help='batch size for local VLMs implementing `generate_batch_inner`, ignored by other models')
+    parser.add_argument(
+        '--paranoid', action='store_true',
+        help='fully decode images to validate them, rather than trusting the cached validation results')
 
     args = parser.parse_args()
     return args
@@ -221,6 +258,9 @@ def main():
     if 'MMEVAL_ROOT' in os.environ:
         args.work_dir = os.environ['MMEVAL_ROOT']
 
+    if args.paranoid:
+        os.environ['VLMEVAL_PARANOID'] = '1'
+
     if not use_config:
         for k, v in supported_VLM.items():
             if hasattr(v, 'keywords') and 'retry' in v.keywords and args.retry is not None:
@@ -276,10 +316,10 @@ def main():
 
                 if use_config:
                     if WORLD_SIZE > 1:
-                        if RANK == 0:
-                            dataset = build_dataset_from_config(cfg['data'], dataset_name)
-                        dist.barrier()
-                    dataset = build_dataset_from_config(cfg['data'], dataset_name)
+                        dataset = build_dataset_distributed(
+                            partial(build_dataset_from_config, cfg['data'], dataset_name), dataset_name, args.work_dir)
+                    else:
+                        dataset = build_dataset_from_config(cfg['data'], dataset_name)
                     if dataset is None:
                         logger.error(f'Dataset {dataset_name} is not valid, will be skipped. ')
                         continue
@@ -290,11 +330,10 @@ def main():
 
                     # If distributed, first build the dataset on the main process for doing preparation works
                     if WORLD_SIZE > 1:
-                        if RANK == 0:
-                            dataset = build_dataset(dataset_name, **dataset_kwargs)
-                        dist.barrier()
-
-                    dataset = build_dataset(dataset_name, **dataset_kwargs)
+                        dataset = build_dataset_distributed(
+                            partial(build_dataset, dataset_name, **dataset_kwargs), dataset_name, args.work_dir)
+                    else:
+                        dataset = build_dataset(dataset_name, **dataset_kwargs)
                     if dataset is None:
                         logger.error(f'Dataset {dataset_name} is not valid, will be skipped. ')
                         continue
@@ -315,6 +354,10 @@ def main():
                     model = model_name  # which is only a name
 
                 if args.mode != "eval":
+                    # The inference modules import torch, they are not needed in the eval mode
+                    from vlmeval.inference import infer_data_job
+                    from vlmeval.inference_video import infer_data_job_video
+                    from vlmeval.inference_mt import infer_data_job_mt
                     # Perform the Inference
                     if dataset.MODALITY == 'VIDEO':
                         model = infer_data_job_video(
@@ -345,7 +388,8 @@ def main():
                             verbose=args.verbose,
                             api_nproc=args.api_nproc,
                             ignore_failed=args.ignore,
-                            use_vllm=args.use_vllm)
+                            use_vllm=args.use_vllm,
+                            batch_size=args.batch_size)
 
                 # Set the judge kwargs first before evaluation or dumping
 
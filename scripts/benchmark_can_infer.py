@@ -0,0 +1,64 @@
+"""Benchmark the throughput of the heuristic answer extraction of MCQ evaluation.
+
+Compares the per-row path (`can_infer` on each record, as `mcq_vanilla_eval` used to do) with the batch one
+(`can_infer_many`) on synthetic predictions, and checks that both return the same answers.
+
+Usage:
+    python scripts/benchmark_can_infer.py [--rows 100000] [--seed 0]
+"""
+import time
+import string
+import random
+import argparse
+import numpy as np
+import pandas as pd
+from vlmeval.utils import can_infer, can_infer_many
+
+OPTIONS = ['cat', 'dog', 'red car', 'a blue bird', '1', 2.0, 'None of the above']
+PATTERNS = [
+    '{ch}', '{ch}.', '({ch})', 'The answer is {ch}.', 'Answer: {ch}', '**{ch}**', '{text}', 'It should be {text}.',
+    'A or {ch}', 'I think the image shows {text}, so the answer is {ch}', 'Cannot determine the answer', 'hmm',
+]
+
+
+def synthesize(rows, seed):
+    rd = random.Random(seed)
+    records = []
+    for _ in range(rows):
+        k = rd.choice([2, 3, 4, 5])
+        record = {ch: rd.choice(OPTIONS) if i < k else np.nan for i, ch in enumerate(string.ascii_uppercase[:5])}
+        ch = rd.choice(string.ascii_uppercase[:k])
+        record['prediction'] = rd.choice(PATTERNS).format(ch=ch, text=record[ch])
+        records.append(record)
+    return pd.DataFrame(records)
+
+
+def per_row(data):
+    ret = []
+    for i in range(len(data)):
+        item = data.iloc[i]
+        choices = {ch: item[ch] for ch in string.ascii_uppercase if ch in item and not pd.isna(item[ch])}
+        ret.append(can_infer(item['prediction'], choices))
+    return ret
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    data = synthesize(args.rows, args.seed)
+    results = {}
+    for name, func in [('per-row', per_row), ('batch', lambda x: can_infer_many(x['prediction'], x))]:
+        start = time.perf_counter()
+        results[name] = func(data)
+        elapsed = time.perf_counter() - start
+        print(f'{name:<8} {elapsed:8.3f}s  {args.rows / elapsed:10.0f} rows/s')
+    assert results['per-row'] == results['batch'], 'can_infer_many disagrees with can_infer'
+    ambiguous = sum(not x for x in results['batch'])
+    print(f'Ambiguous rows (sent to the judge): {ambiguous} / {args.rows}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark the startup time of VLMEvalKit entry points, to guard against import-time regressions.
+
+Each case runs in a fresh interpreter (so nothing is cached in `sys.modules`), the median wall time is reported
+together with the number of dataset / model modules that got imported, and whether torch got imported.
+The dataset registry cache is warmed up first.
+
+Usage:
+    python scripts/benchmark_startup.py [--repeat 3] [--max-seconds 5] [--case dataset_type ...]
+"""
+import sys
+import json
+import time
+import argparse
+import subprocess
+import os.path as osp
+
+RUN_PY = osp.join(osp.dirname(osp.dirname(osp.abspath(__file__))), 'run.py')
+
+PROBE = """
+import sys, json, time
+t = time.perf_counter()
+{code}
+print(json.dumps(dict(
+    seconds=time.perf_counter() - t,
+    dataset_modules=len([m for m in sys.modules if m.startswith('vlmeval.dataset.')]),
+    model_modules=len([m for m in sys.modules if m.startswith(('vlmeval.vlm.', 'vlmeval.api.'))]),
+    torch='torch' in sys.modules)))
+"""
+
+CASES = {
+    'import_vlmeval': 'import vlmeval',
+    'import_dataset': 'import vlmeval.dataset',
+    'supported_vlm': "from vlmeval.config import supported_VLM; supported_VLM['GPT4o'].func.is_api",
+    'supported_datasets': 'from vlmeval.dataset import SUPPORTED_DATASETS; len(SUPPORTED_DATASETS)',
+    'dataset_type': (
+        "from vlmeval.dataset import DATASET_TYPE, DATASET_MODALITY; "
+        "DATASET_TYPE('MMBench_DEV_EN'); DATASET_MODALITY('Video-MME')"
+    ),
+    'dataset_class': "from vlmeval.dataset import dataset_registry, dataset_class; "
+                     "dataset_class(dataset_registry()['datasets']['MMBench_DEV_EN']['cls'])",
+    'vlmutil_dlist': (
+        "import io, contextlib; from vlmeval.tools import cli; sys.argv = ['vlmutil', 'dlist', 'all']\n"
+        "with contextlib.redirect_stdout(io.StringIO()): cli()"
+    ),
+    # The imports of `run.py`, which are all that the eval mode needs before loading the predictions
+    'run_help': (
+        "import io, runpy, contextlib; sys.argv = ['run.py', '--help']\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        "        runpy.run_path(RUN_PY, run_name='__main__')\n"
+        "    except SystemExit:\n"
+        "        pass"
+    ),
+}
+
+
+def run_case(code):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-c', PROBE.format(code=code.replace('RUN_PY', repr(RUN_PY)))],
+        capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    probe = json.loads(proc.stdout.strip().split('\n')[-1])
+    probe['wall'] = wall
+    return probe
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--case', type=str, nargs='+', default=list(CASES), choices=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='Exit with status 1 if the median wall time of any case exceeds this threshold. ')
+    args = parser.parse_args()
+
+    # Warm up the dataset registry cache (and the OS file cache)
+    run_case('from vlmeval.dataset import dataset_registry; dataset_registry()')
+    failed = []
+    for name in args.case:
+        probes = sorted((run_case(CASES[name]) for _ in range(args.repeat)), key=lambda x: x['wall'])
+        probe = probes[len(probes) // 2]
+        print(f"{name:<20} wall {probe['wall']:7.3f}s  in-process {probe['seconds']:7.3f}s  "
+              f"dataset modules {probe['dataset_modules']:3d}  model modules {probe['model_modules']:3d}  "
+              f"torch {probe['torch']}")
+        if args.max_seconds is not None and probe['wall'] > args.max_seconds:
+            failed.append(name)
+    if failed:
+        print(f'Startup time regression (> {args.max_seconds}s): {failed}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
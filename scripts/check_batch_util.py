@@ -0,0 +1,111 @@
+"""Check the batch scheduling of inference (`vlmeval/utils/batch_util.py`) on CPU, with a dummy model.
+
+Covers: the length / layout bucketing of `make_batches`, restoring the original order of the responses (as done
+by `infer_data`), and the fallback to per-sample `generate` when a batched call fails.
+
+Usage:
+    python scripts/check_batch_util.py [--samples 500] [--batch-size 8] [--seed 0]
+"""
+import random
+import argparse
+from vlmeval.utils.batch_util import make_batches, message_layout, message_cost, generate_batch_with_fallback
+
+
+class DummyModel:
+    """Answers each message with its text. `generate_batch` fails on batches holding a message with `fail`."""
+
+    def __init__(self):
+        self.batch_calls, self.single_calls = 0, 0
+
+    @staticmethod
+    def answer(message):
+        return ' '.join(item['value'] for item in message if item['type'] == 'text')
+
+    def generate(self, message, dataset=None):
+        self.single_calls += 1
+        return self.answer(message)
+
+    def generate_batch(self, messages, dataset=None):
+        self.batch_calls += 1
+        if any('fail' in self.answer(msg) for msg in messages):
+            raise RuntimeError('CUDA out of memory (dummy)')
+        return [self.answer(msg) for msg in messages]
+
+
+def synthesize(samples, seed):
+    rd = random.Random(seed)
+    messages = []
+    for i in range(samples):
+        msg = [dict(type='image', value=f'{i}_{j}.jpg') for j in range(rd.choice([0, 1, 1, 2]))]
+        if rd.random() < 0.1:
+            msg.append(dict(type='video', value=f'{i}.mp4'))
+        text = f'sample {i} ' + 'x' * rd.randint(0, 500)
+        if rd.random() < 0.02:
+            text += ' fail'
+        msg.append(dict(type='text', value=text))
+        messages.append(msg)
+    return messages
+
+
+def check_bucketing(messages, batch_size):
+    batches = make_batches(messages, batch_size)
+    positions = sorted(i for batch in batches for i in batch)
+    assert positions == list(range(len(messages))), 'Each message should be scheduled exactly once'
+    for batch in batches:
+        assert 1 <= len(batch) <= batch_size
+        assert len({message_layout(messages[i]) for i in batch}) == 1, 'A batch should hold a single layout'
+    # Within a layout bucket, batches go from short to long
+    last = {}
+    for batch in batches:
+        layout, costs = message_layout(messages[batch[0]]), [message_cost(messages[i]) for i in batch]
+        assert costs == sorted(costs)
+        assert last.get(layout, -1) <= costs[0]
+        last[layout] = costs[-1]
+    return batches
+
+
+def check_order(messages, batches):
+    model = DummyModel()
+    responses = [None] * len(messages)
+    for batch in batches:
+        for j, response in zip(batch, generate_batch_with_fallback(model, [messages[j] for j in batch])):
+            responses[j] = response
+    assert responses == [DummyModel.answer(msg) for msg in messages], 'Responses should be in the original order'
+    return model
+
+
+def check_fallback():
+    messages = [[dict(type='text', value='a')], [dict(type='text', value='b fail')], [dict(type='text', value='c')]]
+    model = DummyModel()
+    assert generate_batch_with_fallback(model, messages) == ['a', 'b fail', 'c']
+    assert (model.batch_calls, model.single_calls) == (1, 3)
+
+    # A batched call returning a wrong number of responses also falls back
+    model = DummyModel()
+    model.generate_batch = lambda msgs, dataset=None: ['only one']
+    assert generate_batch_with_fallback(model, messages) == ['a', 'b fail', 'c']
+    assert model.single_calls == 3
+
+    # A custom per-sample function is used for the fallback
+    model = DummyModel()
+    ret = generate_batch_with_fallback(model, messages, generate_one=lambda msg: 'one: ' + DummyModel.answer(msg))
+    assert ret == ['one: a', 'one: b fail', 'one: c']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--samples', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    messages = synthesize(args.samples, args.seed)
+    batches = check_bucketing(messages, args.batch_size)
+    model = check_order(messages, batches)
+    check_fallback()
+    print(f'OK: {len(messages)} messages in {len(batches)} batches, '
+          f'{model.batch_calls} batched calls, {model.single_calls} per-sample calls (fallback). ')
+
+
+if __name__ == '__main__':
+    main()
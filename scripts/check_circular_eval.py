@@ -0,0 +1,207 @@
+"""Check that the circular MCQ evaluation (`mcq_circular_eval`) gives the same outputs as its previous, per-group
+implementation (frozen below), on synthetic circular data.
+
+Both implementations run through the tail of `ImageMCQDataset.evaluate` (dump the `_result` records, report the
+`_acc`), with exact matching and with a deterministic fake judge, from scratch and from a partial `_result.pkl`.
+The `_result.pkl`, `_result.tsv` and `_acc.csv` files should be bit-identical, and so should the members of
+`_result.xlsx` (except `docProps/core.xml`, which holds the creation time). With the judge, the records of
+`_result.pkl` are compared once sorted by key: `track_progress_rich` saves the judged groups in their order of
+completion, which varies from run to run with either implementation.
+
+Usage:
+    python scripts/check_circular_eval.py [--groups 300] [--seed 0]
+"""
+import os
+import pickle
+import random
+import string
+import hashlib
+import zipfile
+import argparse
+import tempfile
+import pandas as pd
+from vlmeval.smp import load, dump, istype, get_logger
+from vlmeval.utils import track_progress_rich
+from vlmeval.dataset.utils.multiple_choice import (
+    mcq_circular_eval, eval_circular_group, prefetch_answer, report_acc)
+
+OPTIONS = ['cat', 'dog', 'red car', 'a blue bird', '42', 'None of the above']
+PATTERNS = [
+    '{ch}', '({ch})', 'The answer is {ch}.', '{text}', 'It should be {text}.', 'A or {ch}', 'Cannot tell', 'hmm']
+
+
+# The previous implementation, kept as the reference
+def old_prefetch_circular_group(sub_data, verbose=False):
+    lt = len(sub_data)
+    GT, PRED = [], []
+    for i in range(lt):
+        item = sub_data.iloc[i]
+        GT.append(item['GT'])
+        PRED.append(prefetch_answer(item))
+        if PRED[-1] and (GT[-1] != PRED[-1]):
+            log = (
+                f'Failed in Prefetching Rolling {i}: Answer is {GT[-1]}, '
+                f"Prediction is {item['prediction']}, Pre-fetched is {PRED[-1]}. "
+            )
+            return dict(hit=0, log=log)
+    flag = True
+    for g, p in zip(GT, PRED):
+        if g != p:
+            flag = False
+    ret = (dict(hit=1, log='Succeed During Pre-fetching'), ) if flag else (None, )
+    ret = ret + (GT, PRED) if verbose else ret
+    return ret if len(ret) > 1 else ret[0]
+
+
+def old_mcq_circular_eval(model, data, meta, nproc, result_file, dataset_name=None):
+    result = {}
+    if os.path.exists(result_file):
+        result = load(result_file)
+    answer_map = {i: c for i, c in zip(meta['index'], meta['answer'])}
+
+    for idx in list(meta['index']) + list(data['index']):
+        assert istype(idx, int)
+    if 'g_index' not in data:
+        data['g_index'] = [int(x % 1e6) for x in data['index']]
+
+    data = data[data['index'].isin(answer_map)]
+    data['GT'] = [answer_map[idx] for idx in data['index']]
+
+    data['tmp_flag'] = [x == y for x, y in zip(data['index'], data['g_index'])]
+    data_main = data[data['tmp_flag']]
+    data_main.pop('tmp_flag')
+
+    data_groups = []
+    for i in range(len(data_main)):
+        idx = data_main.iloc[i]['index']
+        if idx not in result:
+            sub_data = data[data['g_index'] == idx]
+            data_groups.append(sub_data)
+
+    if len(data_groups):
+        prefetched = [old_prefetch_circular_group(g, verbose=False) for g in data_groups]
+        remain = []
+        for dg, pf in zip(data_groups, prefetched):
+            if pf is not None:
+                result[dg.iloc[0]['g_index']] = pf
+            else:
+                remain.append(dg)
+        dump(result, result_file)
+
+        tups = [dict(model=model, sub_data=x, dataset_name=dataset_name) for x in remain]
+        keys = [x.iloc[0]['g_index'] for x in remain]
+
+        if len(tups) == 0:
+            pass
+        elif model is None:
+            logger = get_logger('Evaluation')
+            logger.warning('Exact Matching mode, will not do GPT-based answer matching. ')
+            for k in keys:
+                result[k] = dict(
+                    hit=0, log='Failed in Prefetch, no GPT-based answer matching under `exact_matching` policy.')
+        else:
+            res = track_progress_rich(
+                eval_circular_group, tups, nproc=nproc, chunksize=nproc, save=result_file, keys=keys)
+            result = load(result_file)
+            for k, v in zip(keys, res):
+                if k not in result:
+                    result[k] = v
+
+    tmp_pth = os.path.join(os.path.dirname(result_file), 'tmp_main.xlsx')
+    dump(data_main, tmp_pth)
+    data_main = load(tmp_pth)
+    os.remove(tmp_pth)
+    indices = data_main['index']
+    data_main['hit'] = [result[i]['hit'] for i in indices]
+    data_main['log'] = [result[i]['log'] for i in indices]
+    if 'GT' in data_main:
+        data_main.pop('GT')
+    return data_main
+
+
+class FakeJudge:
+    """Answers deterministically from the md5 of the prompt, including failed and unparsable answers."""
+
+    ANSWERS = ['A', 'B', 'C', 'D', 'The answer is B', 'Failed to obtain answer via API', 'no idea']
+
+    def generate(self, prompt):
+        return self.ANSWERS[int(hashlib.md5(prompt.encode('utf-8')).hexdigest(), 16) % len(self.ANSWERS)]
+
+
+def synthesize(groups, seed):
+    rd = random.Random(seed)
+    meta, data = [], []
+    for g in range(groups):
+        k = rd.choice([2, 3, 4])
+        options, answer = rd.sample(OPTIONS, k), rd.randrange(k)
+        category = rd.choice(['coarse_perception', 'logic_reasoning', 'ocr'])
+        for j in range(k):
+            rolled = options[j:] + options[:j]
+            ch = string.ascii_uppercase[(answer - j) % k]
+            record = dict(index=g + j * 1000000, question=f'Question {g}?', answer=ch, category=category, split='dev')
+            record.update(zip(string.ascii_uppercase, rolled))
+            meta.append(record)
+            # Mostly right predictions, so that some groups are resolved while prefetching
+            pred = ch if rd.random() < 0.6 else rd.choice(string.ascii_uppercase[:k])
+            data.append(dict(record, prediction=rd.choice(PATTERNS).format(ch=pred, text=record[pred])))
+    # Predictions of records outside the meta data are dropped by the evaluation
+    data.append(dict(data[0], index=groups + 7))
+    meta, data = pd.DataFrame(meta), pd.DataFrame(data).drop(columns='answer')
+    data['prediction'] = [str(x) for x in data['prediction']]
+    return meta, data.sort_values(by='index').reset_index(drop=True)
+
+
+def evaluate(func, model, meta, data, work_dir, partial=None):
+    os.makedirs(work_dir)
+    result_file = os.path.join(work_dir, 'M_Set_judge_result.pkl')
+    if partial is not None:
+        dump(partial, result_file)
+    random.seed(0)
+    data = func(model, data.copy(), meta, 1, result_file, 'Set')
+    for fmt in ['xlsx', 'tsv']:
+        eval_record = os.path.join(work_dir, f'M_Set_judge_result.{fmt}')
+        dump(data, eval_record)
+        reloaded = load(eval_record)
+    dump(report_acc(reloaded), os.path.join(work_dir, 'M_Set_acc.csv'))
+    return load(result_file)
+
+
+def compare(old_dir, new_dir, ordered=True):
+    if not ordered:
+        old, new = [load(os.path.join(d, 'M_Set_judge_result.pkl')) for d in [old_dir, new_dir]]
+        assert pickle.dumps(dict(sorted(old.items()))) == pickle.dumps(dict(sorted(new.items()))), (
+            f'M_Set_judge_result.pkl differs between {old_dir} and {new_dir}')
+    for name in ['M_Set_judge_result.pkl', 'M_Set_judge_result.tsv', 'M_Set_acc.csv'][int(not ordered):]:
+        with open(os.path.join(old_dir, name), 'rb') as f1, open(os.path.join(new_dir, name), 'rb') as f2:
+            assert f1.read() == f2.read(), f'{name} differs between {old_dir} and {new_dir}'
+    name = 'M_Set_judge_result.xlsx'
+    with zipfile.ZipFile(os.path.join(old_dir, name)) as z1, zipfile.ZipFile(os.path.join(new_dir, name)) as z2:
+        assert z1.namelist() == z2.namelist()
+        for member in z1.namelist():
+            if member != 'docProps/core.xml':
+                assert z1.read(member) == z2.read(member), f'{name}:{member} differs between {old_dir} and {new_dir}'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--groups', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    meta, data = synthesize(args.groups, args.seed)
+    with tempfile.TemporaryDirectory() as root:
+        for mode, model in [('exact_matching', None), ('judge', FakeJudge())]:
+            full = evaluate(old_mcq_circular_eval, model, meta, data, os.path.join(root, mode, 'old'))
+            partial = {k: full[k] for k in list(full)[::3]}
+            for run, part in [('scratch', None), ('partial', partial)]:
+                old_dir, new_dir = os.path.join(root, mode, run, 'old'), os.path.join(root, mode, run, 'new')
+                evaluate(old_mcq_circular_eval, model, meta, data, old_dir, part)
+                result = evaluate(mcq_circular_eval, model, meta, data, new_dir, part)
+                compare(old_dir, new_dir, ordered=model is None)
+                hits = sum(v['hit'] for v in result.values())
+                print(f'{mode:<15}{run:<8} {len(result)} groups, {hits} hits: identical')
+    print('OK: mcq_circular_eval matches the previous implementation. ')
+
+
+if __name__ == '__main__':
+    main()
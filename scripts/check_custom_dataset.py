@@ -0,0 +1,51 @@
+"""Check that `build_dataset` falls back to the custom dataset classes for unregistered TSV files.
+
+Each check runs in a fresh process after the dataset registry has been cached to `{LMUData}/cache`, so that no
+dataset module is imported before `build_dataset` resolves the custom classes (a warm registry cache).
+
+Usage:
+    python scripts/check_custom_dataset.py
+"""
+import os
+import sys
+import tempfile
+import subprocess
+import pandas as pd
+
+# A 1x1 white PNG
+IMAGE = 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGP4//8/AAX+Av4N70a4AAAAAElFTkSuQmCC'
+CASES = {
+    'MyCustomMCQ': ('CustomMCQDataset', dict(image=IMAGE, A='cat', B='dog', answer='A')),
+    'MyCustomTextMCQ': ('CustomTextMCQDataset', dict(A='cat', B='dog', answer='A')),
+    'MyCustomVQA': ('CustomVQADataset', dict(image=IMAGE, answer='cat')),
+}
+BUILD = """
+import sys
+from vlmeval.dataset import build_dataset
+dataset = build_dataset(sys.argv[1])
+assert type(dataset).__name__ == sys.argv[2], (sys.argv[1], type(dataset).__name__)
+assert len(dataset) == 2
+"""
+
+
+def run(code, root, *args):
+    env = dict(os.environ, LMUData=root)
+    subprocess.run([sys.executable, '-c', code, *args], env=env, check=True)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        for name, (_, fields) in CASES.items():
+            records = [dict(index=i, question=f'Question {i}?', **fields) for i in range(2)]
+            pd.DataFrame(records).to_csv(os.path.join(root, f'{name}.tsv'), sep='\t', index=False)
+
+        run('from vlmeval.dataset import dataset_registry; dataset_registry()', root)
+        assert os.path.exists(os.path.join(root, 'cache', 'dataset_registry.json')), 'The registry was not cached'
+        for name, (cls, _) in CASES.items():
+            run(BUILD, root, name, cls)
+            print(f'{name}: {cls}')
+    print('OK: custom datasets built with a warm registry cache. ')
+
+
+if __name__ == '__main__':
+    main()
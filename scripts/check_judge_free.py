@@ -0,0 +1,138 @@
+"""Check the judge-free rule of MMVet (`MMVet_prefetch`, see `judge_free_rules` / `judge_free_resolve`).
+
+The rule gives a full score, without the judge, to the predictions that are exactly the ground truth (or one of its
+<OR> elements). Whether the judge would agree is checked against judgements that do not come from the rule itself:
+
+1. The few-shot examples of the GPT-4 grading prompt (`build_mmvet_gpt4_prompt`): the rule must either abstain, or
+   give the score of the example. In particular, it must abstain on the partial credits (<AND> and long answers).
+2. With `--judge-log`, the records of a previous MMVet evaluation judged by the real judge (the
+   `{model}_MMVet_{judge}.xlsx` file, with the `answer`, `prediction` and `score` columns): every record the rule
+   resolves must have been given 1.0 by the judge (the records the rule already resolved in that evaluation are
+   skipped). The share of the judge calls saved is reported.
+
+The evaluation itself is then run on synthetic records with a fake judge, with and without the rule: the records
+left to the judge must get the same results, the resolved ones 1.0, and the judge is not built when the rule
+resolves every record. LLaVABench has no rule: its relative scoring always needs the judge.
+
+Usage:
+    python scripts/check_judge_free.py [--judge-log outputs/GPT4o/T20250101_G12345678/GPT4o_MMVet_gpt-4-turbo.xlsx]
+"""
+import os
+import re
+import random
+import hashlib
+import argparse
+import tempfile
+import pandas as pd
+from vlmeval.smp import load, dump
+import vlmeval.dataset.image_vqa as image_vqa
+from vlmeval.dataset.utils.mmvet import build_mmvet_gpt4_prompt, MMVet_prefetch
+
+JUDGE = 'gpt-4-turbo'
+
+
+def few_shot_examples():
+    """Parse the (question, ground truth, prediction, score) examples of the grading prompt."""
+    prompt = build_mmvet_gpt4_prompt(dict(question='', answer='', prediction=''))
+    table = prompt.split('--- | --- | --- | ---')[1]
+    table = ' '.join(table.split())
+    return [
+        dict(question=q.strip(), answer=gt.strip(), prediction=pred.strip(), score=float(s))
+        for q, gt, pred, s in re.findall(r'(.+?) \| (.+?) \| (.+?) \| (\d\.\d)', table)]
+
+
+def check_examples(examples, name):
+    resolved = 0
+    for ex in examples:
+        ret = MMVet_prefetch(pd.Series(ex))
+        if ret is not None:
+            resolved += 1
+            assert ret['score'] == ex['score'], f'{name}: the rule gives {ret["score"]}, the judge {ex["score"]}: {ex}'
+    print(f'{name}: {len(examples)} judged records, {resolved} resolved by the rule, all with the judge score')
+    return resolved
+
+
+class FakeJudge:
+    """Answers a score deterministically from the md5 of the prompt."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def working(self):
+        return True
+
+    def generate(self, prompt, **kwargs):
+        self.calls['generate'] += 1
+        return str(int(hashlib.md5(prompt.encode('utf-8')).hexdigest(), 16) % 11 / 10)
+
+
+def synthetic(records, rd):
+    rows = [
+        ('cat', 'cat'), ('cat', 'Cat.'), ('cat', ' cat  '), ('cat', 'The cat'), ('dog<OR>puppy', 'puppy'),
+        ('dog<OR>puppy', 'dog <OR> puppy'), ('-1 <AND> -5', '-1 <AND> -5'), ('Yes', 'yes.'), ('Yes', ''), ('', '')]
+    for _ in range(records):
+        rows.append((rd.choice(['cat', 'dog<OR>puppy', '-1 <AND> -5', 'Yes']),
+                     rd.choice(['cat', 'Dog.', 'puppy', 'x = -1', 'yes', 'no', 'The cat', ''])))
+    categories = ['rec,ocr', 'know', 'gen,spat', 'math']
+    return pd.DataFrame([
+        dict(index=i, question=f'Question {i}', prediction=pred, answer=ans, category=categories[i % 4],
+             capability='rec') for i, (ans, pred) in enumerate(rows)])
+
+
+def evaluate(cls, data, work_dir):
+    os.makedirs(work_dir)
+    eval_file = os.path.join(work_dir, 'Model_MMVet.xlsx')
+    dump(data, eval_file)
+    cls.evaluate(eval_file, model=JUDGE, nproc=1)
+    return load(os.path.join(work_dir, f'Model_MMVet_{JUDGE}.xlsx'))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--judge-log', type=str, default=None)
+    parser.add_argument('--records', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    examples = few_shot_examples()
+    assert len(examples) == 7, examples
+    check_examples(examples, 'Grading prompt examples')
+    if args.judge_log is not None:
+        log = load(args.judge_log)
+        # The records resolved by the rule in that evaluation were not judged
+        log = log[~log['log'].astype(str).str.startswith('Prefetch succeed')]
+        resolved = check_examples([dict(x) for _, x in log.iterrows()], args.judge_log)
+        print(f'Judge calls saved: {resolved} / {len(log)} ({resolved / len(log) * 100:.1f}%)')
+
+    calls = dict(build=0, generate=0)
+
+    def build_judge(**kwargs):
+        calls['build'] += 1
+        return FakeJudge(calls)
+
+    image_vqa.build_judge = build_judge
+    judge_only = type('MMVet', (image_vqa.MMVet, ), dict(judge_free_rules=classmethod(lambda cls: [])))
+    data = synthetic(args.records, random.Random(args.seed))
+    resolved = pd.Series([MMVet_prefetch(data.iloc[i]) is not None for i in range(len(data))])
+    assert resolved.any() and not resolved.all()
+    with tempfile.TemporaryDirectory() as root:
+        stats = {}
+        for mode, cls in [('judge', judge_only), ('judge_free', image_vqa.MMVet)]:
+            calls.update(build=0, generate=0)
+            stats[mode] = (evaluate(cls, data, os.path.join(root, mode)), dict(calls))
+        old, new = stats['judge'][0], stats['judge_free'][0]
+        pd.testing.assert_frame_equal(old[~resolved], new[~resolved])
+        assert (new[resolved]['score'] == 1.0).all()
+        assert stats['judge'][1]['generate'] - stats['judge_free'][1]['generate'] == resolved.sum()
+        print(f"Synthetic: {len(data)} records, judge calls {stats['judge'][1]['generate']} -> "
+              f"{stats['judge_free'][1]['generate']}")
+
+        # With only trivial records, the judge is not even built
+        calls.update(build=0, generate=0)
+        evaluate(image_vqa.MMVet, data[resolved], os.path.join(root, 'trivial'))
+        assert calls == dict(build=0, generate=0), calls
+    print('OK: the judge-free rule of MMVet agrees with the judge. ')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""Check the VQA normalizers and the Levenshtein backends against the previous implementations (frozen below).
+
+`process_punctuation`, `process_answer`, `levenshtein_distance` and `anls_compute` (with each backend of
+`LEVENSHTEIN_BACKENDS`), and the `process_line` methods built on them, are compared on a corpus of edge cases
+(empty strings, unicode whose upper case changes the length, digit commas, runs of more than 32 periods, which the
+period stripping historically stops at) and random strings. The word tables of `_process_digit_article` were only
+moved to the module level, the frozen version reads them from there.
+
+Usage:
+    python scripts/check_vqa_eval.py [--samples 3000] [--seed 0]
+"""
+import re
+import random
+import argparse
+from vlmeval.smp import istype
+from vlmeval.dataset.utils import vqa_eval
+from vlmeval.dataset.utils.vqa_eval import (
+    LEVENSHTEIN_BACKENDS, set_levenshtein_backend, levenshtein_distance, anls_compute, process_answer, process_line,
+    relaxed_correctness, _ARTICLES, _MANUAL_MAP, _CONTRACTIONS)
+from vlmeval.smp.misc import process_punctuation
+
+EDGE_CASES = [
+    '', ' ', '\n\t', '.', '.' * 31, '.' * 32, '.' * 33, 'a' + '. ' * 40 + 'b', 'Wait' + '.' * 50, '3.14', 'e.g. 1.5.',
+    '1,000', '1,000,000.5', 'a, b, c', 'a,b', '(a) [b] {c}', 'x = y + z', 'yes!', '?!', 'C:\\dir\\file_name',
+    'the cat', 'A dog and an apple', 'two apples', 'none', 'Zero or ten', 'dont', "Don't", 'yall', 'whos there',
+    'İstanbul', 'straße', 'ǅemal', 'ﬁne', 'ŉ', 'ΐ', '北京 欢迎你', '3개', '50%', '1,200원', '12 마리', 'ml 5 L',
+    '<think>maybe 4</think> 5개', 'e\u0301', '\u00a0nbsp\u00a0', '🙂 ok', 'MiXeD CaSe', '  padded  ',
+]
+ALPHABET = 'ab AB.,;!?()-_/\\"\'0123456789\n\tİßﬁ北개%'
+
+
+# The previous implementations, kept as the reference
+def old_process_punctuation(inText):
+    outText = inText
+    punct = [
+        ';', r'/', '[', ']', '"', '{', '}', '(', ')', '=', '+', '\\', '_', '-',
+        '>', '<', '@', '`', ',', '?', '!'
+    ]
+    commaStrip = re.compile(r'(\d)(,)(\d)')
+    periodStrip = re.compile(r'(?<!\d)\.(?!\d)')
+    for p in punct:
+        if (p + ' ' in inText or ' ' + p in inText) or (re.search(
+                commaStrip, inText) is not None):
+            outText = outText.replace(p, '')
+        else:
+            outText = outText.replace(p, ' ')
+    outText = periodStrip.sub('', outText, re.UNICODE)
+    return outText
+
+
+def old_process_digit_article(inText):
+    outText = []
+    tempText = inText.lower().split()
+    manualMap = dict(_MANUAL_MAP)
+    for word in tempText:
+        word = manualMap.setdefault(word, word)
+        if word not in _ARTICLES:
+            outText.append(word)
+    for wordId, word in enumerate(outText):
+        if word in _CONTRACTIONS:
+            outText[wordId] = _CONTRACTIONS[word]
+    outText = ' '.join(outText)
+    return outText
+
+
+def old_levenshtein_distance(s1, s2):
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+
+    distances = range(len(s1) + 1)
+    for i2, c2 in enumerate(s2):
+        distances_ = [i2 + 1]
+        for i1, c1 in enumerate(s1):
+            if c1 == c2:
+                distances_.append(distances[i1])
+            else:
+                distances_.append(1 + min((distances[i1], distances[i1 + 1], distances_[-1])))
+        distances = distances_
+    return distances[-1]
+
+
+def old_anls_compute(groundtruth, prediction):
+    gt_answer = ' '.join(groundtruth.strip().lower().split())
+    det_answer = ' '.join(prediction.strip().lower().split())
+    dist = old_levenshtein_distance(gt_answer, det_answer)
+    length = max(len(groundtruth.upper()), len(prediction.upper()))
+    values = 0.0 if length == 0 else float(dist) / float(length)
+    return values
+
+
+def old_process_answer(answer):
+    answer = answer.replace('\n', ' ')
+    answer = answer.replace('\t', ' ')
+    answer = answer.strip()
+    answer = old_process_punctuation(answer)
+    answer = old_process_digit_article(answer)
+    return answer
+
+
+def old_process_line(line, method='vqa_score'):
+    # Only the methods using the functions above or the unit patterns, the other ones did not change
+    ret = {}
+    if istype(line['answer'], list):
+        answers = eval(line['answer'])
+    else:
+        answers = [line['answer']]
+    if method == 'vqa_score':
+        ret['gt'] = [old_process_answer(x) for x in answers]
+        ret['pred'] = old_process_answer(line['prediction'])
+        ret['match'] = []
+        for current_idx, gtAnsDatum in enumerate(ret['gt']):
+            otherGTAns = [
+                item for ret_gt_idx, item in enumerate(ret['gt'])
+                if ret_gt_idx != current_idx
+            ]
+            matchingAns = [
+                item for item in otherGTAns if item == ret['pred']
+            ]
+            acc = min(1, float(len(matchingAns)) / 3)
+            ret['match'].append(acc)
+    elif method == 'anls':
+        ret['gt'] = answers
+        ret['pred'] = line['prediction']
+        ret['match'] = [old_anls_compute(x, ret['pred']) for x in ret['gt']]
+    elif method == 'accuracy_for_kmmvismath':
+        ret['gt'] = [re.sub(r'(원|개|마리|통|묶음|송이|접시|조각|ml|분|L|시간|%|시|,|장)', '', x.strip()).strip() for x in answers]
+        ret['pred'] = line['prediction'].strip()
+        if '<think>' in ret['pred'] and '</think>' in ret['pred']:
+            end_idx = ret['pred'].rfind('</think') + len('</think>')
+            ret['pred'] = ret['pred'][end_idx:].strip()
+        ret['pred'] = re.sub(r'(원|개|마리|통|묶음|송이|접시|조각|ml|분|L|시간|%|시|,|장)', '', ret['pred'].strip()).strip()
+        ret['match'] = [(1.0 if (x.strip().lower() == ret['pred'].strip().lower()) else 0.0) for x in ret['gt']]
+    elif method == 'relaxed_accuracy_for_chartqa_kor':
+        ret['gt'] = [re.sub(r'(%)', '', str(x).strip()).strip() for x in answers]
+        ret['pred'] = str(line['prediction']).strip()
+        if '<think>' in ret['pred'] and '</think>' in ret['pred']:
+            end_idx = ret['pred'].rfind('</think') + len('</think>')
+            ret['pred'] = ret['pred'][end_idx:].strip()
+        ret['pred'] = re.sub(r'(%)', '', ret['pred'].strip()).strip()
+        ret['match'] = [relaxed_correctness(x, ret['pred']) for x in ret['gt']]
+    else:
+        ret['gt'] = [old_process_answer(x) for x in answers]
+        ret['pred'] = old_process_answer(line['prediction'])
+        ret['match'] = [x == ret['pred'] for x in ret['gt']]
+    return ret
+
+
+METHODS = ['vqa_score', 'anls', 'accuracy_for_kmmvismath', 'relaxed_accuracy_for_chartqa_kor', 'default']
+
+
+def build_corpus(samples, seed):
+    rd = random.Random(seed)
+    corpus = list(EDGE_CASES)
+    for _ in range(samples):
+        corpus.append(''.join(rd.choice(ALPHABET) for _ in range(rd.randint(0, 40))))
+    return corpus
+
+
+def check_strings(corpus):
+    for s in corpus:
+        assert process_punctuation(s) == old_process_punctuation(s), repr(s)
+        assert vqa_eval._process_digit_article(s) == old_process_digit_article(s), repr(s)
+        # Twice, the second call is served by the cache
+        for _ in range(2):
+            assert process_answer(s) == old_process_answer(s), repr(s)
+
+
+def check_pairs(pairs, lines):
+    for s1, s2 in pairs:
+        assert levenshtein_distance(s1, s2) == old_levenshtein_distance(s1, s2), (s1, s2)
+        assert anls_compute(s1, s2) == old_anls_compute(s1, s2), (s1, s2)
+    for line in lines:
+        for method in METHODS:
+            assert process_line(line, method) == old_process_line(line, method), (line, method)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--samples', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.samples, args.seed)
+    check_strings(corpus)
+
+    rd = random.Random(args.seed)
+    pairs = [(a, b) for a in EDGE_CASES for b in EDGE_CASES]
+    pairs += [(rd.choice(corpus), rd.choice(corpus)) for _ in range(args.samples)]
+    # Long pairs sharing a prefix / suffix, as trimmed by the pure python backend
+    pairs += [(x + rd.choice(corpus) + y, x + rd.choice(corpus) + y) for x, y in pairs[-200:]]
+    lines = [dict(answer=str([rd.choice(corpus) for _ in range(rd.randint(1, 10))]), prediction=rd.choice(corpus))
+             for _ in range(args.samples // 3)]
+    lines += [dict(answer=a, prediction=b) for a, b in pairs[:len(EDGE_CASES) ** 2]]
+    for name in LEVENSHTEIN_BACKENDS:
+        set_levenshtein_backend(name)
+        check_pairs(pairs, lines)
+        print(f'Levenshtein backend {name}: {len(pairs)} pairs, {len(lines)} lines x {len(METHODS)} methods identical')
+    set_levenshtein_backend()
+    missing = {'rapidfuzz', 'Levenshtein'} - set(LEVENSHTEIN_BACKENDS)
+    if missing:
+        print(f'Not installed, not checked: {sorted(missing)}')
+    print(f'OK: {len(corpus)} strings normalized identically. ')
+
+
+if __name__ == '__main__':
+    main()
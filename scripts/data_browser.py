@@ -17,6 +17,7 @@ from argparse import Namespace
 # from llava import conversation as conversation_lib
 from typing import Sequence
 from vlmeval import *
+from vlmeval.api import OpenAIWrapper
 from vlmeval.dataset import SUPPORTED_DATASETS, build_dataset
 
 SYS = "You are a helpful assistant. Your job is to faithfully translate all provided text into Chinese faithfully. "
@@ -2,20 +2,28 @@ import ssl
 ssl._create_default_https_context = ssl._create_unverified_context
 # Temporarily bypass SSL certificate verification to download files from oss.
 
-try:
-    import torch
-except ImportError:
-    pass
-
 from .smp import *
 load_env()
 
-from .api import *
-from .dataset import *
+# Dataset / model classes are resolved lazily (see `__getattr__`), only the helpers are imported here,
+# so that importing vlmeval does not import torch and all dataset / model modules
+from .dataset import (
+    build_dataset, img_root_map, build_judge, extract_answer_from_item, prefetch_answer, DEBUG_MESSAGE
+)
 from .utils import *
-from .vlm import *
 from .config import *
 from .tools import cli
 
 
 __version__ = '0.2rc1'
+
+
+def __getattr__(name):
+    from . import api, dataset, vlm
+    if name in dataset.__all__:
+        return getattr(dataset, name)
+    if name in api.__all__:
+        return getattr(api, name)
+    if name in vlm._MODEL_MODULE or name == 'BaseModel':
+        return getattr(vlm, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,26 +1,41 @@
-from .gpt import OpenAIWrapper, GPT4V
-from .hf_chat_model import HFChatModel
-from .gemini import GeminiWrapper, Gemini
-from .qwen_vl_api import QwenVLWrapper, QwenVLAPI, Qwen2VLAPI
-from .qwen_api import QwenAPI
-from .claude import Claude_Wrapper, Claude3V
-from .reka import Reka
-from .glm_vision import GLMVisionAPI
-from .cloudwalk import CWWrapper
-from .sensechat_vision import SenseChatVisionAPI
-from .siliconflow import SiliconFlowAPI, TeleMMAPI
-from .hunyuan import HunyuanVision
-from .bailingmm import bailingMMAPI
-from .bluelm_api import BlueLMWrapper, BlueLM_API
-from .jt_vl_chat import JTVLChatAPI
-from .jt_vl_chat_mini import JTVLChatAPI_Mini
-from .taiyi import TaiyiAPI
-from .lmdeploy import LMDeployAPI
-from .taichu import TaichuVLAPI, TaichuVLRAPI
-from .doubao_vl_api import DoubaoVL
-from .mug_u import MUGUAPI
-from .kimivl_api import KimiVLAPIWrapper, KimiVLAPI
-from .rbdashmm_chat3_api import RBdashMMChat3_API, RBdashChat3_5_API
+import importlib
+
+# API wrappers are imported lazily on first use: module (relative to `vlmeval.api`) -> classes
+API_MODULES = {
+    'gpt': ['OpenAIWrapper', 'GPT4V'],
+    'hf_chat_model': ['HFChatModel'],
+    'gemini': ['GeminiWrapper', 'Gemini'],
+    'qwen_vl_api': ['QwenVLWrapper', 'QwenVLAPI', 'Qwen2VLAPI'],
+    'qwen_api': ['QwenAPI'],
+    'claude': ['Claude_Wrapper', 'Claude3V'],
+    'reka': ['Reka'],
+    'glm_vision': ['GLMVisionAPI'],
+    'cloudwalk': ['CWWrapper'],
+    'sensechat_vision': ['SenseChatVisionAPI'],
+    'siliconflow': ['SiliconFlowAPI', 'TeleMMAPI'],
+    'hunyuan': ['HunyuanVision'],
+    'bailingmm': ['bailingMMAPI'],
+    'bluelm_api': ['BlueLMWrapper', 'BlueLM_API'],
+    'jt_vl_chat': ['JTVLChatAPI'],
+    'jt_vl_chat_mini': ['JTVLChatAPI_Mini'],
+    'taiyi': ['TaiyiAPI'],
+    'lmdeploy': ['LMDeployAPI'],
+    'taichu': ['TaichuVLAPI', 'TaichuVLRAPI'],
+    'doubao_vl_api': ['DoubaoVL'],
+    'mug_u': ['MUGUAPI'],
+    'kimivl_api': ['KimiVLAPIWrapper', 'KimiVLAPI'],
+    'rbdashmm_chat3_api': ['RBdashMMChat3_API', 'RBdashChat3_5_API'],
+}
+_API_MODULE = {cls: mod for mod, classes in API_MODULES.items() for cls in classes}
+
+
+def __getattr__(name):
+    if name in _API_MODULE:
+        module = importlib.import_module(f'.{_API_MODULE[name]}', __name__)
+        globals()[name] = getattr(module, name)
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 __all__ = [
     'OpenAIWrapper', 'HFChatModel', 'GeminiWrapper', 'GPT4V', 'Gemini',
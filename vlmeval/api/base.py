@@ -1,9 +1,58 @@
+import os
 import time
+import asyncio
+import threading
+import weakref
 import random as rd
 from abc import abstractmethod
 import os.path as osp
 import copy as cp
+import requests
 from ..smp import get_logger, parse_file, concat_images_vlmeval, LMUDataRoot, md5, decode_base64_to_image_file
+from .rate_limit import get_rate_limiter
+from .cache import ResponseCache, get_response_cache, message_fingerprint
+
+_SESSIONS = threading.local()
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def get_session():
+    """Return the `requests.Session` of the current thread, so that sync API calls reuse keep-alive connections."""
+    session = getattr(_SESSIONS, 'session', None)
+    if session is None:
+        session = requests.Session()
+        _SESSIONS.session = session
+    return session
+
+
+def get_async_client():
+    """Return the `httpx.AsyncClient` shared by all API wrappers on the running event loop.
+
+    The client keeps connections alive across requests and negotiates HTTP/2 if `h2` is installed.
+    The size of the connection pool is set by the env variable `VLMEVAL_API_MAX_CONN` (default 1024).
+    """
+    import httpx
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        max_conn = int(os.environ.get('VLMEVAL_API_MAX_CONN', 1024))
+        limits = httpx.Limits(max_connections=max_conn, max_keepalive_connections=max_conn)
+        client = httpx.AsyncClient(http2=http2, limits=limits, timeout=None)
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def close_async_client():
+    """Close the `httpx.AsyncClient` of the running event loop (if any), so that its keep-alive connections do not
+    outlive the loop. To be awaited by the code driving the loop (e.g., `asyncio.run`) before it finishes."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
 
 
 class BaseAPI:
@@ -11,6 +60,8 @@ class BaseAPI:
     allowed_types = ['text', 'image', 'video']
     INTERLEAVE = True
     INSTALL_REQ = False
+    # Whether the wrapper implements a native `agenerate_inner` (rather than the thread-backed fallback)
+    ASYNC = False
 
     def __init__(self,
                  retry=10,
@@ -18,6 +69,9 @@ class BaseAPI:
                  system_prompt=None,
                  verbose=True,
                  fail_msg='Failed to obtain answer via API.',
+                 rpm=None,
+                 tpm=None,
+                 cache=False,
                  **kwargs):
         """Base Class for all APIs.
 
@@ -28,6 +82,12 @@ class BaseAPI:
             verbose (bool, optional): Defaults to True.
             fail_msg (str, optional): The message to return when failed to obtain answer.
                 Defaults to 'Failed to obtain answer via API.'.
+            rpm (int, optional): The requests-per-minute limit of the (api_base, model), shared by all instances
+                in the process. Defaults to None (read from env `VLMEVAL_API_RPM`, else adapt to 429 responses).
+            tpm (int, optional): The tokens-per-minute limit of the (api_base, model). Defaults to None
+                (read from env `VLMEVAL_API_TPM`, else unlimited).
+            cache (bool, optional): Whether to look up / store successful answers of non-sampled requests
+                (temperature 0) in the persistent response cache. Defaults to False.
             **kwargs: Other kwargs for `generate_inner`.
         """
 
@@ -36,6 +96,9 @@ class BaseAPI:
         self.system_prompt = system_prompt
         self.verbose = verbose
         self.fail_msg = fail_msg
+        self.rpm = rpm
+        self.tpm = tpm
+        self.cache = cache
         self.logger = get_logger('ChatAPI')
 
         if len(kwargs):
@@ -56,6 +119,55 @@ class BaseAPI:
         # if ret_code is 0, means succeed
         return ret_code, answer, log
 
+    async def agenerate_inner(self, inputs, **kwargs):
+        """The async version of `generate_inner`. By default, runs `generate_inner` in a worker thread.
+
+        Returns:
+            tuple(int, str, str): ret_code, response, log
+        """
+        return await asyncio.to_thread(self.generate_inner, inputs, **kwargs)
+
+    @property
+    def rate_limiter(self):
+        api_base = getattr(self, 'api_base', None) or self.__class__.__name__
+        return get_rate_limiter(api_base, getattr(self, 'model', None), rpm=self.rpm, tpm=self.tpm)
+
+    def estimate_tokens(self, inputs, **kwargs):
+        """Estimate the number of tokens a request will consume (prompt + max completion), used by the TPM limit.
+        Will use `get_token_len` if the wrapper implements it, otherwise ~4 characters per token."""
+        tot = 0
+        if hasattr(self, 'get_token_len'):
+            try:
+                tot = self.get_token_len(inputs)
+            except Exception:
+                tot = 0
+        if not tot:
+            for item in inputs:
+                content = item['content'] if 'role' in item else [item]
+                if isinstance(content, str):
+                    content = [dict(type='text', value=content)]
+                for x in content:
+                    tot += len(x['value']) // 4 if x['type'] == 'text' else 85
+        return tot + (kwargs.get('max_tokens', getattr(self, 'max_tokens', 0)) or 0)
+
+    def cache_key(self, message, kwargs):
+        """The key of a request in the response cache. None if the cache is disabled or the request is sampled."""
+        if not self.cache:
+            return None
+        sampling = {
+            k: getattr(self, k) for k in ['temperature', 'max_tokens', 'img_size', 'img_detail'] if hasattr(self, k)}
+        sampling.update(kwargs)
+        if sampling.get('temperature', 0):
+            return None
+        return ResponseCache.make_key(dict(
+            model=getattr(self, 'model', self.__class__.__name__),
+            system_prompt=self.system_prompt,
+            message=message_fingerprint(message),
+            kwargs=sampling))
+
+    def _acquire_tokens(self, limiter, inputs, **kwargs):
+        return self.estimate_tokens(inputs, **kwargs) if limiter.tpm is not None else 0
+
     def working(self):
         """If the API model is working, return True, else return False.
 
@@ -170,20 +282,18 @@ class BaseAPI:
 
         assert messages[-1]['role'] == 'user'
 
+        limiter = self.rate_limiter
         for i in range(self.retry):
             try:
+                limiter.acquire(self._acquire_tokens(limiter, messages, **kwargs))
                 ret_code, answer, log = self.chat_inner(messages, **kwargs)
+                limiter.feedback(ret_code, log)
                 if ret_code == 0 and self.fail_msg not in answer and answer != '':
                     if self.verbose:
                         print(answer)
                     return answer
                 elif self.verbose:
-                    if not isinstance(log, str):
-                        try:
-                            log = log.text
-                        except Exception as e:
-                            self.logger.warning(f'Failed to parse {log} as an http response: {str(e)}. ')
-                    self.logger.info(f'RetCode: {ret_code}\nAnswer: {answer}\nLog: {log}')
+                    self._log_failure(ret_code, answer, log)
             except Exception as err:
                 if self.verbose:
                     self.logger.error(f'An error occured during try {i}: ')
@@ -214,15 +324,7 @@ class BaseAPI:
                     self.system_prompt += '\n' + system_prompt
         return new_message
 
-    def generate(self, message, **kwargs1):
-        """The main function to generate the answer. Will call `generate_inner` with the preprocessed input messages.
-
-        Args:
-            message: raw input messages.
-
-        Returns:
-            str: The generated answer of the Failed Message if failed to obtain answer.
-        """
+    def _prepare_generate(self, message, **kwargs1):
         if self.check_content(message) == 'listdict':
             message = self.preprocess_message_with_role(message)
 
@@ -235,26 +337,51 @@ class BaseAPI:
         # merge kwargs
         kwargs = cp.deepcopy(self.default_kwargs)
         kwargs.update(kwargs1)
+        return message, kwargs
+
+    def _log_failure(self, ret_code, answer, log):
+        if not isinstance(log, str):
+            try:
+                log = log.text
+            except Exception as e:
+                self.logger.warning(f'Failed to parse {log} as an http response: {str(e)}. ')
+        self.logger.info(f'RetCode: {ret_code}\nAnswer: {answer}\nLog: {log}')
+
+    def generate(self, message, **kwargs1):
+        """The main function to generate the answer. Will call `generate_inner` with the preprocessed input messages.
+
+        Args:
+            message: raw input messages.
+
+        Returns:
+            str: The generated answer of the Failed Message if failed to obtain answer.
+        """
+        message, kwargs = self._prepare_generate(message, **kwargs1)
+        cache_key = self.cache_key(message, kwargs)
+        if cache_key is not None:
+            answer = get_response_cache().get(cache_key)
+            if answer is not None:
+                return answer
 
         answer = None
         # a very small random delay [0s - 0.5s]
         T = rd.random() * 0.5
         time.sleep(T)
 
+        limiter = self.rate_limiter
         for i in range(self.retry):
             try:
+                limiter.acquire(self._acquire_tokens(limiter, message, **kwargs))
                 ret_code, answer, log = self.generate_inner(message, **kwargs)
+                limiter.feedback(ret_code, log)
                 if ret_code == 0 and self.fail_msg not in answer and answer != '':
                     if self.verbose:
                         print(answer)
+                    if cache_key is not None:
+                        get_response_cache().put(cache_key, answer)
                     return answer
                 elif self.verbose:
-                    if not isinstance(log, str):
-                        try:
-                            log = log.text
-                        except Exception as e:
-                            self.logger.warning(f'Failed to parse {log} as an http response: {str(e)}. ')
-                    self.logger.info(f'RetCode: {ret_code}\nAnswer: {answer}\nLog: {log}')
+                    self._log_failure(ret_code, answer, log)
             except Exception as err:
                 if self.verbose:
                     self.logger.error(f'An error occured during try {i}: ')
@@ -265,6 +392,50 @@ class BaseAPI:
 
         return self.fail_msg if answer in ['', None] else answer
 
+    async def agenerate(self, message, **kwargs1):
+        """The async version of `generate`, with the same retry & fail_msg semantics.
+        Will call `agenerate_inner` with the preprocessed input messages.
+
+        Args:
+            message: raw input messages.
+
+        Returns:
+            str: The generated answer of the Failed Message if failed to obtain answer.
+        """
+        message, kwargs = self._prepare_generate(message, **kwargs1)
+        cache_key = self.cache_key(message, kwargs)
+        if cache_key is not None:
+            answer = get_response_cache().get(cache_key)
+            if answer is not None:
+                return answer
+
+        answer = None
+        # a very small random delay [0s - 0.5s]
+        await asyncio.sleep(rd.random() * 0.5)
+
+        limiter = self.rate_limiter
+        for i in range(self.retry):
+            try:
+                await limiter.aacquire(self._acquire_tokens(limiter, message, **kwargs))
+                ret_code, answer, log = await self.agenerate_inner(message, **kwargs)
+                limiter.feedback(ret_code, log)
+                if ret_code == 0 and self.fail_msg not in answer and answer != '':
+                    if self.verbose:
+                        print(answer)
+                    if cache_key is not None:
+                        get_response_cache().put(cache_key, answer)
+                    return answer
+                elif self.verbose:
+                    self._log_failure(ret_code, answer, log)
+            except Exception as err:
+                if self.verbose:
+                    self.logger.error(f'An error occured during try {i}: ')
+                    self.logger.error(f'{type(err)}: {err}')
+            # delay before each retry
+            await asyncio.sleep(rd.random() * self.wait * 2)
+
+        return self.fail_msg if answer in ['', None] else answer
+
     def message_to_promptimg(self, message, dataset=None):
         assert not self.INTERLEAVE
         model_name = self.__class__.__name__
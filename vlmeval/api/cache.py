@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import threading
+import os.path as osp
+from ..smp import LMUDataRoot, get_logger, md5
+
+
+class ResponseCache:
+    """A persistent, content-addressed cache of API responses, stored in SQLite.
+
+    Entries are keyed by the hash of (model, system prompt, message, sampling kwargs), so the same judge prompt
+    is answered once, no matter which eval_id / evaluated model issued it. When the total size of cached
+    responses exceeds `max_size` bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, path, max_size=2 ** 30):
+        os.makedirs(osp.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, size INTEGER, atime REAL)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS cache_atime ON cache (atime)')
+        self.conn.commit()
+        self.hits, self.misses, self.puts, self.evictions = 0, 0, 0, 0
+
+    @staticmethod
+    def make_key(payload):
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute('SELECT value FROM cache WHERE key = ?', (key, )).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute('UPDATE cache SET atime = ? WHERE key = ?', (time.time(), key))
+            self.conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        value = json.dumps(value, ensure_ascii=False)
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, size, atime) VALUES (?, ?, ?, ?)',
+                (key, value, len(value), time.time()))
+            self.conn.commit()
+            self.puts += 1
+            if self.puts % 100 == 0:
+                self._evict()
+
+    def _evict(self):
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+        if total <= self.max_size:
+            return
+        # Evict the least recently used entries, until 90% of the budget is used
+        to_free, keys = total - int(self.max_size * 0.9), []
+        for key, size in self.conn.execute('SELECT key, size FROM cache ORDER BY atime'):
+            keys.append((key, ))
+            to_free -= size
+            if to_free <= 0:
+                break
+        self.conn.executemany('DELETE FROM cache WHERE key = ?', keys)
+        self.conn.commit()
+        self.evictions += len(keys)
+
+    def stats(self):
+        with self.lock:
+            entries, size = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        lookups = self.hits + self.misses
+        return dict(
+            hits=self.hits, misses=self.misses, hit_rate=self.hits / lookups if lookups else 0,
+            puts=self.puts, evictions=self.evictions, entries=entries, size=size)
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache():
+    """Get the process-wide response cache.
+
+    It is stored at `{LMUDataRoot()}/cache/response_cache.db`, and bounded by the env variable
+    `VLMEVAL_CACHE_SIZE` (in MB, default 1024).
+    """
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            max_size = int(os.environ.get('VLMEVAL_CACHE_SIZE', 1024)) * 2 ** 20
+            _CACHE = ResponseCache(osp.join(LMUDataRoot(), 'cache', 'response_cache.db'), max_size=max_size)
+            atexit.register(_log_stats)
+    return _CACHE
+
+
+def _log_stats():
+    stats = _CACHE.stats()
+    if stats['hits'] + stats['misses']:
+        get_logger('ChatAPI').info(
+            f"Response cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%}), "
+            f"{stats['entries']} entries, {stats['size'] / 2 ** 20:.1f} MB. ")
+
+
+def message_fingerprint(message):
+    """Make the preprocessed message content-addressed: images / videos are represented by the md5 of the file."""
+    fingerprint = []
+    for item in message:
+        if 'role' in item:
+            fingerprint.append(dict(role=item['role'], content=message_fingerprint(item['content'])))
+        elif item['type'] == 'text':
+            fingerprint.append(item)
+        else:
+            fingerprint.append(dict(type=item['type'], value=md5(item['value'])))
+    return fingerprint
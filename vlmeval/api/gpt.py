@@ -1,7 +1,8 @@
 from ..smp import *
 import os
 import sys
-from .base import BaseAPI
+import asyncio
+from .base import BaseAPI, get_session, get_async_client
 
 APIBASES = {
     'OFFICIAL': 'https://api.openai.com/v1/chat/completions',
@@ -32,6 +33,7 @@ def GPT_context_window(model):
 class OpenAIWrapper(BaseAPI):
 
     is_api: bool = True
+    ASYNC = True
 
     def __init__(self,
                  model: str = 'gpt-3.5-turbo-0613',
@@ -170,9 +172,7 @@ class OpenAIWrapper(BaseAPI):
                 if msg['type'] == 'text':
                     content_list.append(dict(type='text', text=msg['value']))
                 elif msg['type'] == 'image':
-                    from PIL import Image
-                    img = Image.open(msg['value'])
-                    b64 = encode_image_to_base64(img, target_size=self.img_size)
+                    b64 = encode_image_file_to_base64(msg['value'], target_size=self.img_size)
                     img_struct = dict(url=f'data:image/jpeg;base64,{b64}', detail=self.img_detail)
                     content_list.append(dict(type='image_url', image_url=img_struct))
         else:
@@ -195,7 +195,7 @@ class OpenAIWrapper(BaseAPI):
             input_msgs.append(dict(role='user', content=self.prepare_itlist(inputs)))
         return input_msgs
 
-    def generate_inner(self, inputs, **kwargs) -> str:
+    def prepare_request(self, inputs, **kwargs):
         input_msgs = self.prepare_inputs(inputs)
         temperature = kwargs.pop('temperature', self.temperature)
         max_tokens = kwargs.pop('max_tokens', self.max_tokens)
@@ -227,10 +227,9 @@ class OpenAIWrapper(BaseAPI):
             payload.pop('max_tokens')
             payload.pop('n')
             payload['reasoning_effort'] = 'high'
+        return headers, payload
 
-        response = requests.post(
-            self.api_base,
-            headers=headers, data=json.dumps(payload), timeout=self.timeout * 1.1)
+    def parse_response(self, response):
         ret_code = response.status_code
         ret_code = 0 if (200 <= int(ret_code) < 300) else ret_code
         answer = self.fail_msg
@@ -244,6 +243,24 @@ class OpenAIWrapper(BaseAPI):
 
         return ret_code, answer, response
 
+    def generate_inner(self, inputs, **kwargs) -> str:
+        headers, payload = self.prepare_request(inputs, **kwargs)
+        response = get_session().post(
+            self.api_base,
+            headers=headers, data=json.dumps(payload), timeout=self.timeout * 1.1)
+        return self.parse_response(response)
+
+    async def agenerate_inner(self, inputs, **kwargs) -> str:
+        if any(x['type'] == 'image' or 'role' in x for x in inputs):
+            # Image encoding is CPU-bound, keep it off the event loop
+            headers, payload = await asyncio.to_thread(self.prepare_request, inputs, **kwargs)
+        else:
+            headers, payload = self.prepare_request(inputs, **kwargs)
+        response = await get_async_client().post(
+            self.api_base,
+            headers=headers, content=json.dumps(payload), timeout=self.timeout * 1.1)
+        return self.parse_response(response)
+
     def get_image_token_len(self, img_path, detail='low'):
         import math
         if detail == 'low':
@@ -291,3 +308,6 @@ class GPT4V(OpenAIWrapper):
 
     def generate(self, message, dataset=None):
         return super(GPT4V, self).generate(message)
+
+    async def agenerate(self, message, dataset=None):
+        return await super(GPT4V, self).agenerate(message)
@@ -257,9 +257,7 @@ class LMDeployWrapper(BaseAPI):
                 if msg['type'] == 'text':
                     content_list.append(dict(type='text', text=msg['value']))
                 elif msg['type'] == 'image':
-                    from PIL import Image
-                    img = Image.open(msg['value'])
-                    b64 = encode_image_to_base64(img)
+                    b64 = encode_image_file_to_base64(msg['value'])
                     extra_args = msg.copy()
                     extra_args.pop('type')
                     extra_args.pop('value')
@@ -0,0 +1,171 @@
+import os
+import time
+import random as rd
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+# Status codes that indicate the provider is throttling us: Too Many Requests / Service Unavailable / Overloaded
+THROTTLE_CODES = [429, 503, 529]
+
+
+class TokenBucket:
+    """A token bucket refilled at `rate` units per minute, with a burst capacity of `rate` units.
+
+    `reserve` always succeeds and may drive the level negative; it returns the time (in seconds) the caller
+    should wait before the reserved units become available. This works the same for threads and coroutines.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.level = rate
+        self.stamp = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.rate, self.level + (now - self.stamp) * self.rate / 60)
+        self.stamp = now
+
+    def reserve(self, n, now):
+        self.refill(now)
+        self.level -= min(n, self.rate)
+        return 0 if self.level >= 0 else -self.level * 60 / self.rate
+
+
+def parse_retry_after(headers):
+    """Parse the wait time (in seconds) suggested by the provider from the response headers. None if absent."""
+    if headers is None:
+        return None
+    try:
+        if headers.get('retry-after-ms') is not None:
+            return float(headers.get('retry-after-ms')) / 1000
+        value = headers.get('retry-after')
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class RateLimiter:
+    """Process-wide rate limiter shared by all wrapper instances calling the same (api_base, model).
+
+    Requests are admitted through an RPM bucket and a TPM bucket (either can be disabled with None).
+    Limits can be set explicitly, learnt from `x-ratelimit-limit-*` headers, or adapted on the fly:
+    each throttled response pauses all callers (honoring `Retry-After` if present, else exponential backoff)
+    and cuts the request rate to 70% of the recently observed one; each success raises it again by 5%.
+    """
+
+    def __init__(self, rpm=None, tpm=None):
+        self.lock = threading.Lock()
+        self.max_rpm = rpm
+        self.max_tpm = tpm
+        self.rpm = TokenBucket(rpm) if rpm else None
+        self.tpm = TokenBucket(tpm) if tpm else None
+        self.blocked_until = 0
+        self.failures = 0
+        self.history = deque()
+
+    def set_limits(self, rpm=None, tpm=None):
+        with self.lock:
+            if rpm and rpm != self.max_rpm:
+                self.max_rpm = rpm
+                self.rpm = TokenBucket(rpm)
+            if tpm and tpm != self.max_tpm:
+                self.max_tpm = tpm
+                self.tpm = TokenBucket(tpm)
+
+    def reserve(self, tokens=0):
+        """Reserve one request (and `tokens` tokens) and return the time (in seconds) to wait before sending."""
+        with self.lock:
+            now = time.monotonic()
+            wait = max(0, self.blocked_until - now)
+            if self.rpm is not None:
+                wait = max(wait, self.rpm.reserve(1, now))
+            if self.tpm is not None and tokens:
+                wait = max(wait, self.tpm.reserve(tokens, now))
+            self.history.append(now + wait)
+            while self.history and self.history[0] < now - 60:
+                self.history.popleft()
+            return wait
+
+    def acquire(self, tokens=0):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens=0):
+        import asyncio
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def feedback(self, ret_code, log=None):
+        """Update the limiter with the outcome of a request.
+
+        Args:
+            ret_code (int): The ret_code returned by `generate_inner` (0 means success).
+            log: The log returned by `generate_inner`, usually the http response.
+        """
+        headers = getattr(log, 'headers', None)
+        with self.lock:
+            if headers is not None:
+                self._learn_limits(headers)
+            if ret_code == 0:
+                self.failures = 0
+                if self.rpm is not None and (self.max_rpm is None or self.rpm.rate < self.max_rpm):
+                    self.rpm.rate = min(self.max_rpm or float('inf'), self.rpm.rate + max(1, self.rpm.rate / 20))
+            elif ret_code in THROTTLE_CODES:
+                self.failures += 1
+                now = time.monotonic()
+                wait = parse_retry_after(headers)
+                if wait is None:
+                    wait = min(60, 2 ** self.failures) * (0.5 + rd.random() / 2)
+                self.blocked_until = max(self.blocked_until, now + wait)
+                # The request rate observed in the last minute (or since the first request, if more recent)
+                span = max(1, now - self.history[0]) if self.history else 60
+                rate = max(1, int(len(self.history) * 60 / min(span, 60) * 0.7))
+                if self.rpm is None:
+                    self.rpm = TokenBucket(rate)
+                    self.rpm.level = 0
+                elif rate < self.rpm.rate:
+                    self.rpm.rate = rate
+                    self.rpm.level = min(self.rpm.level, 0)
+
+    def _learn_limits(self, headers):
+        # Headers as returned by OpenAI compatible providers
+        try:
+            rpm = headers.get('x-ratelimit-limit-requests')
+            if rpm is not None and self.max_rpm is None:
+                self.max_rpm = int(rpm)
+                if self.rpm is None:
+                    self.rpm = TokenBucket(self.max_rpm)
+            tpm = headers.get('x-ratelimit-limit-tokens')
+            if tpm is not None and self.max_tpm is None:
+                self.max_tpm = int(tpm)
+                self.tpm = TokenBucket(self.max_tpm)
+        except (TypeError, ValueError):
+            pass
+
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(api_base, model, rpm=None, tpm=None):
+    """Get the rate limiter of (api_base, model), create it if not exists.
+
+    Default limits are read from the env variables `VLMEVAL_API_RPM` and `VLMEVAL_API_TPM`.
+    """
+    rpm = rpm or int(os.environ.get('VLMEVAL_API_RPM', 0)) or None
+    tpm = tpm or int(os.environ.get('VLMEVAL_API_TPM', 0)) or None
+    key = (api_base, model)
+    with _LIMITERS_LOCK:
+        if key not in _LIMITERS:
+            _LIMITERS[key] = RateLimiter(rpm=rpm, tpm=tpm)
+            return _LIMITERS[key]
+    limiter = _LIMITERS[key]
+    limiter.set_limits(rpm=rpm, tpm=tpm)
+    return limiter
@@ -297,9 +297,7 @@ class RBdashMMChat3Wrapper(BaseAPI):
                 if msg['type'] == 'text':
                     content_list.append(dict(type='text', text=msg['value']))
                 elif msg['type'] == 'image':
-                    from PIL import Image
-                    img = Image.open(msg['value'])
-                    b64 = encode_image_to_base64(img)
+                    b64 = encode_image_file_to_base64(msg['value'])
                     extra_args = msg.copy()
                     extra_args.pop('type')
                     extra_args.pop('value')
@@ -447,9 +445,7 @@ class RBdashMMChat3_5_Wrapper(BaseAPI):
                 if msg['type'] == 'text':
                     content_list.append(dict(type='text', text=msg['value']))
                 elif msg['type'] == 'image':
-                    from PIL import Image
-                    img = Image.open(msg['value'])
-                    b64 = encode_image_to_base64(img)
+                    b64 = encode_image_file_to_base64(msg['value'])
                     extra_args = msg.copy()
                     extra_args.pop('type')
                     extra_args.pop('value')
@@ -1,6 +1,6 @@
 import math
 from vlmeval.smp import *
-from vlmeval.api.base import BaseAPI
+from vlmeval.api.base import BaseAPI, get_session
 from vlmeval.dataset import img_root_map
 
 API_BASE = "https://api.siliconflow.cn/v1/chat/completions"
@@ -23,6 +23,7 @@ def resize_image(image: Image.Image, max_height: int, max_width: int) -> Image.I
     return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
 
 
+@cache_encoded_image
 def encode_image(path: str, max_height: int = 1024, max_width: int = 1024) -> str:
     image = Image.open(path).convert("RGB")
     image = resize_image(image, max_height, max_width)
@@ -112,7 +113,7 @@ class SiliconFlowAPI(BaseAPI):
             **default_kwargs,
         )
 
-        response = requests.post(
+        response = get_session().post(
             self.api_base, headers=self.headers, data=json.dumps(payload), timeout=self.timeout * 1.1
         )
         ret_code = response.status_code
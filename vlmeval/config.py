@@ -1,5 +1,5 @@
-from vlmeval.vlm import *
-from vlmeval.api import *
+from vlmeval.model_registry import *
+from vlmeval.smp.misc import LazyClass
 from functools import partial
 import os
 
@@ -1829,3 +1829,6 @@ model_groups = [
 
 for grp in model_groups:
     supported_VLM.update(grp)
+
+# Model classes in this module are lazy references, do not export them
+__all__ = [k for k, v in globals().items() if not k.startswith('_') and not isinstance(v, LazyClass)]
@@ -79,13 +79,14 @@ class CGAVCounting(VideoBaseDataset):
 
     def prepare_dataset(self, dataset_name="CG-AV-Counting", repo_id="CG-Bench/CG-AV-Counting"):
 
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f"{dataset_name}.tsv")
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data["video"]:
@@ -359,8 +360,8 @@ class CGAVCounting(VideoBaseDataset):
 
     def evaluate(self, eval_file, **judge_kwargs):
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], \
-            'data file should be an supported format (xlsx/json/tsv) file'
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], \
+            'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'
 
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
         score_file = get_intermediate_file_path(eval_file, '_score', 'csv')
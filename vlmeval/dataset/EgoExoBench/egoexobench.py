@@ -30,13 +30,14 @@ class EgoExoBench_MCQ(VideoBaseDataset):
         return ['EgoExoBench_MCQ']
 
     def prepare_dataset(self, dataset_name='EgoExoBench_MCQ', repo_id='Heleun/EgoExoBench_MCQ', video_repo_id='onlyfaces/EgoExoBench'):  # noqa: E501
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not osp.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             return True
@@ -244,8 +245,8 @@ class EgoExoBench_MCQ(VideoBaseDataset):
     def evaluate(self, eval_file, **judge_kwargs):
         from .utils import get_dimension_rating, extract_characters_regex, extract_option
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], \
-            'data file should be an supported format (xlsx/json/tsv) file'
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], \
+            'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
@@ -1,96 +1,96 @@
+import json
 import warnings
+import importlib
+import threading
 
 from .image_base import img_root_map, ImageBaseDataset
-from .image_caption import ImageCaptionDataset
-from .image_yorn import ImageYORNDataset
-from .image_mcq import (
-    ImageMCQDataset, MMMUDataset, CustomMCQDataset, MUIRDataset, GMAIMMBenchDataset, MMERealWorld, HRBenchDataset,
-    NaturalBenchDataset, WeMath, MMMUProDataset, VMCBenchDataset, MedXpertQA_MM_test, LEGO, VisuLogic, CVBench, TDBench,
-    MicroBench, OmniMedVQA, MSEarthMCQ, VLMBlind, SCAM, _3DSRBench, AffordanceDataset, OmniEarthMCQBench, XLRSBench,
-    TreeBench, CVQA, TopViewRS
-)
-from .image_mt import MMDUDataset
-from .image_vqa import (
-    ImageVQADataset, MathVision, OCRBench, MathVista, LLaVABench, LLaVABench_KO, VGRPBench, MMVet, MTVQADataset,
-    TableVQABench, CustomVQADataset, CRPE, MathVerse, OlympiadBench, SeePhys, QSpatial, VizWiz, MMNIAH, LogicVista,
-    MME_CoT, MMSci_Captioning, Physics_yale, TDBenchGrounding, WildDocBenchmark, OCR_Reasoning, PhyX, CountBenchQA,
-    ZEROBench, Omni3DBench, TallyQA, MMEReasoning, MMVMBench, BMMR, OCRBench_v2, AyaVisionBench, MathCanvas, 
-    KMMVisMathDataset, ChartQAKORDataset, ElementaryMathDataset
-)
-
-from .image_ccocr import CCOCRDataset
-from .image_shortqa import ImageShortQADataset, PathVQA_VAL, PathVQA_TEST
-from .text_mcq import CustomTextMCQDataset, TextMCQDataset
-
-from .vcr import VCRDataset
-from .mmlongbench import MMLongBench
-from .dude import DUDE
-from .slidevqa import SlideVQA
-from .vl_rewardbench import VLRewardBench
-from .vlm2bench import VLM2Bench
-from .vlmbias import VLMBias
-from .spatial457 import Spatial457
-from .charxiv import CharXiv
-from .chartmuseum import ChartMuseum
-from .chartqapro import ChartQAPro
-
-from .mmbench_video import MMBenchVideo
-from .videomme import VideoMME
-from .video_holmes import Video_Holmes
-from .mvbench import MVBench, MVBench_MP4
-from .tamperbench import MVTamperBench
-from .miabench import MIABench
-from .mlvu import MLVU, MLVU_MCQ, MLVU_OpenEnded
-from .tempcompass import TempCompass, TempCompass_Captioning, TempCompass_MCQ, TempCompass_YorN
-from .longvideobench import LongVideoBench
-from .video_concat_dataset import ConcatVideoDataset
-from .mmgenbench import MMGenBench
-from .cgbench import CGBench_MCQ_Grounding_Mini, CGBench_OpenEnded_Mini, CGBench_MCQ_Grounding, CGBench_OpenEnded
-from .CGAVCounting.cg_av_counting import CGAVCounting
-
-from .megabench import MEGABench
-from .moviechat1k import MovieChat1k
-from .video_mmlu import Video_MMLU_CAP, Video_MMLU_QA
-from .vdc import VDC
-from .vcrbench import VCRBench
-from .gobench import GOBenchDataset
-from .sfebench import SFE
-from .visfactor import VisFactor
-from .ost_bench import OSTDataset
-
-from .EgoExoBench.egoexobench import EgoExoBench_MCQ
-
-from .worldsense import WorldSense
-from .qbench_video import QBench_Video, QBench_Video_MCQ, QBench_Video_VQA
-
-from .cmmmu import CMMMU
-from .emma import EMMADataset
-from .wildvision import WildVision
-from .mmmath import MMMath
-from .dynamath import Dynamath
-from .creation import CreationMMBenchDataset
-from .mmalignbench import MMAlignBench
 from .utils import *
-from .video_dataset_config import *
 from ..smp import *
-from .OmniDocBench.omnidocbench import OmniDocBench
-from .moat import MOAT
-from .GUI.screenspot import ScreenSpot
-from .GUI.screenspot_v2 import ScreenSpotV2
-from .GUI.screenspot_pro import ScreenSpot_Pro
-from .mmifeval import MMIFEval
-from .chartmimic import ChartMimic
-from .m4bench import M4Bench
-from .vlrmbench import VLRMBench
-from .mmhelix import MMHELIX
-from .medqbench_mcq import MedqbenchMCQDataset
-from .medqbench_caption import MedqbenchCaptionDataset
-from .medqbench_paired_description import MedqbenchPairedDescriptionDataset
-from .olmOCRBench.olmocrbench import olmOCRBench
-from .oceanocr import OceanOCRBench
-from .matbench import MATBench
-
-from .reasonmap_plus import ReasonMap_Plus
+
+# Dataset classes are imported lazily on first use: module (relative to `vlmeval.dataset`) -> classes
+DATASET_MODULES = {
+    'image_caption': ['ImageCaptionDataset'],
+    'image_yorn': ['ImageYORNDataset'],
+    'image_mcq': [
+        'ImageMCQDataset', 'MMMUDataset', 'CustomMCQDataset', 'MUIRDataset', 'GMAIMMBenchDataset', 'MMERealWorld',
+        'HRBenchDataset', 'NaturalBenchDataset', 'WeMath', 'MMMUProDataset', 'VMCBenchDataset', 'MedXpertQA_MM_test',
+        'LEGO', 'VisuLogic', 'CVBench', 'TDBench', 'MicroBench', 'OmniMedVQA', 'MSEarthMCQ', 'VLMBlind', 'SCAM',
+        '_3DSRBench', 'AffordanceDataset', 'OmniEarthMCQBench', 'XLRSBench', 'TreeBench', 'CVQA', 'TopViewRS',
+    ],
+    'image_mt': ['MMDUDataset'],
+    'image_vqa': [
+        'ImageVQADataset', 'MathVision', 'OCRBench', 'MathVista', 'LLaVABench', 'LLaVABench_KO', 'VGRPBench', 'MMVet',
+        'MTVQADataset', 'TableVQABench', 'CustomVQADataset', 'CRPE', 'MathVerse', 'OlympiadBench', 'SeePhys',
+        'QSpatial', 'VizWiz', 'MMNIAH', 'LogicVista', 'MME_CoT', 'MMSci_Captioning', 'Physics_yale',
+        'TDBenchGrounding', 'WildDocBenchmark', 'OCR_Reasoning', 'PhyX', 'CountBenchQA', 'ZEROBench', 'Omni3DBench',
+        'TallyQA', 'MMEReasoning', 'MMVMBench', 'BMMR', 'OCRBench_v2', 'AyaVisionBench', 'MathCanvas',
+        'KMMVisMathDataset', 'ChartQAKORDataset', 'ElementaryMathDataset',
+    ],
+    'image_ccocr': ['CCOCRDataset'],
+    'image_shortqa': ['ImageShortQADataset', 'PathVQA_VAL', 'PathVQA_TEST'],
+    'text_mcq': ['CustomTextMCQDataset', 'TextMCQDataset'],
+    'vcr': ['VCRDataset'],
+    'mmlongbench': ['MMLongBench'],
+    'dude': ['DUDE'],
+    'slidevqa': ['SlideVQA'],
+    'vl_rewardbench': ['VLRewardBench'],
+    'vlm2bench': ['VLM2Bench'],
+    'vlmbias': ['VLMBias'],
+    'spatial457': ['Spatial457'],
+    'charxiv': ['CharXiv'],
+    'chartmuseum': ['ChartMuseum'],
+    'chartqapro': ['ChartQAPro'],
+    'mmbench_video': ['MMBenchVideo'],
+    'videomme': ['VideoMME'],
+    'video_holmes': ['Video_Holmes'],
+    'mvbench': ['MVBench', 'MVBench_MP4'],
+    'tamperbench': ['MVTamperBench'],
+    'miabench': ['MIABench'],
+    'mlvu': ['MLVU', 'MLVU_MCQ', 'MLVU_OpenEnded'],
+    'tempcompass': ['TempCompass', 'TempCompass_Captioning', 'TempCompass_MCQ', 'TempCompass_YorN'],
+    'longvideobench': ['LongVideoBench'],
+    'video_concat_dataset': ['ConcatVideoDataset'],
+    'mmgenbench': ['MMGenBench'],
+    'cgbench': ['CGBench_MCQ_Grounding_Mini', 'CGBench_OpenEnded_Mini', 'CGBench_MCQ_Grounding', 'CGBench_OpenEnded'],
+    'CGAVCounting.cg_av_counting': ['CGAVCounting'],
+    'megabench': ['MEGABench'],
+    'moviechat1k': ['MovieChat1k'],
+    'video_mmlu': ['Video_MMLU_CAP', 'Video_MMLU_QA'],
+    'vdc': ['VDC'],
+    'vcrbench': ['VCRBench'],
+    'gobench': ['GOBenchDataset'],
+    'sfebench': ['SFE'],
+    'visfactor': ['VisFactor'],
+    'ost_bench': ['OSTDataset'],
+    'EgoExoBench.egoexobench': ['EgoExoBench_MCQ'],
+    'worldsense': ['WorldSense'],
+    'qbench_video': ['QBench_Video', 'QBench_Video_MCQ', 'QBench_Video_VQA'],
+    'cmmmu': ['CMMMU'],
+    'emma': ['EMMADataset'],
+    'wildvision': ['WildVision'],
+    'mmmath': ['MMMath'],
+    'dynamath': ['Dynamath'],
+    'creation': ['CreationMMBenchDataset'],
+    'mmalignbench': ['MMAlignBench'],
+    'OmniDocBench.omnidocbench': ['OmniDocBench'],
+    'moat': ['MOAT'],
+    'GUI.screenspot': ['ScreenSpot'],
+    'GUI.screenspot_v2': ['ScreenSpotV2'],
+    'GUI.screenspot_pro': ['ScreenSpot_Pro'],
+    'mmifeval': ['MMIFEval'],
+    'chartmimic': ['ChartMimic'],
+    'm4bench': ['M4Bench'],
+    'vlrmbench': ['VLRMBench'],
+    'mmhelix': ['MMHELIX'],
+    'medqbench_mcq': ['MedqbenchMCQDataset'],
+    'medqbench_caption': ['MedqbenchCaptionDataset'],
+    'medqbench_paired_description': ['MedqbenchPairedDescriptionDataset'],
+    'olmOCRBench.olmocrbench': ['olmOCRBench'],
+    'oceanocr': ['OceanOCRBench'],
+    'matbench': ['MATBench'],
+    'reasonmap_plus': ['ReasonMap_Plus'],
+}
+_DATASET_MODULE = {cls: mod for mod, classes in DATASET_MODULES.items() for cls in classes}
 
 
 class ConcatDataset(ImageBaseDataset):
@@ -113,35 +113,38 @@ class ConcatDataset(ImageBaseDataset):
     }
 
     def __init__(self, dataset):
+        from concurrent.futures import ThreadPoolExecutor
         datasets = self.DATASET_SETS[dataset]
         self.dataset_map = {}
         # The name of the compliation
         self.dataset_name = dataset
         self.datasets = datasets
-        for dname in datasets:
-            dataset = build_dataset(dname)
-            assert dataset is not None, dataset
-            self.dataset_map[dname] = dataset
+        # Sub-datasets are built in parallel
+        with ThreadPoolExecutor(max_workers=min(len(datasets), 8)) as executor:
+            for dname, dataset in zip(datasets, executor.map(build_dataset, datasets)):
+                assert dataset is not None, dname
+                self.dataset_map[dname] = dataset
         TYPES = [x.TYPE for x in self.dataset_map.values()]
         MODALITIES = [x.MODALITY for x in self.dataset_map.values()]
         assert np.all([x == TYPES[0] for x in TYPES]), (datasets, TYPES)
         assert np.all([x == MODALITIES[0] for x in MODALITIES]), (datasets, MODALITIES)
         self.TYPE = TYPES[0]
         self.MODALITY = MODALITIES[0]
-        data_all = []
         for dname in datasets:
             data = self.dataset_map[dname].data
             data['SUB_DATASET'] = [dname] * len(data)
-            if 'image' in data:
-                data_new = localize_df(data, dname, nproc=16)
-                data_all.append(data_new)
-            else:
-                data_all.append(data)
-
-        data = pd.concat(data_all)
+        # Images of all sub-datasets are localized by a single process pool
+        to_localize = [(self.dataset_map[d].data, d) for d in datasets if 'image' in self.dataset_map[d].data]
+        if len(to_localize):
+            localize_dfs(to_localize, nproc=16)
+        # Sub-datasets hold the full records, the concatenated data only needs the metadata (images are localized)
+        data = pd.concat([self.dataset_map[dname].data for dname in datasets])
         data['original_index'] = data.pop('index')
         data['index'] = np.arange(len(data))
         self.data = data
+        # Row positions of the original indices in each sub-dataset, for O(1) lookup in `build_prompt`
+        self.position_map = {
+            dname: {idx: i for i, idx in enumerate(self.dataset_map[dname].data['index'])} for dname in datasets}
 
     def build_prompt(self, line):
         if isinstance(line, int):
@@ -149,13 +152,17 @@ class ConcatDataset(ImageBaseDataset):
         idx = line['original_index']
         dname = line['SUB_DATASET']
         org_data = self.dataset_map[dname].data
-        org_line = cp.deepcopy(org_data[org_data['index'] == idx]).iloc[0]
+        org_line = cp.deepcopy(org_data.iloc[self.position_map[dname][idx]])
         return self.dataset_map[dname].build_prompt(org_line)
 
     def dump_image(self, line):
+        if 'image_path' not in line:
+            # The images of the sub-datasets are kept in their lazy image stores (`VLMEVAL_LAZY_IMAGE=1`)
+            dname = line['SUB_DATASET']
+            org_data = self.dataset_map[dname].data
+            return self.dataset_map[dname].dump_image(org_data.iloc[self.position_map[dname][line['original_index']]])
         # Assert all images are pre-dumped
         assert 'image' not in line
-        assert 'image_path' in line
         tgt_path = toliststr(line['image_path'])
         return tgt_path
 
@@ -200,63 +207,142 @@ class ConcatDataset(ImageBaseDataset):
             return dict_all
 
 
-# Add new supported dataset class here
-IMAGE_DATASET = [
-    ImageCaptionDataset, ImageYORNDataset, ImageMCQDataset, ImageVQADataset,
-    MathVision, MMMUDataset, OCRBench, MathVista, LLaVABench, LLaVABench_KO, VGRPBench, MMVet,
-    MTVQADataset, TableVQABench, MMLongBench, VCRDataset, MMDUDataset, DUDE,
-    SlideVQA, MUIRDataset, CCOCRDataset, GMAIMMBenchDataset, MMERealWorld,
-    HRBenchDataset, CRPE, MathVerse, NaturalBenchDataset, MIABench,
-    OlympiadBench, SeePhys,WildVision, MMMath, QSpatial, Dynamath, MMGenBench, VizWiz,
-    MMNIAH, CMMMU, VLRewardBench, WeMath, LogicVista, MMMUProDataset,
-    CreationMMBenchDataset, ImageShortQADataset, MMAlignBench, OmniDocBench,
-    VLM2Bench, VMCBenchDataset, EMMADataset, MME_CoT, MOAT, MedXpertQA_MM_test,
-    LEGO, MMSci_Captioning, Physics_yale, ScreenSpot_Pro, ScreenSpot,
-    ScreenSpotV2, MMIFEval, Spatial457, VisuLogic, CVBench, PathVQA_VAL,
-    PathVQA_TEST, TDBench, TDBenchGrounding, MicroBench, CharXiv, OmniMedVQA,
-    WildDocBenchmark, MSEarthMCQ, OCR_Reasoning, PhyX, VLMBlind, CountBenchQA,
-    ZEROBench, SCAM, Omni3DBench, TallyQA, _3DSRBench, BMMR, AffordanceDataset,
-    MMEReasoning, GOBenchDataset, SFE, ChartMimic, MMVMBench, XLRSBench,
-    OmniEarthMCQBench, VisFactor, OSTDataset, OCRBench_v2, TreeBench, CVQA, M4Bench,
-    AyaVisionBench, TopViewRS, VLMBias, MMHELIX, MedqbenchMCQDataset, MathCanvas,
-    MedqbenchPairedDescriptionDataset, MedqbenchCaptionDataset, ChartMuseum, ChartQAPro, ReasonMap_Plus,
-    olmOCRBench, OceanOCRBench, MATBench, VLRMBench
+# Add new supported dataset class here (by name, the module should be registered in `DATASET_MODULES`)
+_IMAGE_DATASET = [
+    'ImageCaptionDataset', 'ImageYORNDataset', 'ImageMCQDataset', 'ImageVQADataset', 'MathVision', 'MMMUDataset',
+    'OCRBench', 'MathVista', 'LLaVABench', 'LLaVABench_KO', 'VGRPBench', 'MMVet', 'MTVQADataset', 'TableVQABench',
+    'MMLongBench', 'VCRDataset', 'MMDUDataset', 'DUDE', 'SlideVQA', 'MUIRDataset', 'CCOCRDataset',
+    'GMAIMMBenchDataset', 'MMERealWorld', 'HRBenchDataset', 'CRPE', 'MathVerse', 'NaturalBenchDataset', 'MIABench',
+    'OlympiadBench', 'SeePhys', 'WildVision', 'MMMath', 'QSpatial', 'Dynamath', 'MMGenBench', 'VizWiz', 'MMNIAH',
+    'CMMMU', 'VLRewardBench', 'WeMath', 'LogicVista', 'MMMUProDataset', 'CreationMMBenchDataset',
+    'ImageShortQADataset', 'MMAlignBench', 'OmniDocBench', 'VLM2Bench', 'VMCBenchDataset', 'EMMADataset', 'MME_CoT',
+    'MOAT', 'MedXpertQA_MM_test', 'LEGO', 'MMSci_Captioning', 'Physics_yale', 'ScreenSpot_Pro', 'ScreenSpot',
+    'ScreenSpotV2', 'MMIFEval', 'Spatial457', 'VisuLogic', 'CVBench', 'PathVQA_VAL', 'PathVQA_TEST', 'TDBench',
+    'TDBenchGrounding', 'MicroBench', 'CharXiv', 'OmniMedVQA', 'WildDocBenchmark', 'MSEarthMCQ', 'OCR_Reasoning',
+    'PhyX', 'VLMBlind', 'CountBenchQA', 'ZEROBench', 'SCAM', 'Omni3DBench', 'TallyQA', '_3DSRBench', 'BMMR',
+    'AffordanceDataset', 'MMEReasoning', 'GOBenchDataset', 'SFE', 'ChartMimic', 'MMVMBench', 'XLRSBench',
+    'OmniEarthMCQBench', 'VisFactor', 'OSTDataset', 'OCRBench_v2', 'TreeBench', 'CVQA', 'M4Bench', 'AyaVisionBench',
+    'TopViewRS', 'VLMBias', 'MMHELIX', 'MedqbenchMCQDataset', 'MathCanvas', 'MedqbenchPairedDescriptionDataset',
+    'MedqbenchCaptionDataset', 'ChartMuseum', 'ChartQAPro', 'ReasonMap_Plus', 'olmOCRBench', 'OceanOCRBench',
+    'MATBench', 'VLRMBench'
 ]
 
-VIDEO_DATASET = [
-    MMBenchVideo, VideoMME, MVBench, MVBench_MP4, MVTamperBench,
-    LongVideoBench, WorldSense, VDC, MovieChat1k, MEGABench,
-    MLVU, MLVU_MCQ, MLVU_OpenEnded,
-    TempCompass, TempCompass_MCQ, TempCompass_Captioning, TempCompass_YorN,
-    CGBench_MCQ_Grounding_Mini, CGBench_OpenEnded_Mini, CGBench_MCQ_Grounding, CGBench_OpenEnded,
-    QBench_Video, QBench_Video_MCQ, QBench_Video_VQA,
-    Video_MMLU_CAP, Video_MMLU_QA,
-    Video_Holmes, VCRBench, CGAVCounting,
-    EgoExoBench_MCQ,
+_VIDEO_DATASET = [
+    'MMBenchVideo', 'VideoMME', 'MVBench', 'MVBench_MP4', 'MVTamperBench', 'LongVideoBench', 'WorldSense', 'VDC',
+    'MovieChat1k', 'MEGABench', 'MLVU', 'MLVU_MCQ', 'MLVU_OpenEnded', 'TempCompass', 'TempCompass_MCQ',
+    'TempCompass_Captioning', 'TempCompass_YorN', 'CGBench_MCQ_Grounding_Mini', 'CGBench_OpenEnded_Mini',
+    'CGBench_MCQ_Grounding', 'CGBench_OpenEnded', 'QBench_Video', 'QBench_Video_MCQ', 'QBench_Video_VQA',
+    'Video_MMLU_CAP', 'Video_MMLU_QA', 'Video_Holmes', 'VCRBench', 'CGAVCounting', 'EgoExoBench_MCQ'
 ]
 
-TEXT_DATASET = [
-    TextMCQDataset
-]
+_TEXT_DATASET = ['TextMCQDataset']
 
-CUSTOM_DATASET = [
-    CustomMCQDataset, CustomVQADataset, CustomTextMCQDataset,
-    KMMVisMathDataset, ChartQAKORDataset, ElementaryMathDataset
+_CUSTOM_DATASET = [
+    'CustomMCQDataset', 'CustomVQADataset', 'CustomTextMCQDataset', 'KMMVisMathDataset', 'ChartQAKORDataset',
+    'ElementaryMathDataset'
 ]
 
-DATASET_COLLECTION = [ConcatDataset, ConcatVideoDataset]
-
-DATASET_CLASSES = IMAGE_DATASET + VIDEO_DATASET + TEXT_DATASET + CUSTOM_DATASET + DATASET_COLLECTION  # noqa: E501
-SUPPORTED_DATASETS = []
-for DATASET_CLS in DATASET_CLASSES:
-    SUPPORTED_DATASETS.extend(DATASET_CLS.supported_datasets())
+_DATASET_COLLECTION = ['ConcatDataset', 'ConcatVideoDataset']
+
+_DATASET_CLASSES = _IMAGE_DATASET + _VIDEO_DATASET + _TEXT_DATASET + _CUSTOM_DATASET + _DATASET_COLLECTION
+_DATASET_LISTS = dict(
+    IMAGE_DATASET=_IMAGE_DATASET, VIDEO_DATASET=_VIDEO_DATASET, TEXT_DATASET=_TEXT_DATASET,
+    CUSTOM_DATASET=_CUSTOM_DATASET, DATASET_COLLECTION=_DATASET_COLLECTION, DATASET_CLASSES=_DATASET_CLASSES)
+
+
+def dataset_class(name):
+    """Get the dataset class by its class name, the module is imported on first use."""
+    if name not in globals():
+        module = importlib.import_module(f'.{_DATASET_MODULE[name]}', __name__)
+        globals()[name] = getattr(module, name)
+    return globals()[name]
+
+
+def _registry_fingerprint():
+    # Any change to the dataset sources invalidates the cached registry
+    root = osp.dirname(osp.abspath(__file__))
+    stats = []
+    for dirpath, _, files in os.walk(root):
+        for f in files:
+            if f.endswith('.py'):
+                st = os.stat(osp.join(dirpath, f))
+                stats.append([osp.relpath(osp.join(dirpath, f), root), st.st_size, st.st_mtime_ns])
+    return md5(json.dumps(sorted(stats)))
+
+
+def _build_registry():
+    datasets, supported = {}, []
+    for cls_name in _DATASET_CLASSES:
+        cls = dataset_class(cls_name)
+        names = cls.supported_datasets()
+        supported.extend(names)
+        for name in names:
+            entry = datasets.setdefault(name, dict(cls=cls_name, TYPE=None, MODALITY=None))
+            # Same as a linear scan over the classes: the first class that defines the attribute wins
+            for attr in ['TYPE', 'MODALITY']:
+                if entry[attr] is None and hasattr(cls, attr):
+                    entry[attr] = getattr(cls, attr)
+    from .video_dataset_config import supported_video_datasets
+    return dict(datasets=datasets, supported=supported, video=list(supported_video_datasets))
+
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def dataset_registry():
+    """The registry of all supported datasets, built once by importing all dataset modules.
+
+    It is cached at `{LMUDataRoot()}/cache/dataset_registry.json` (keyed by the stats of the dataset sources),
+    so later processes resolve dataset names without importing any dataset module.
+
+    Returns:
+        dict: `datasets` maps the dataset name to its class name / TYPE / MODALITY, `supported` is the list
+            `SUPPORTED_DATASETS`, `video` is the list of names in `supported_video_datasets`.
+    """
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is not None:
+            return _REGISTRY
+        cache_file = osp.join(LMUDataRoot(), 'cache', 'dataset_registry.json')
+        fingerprint = _registry_fingerprint()
+        try:
+            with open(cache_file) as fin:
+                cached = json.load(fin)
+            if cached['fingerprint'] == fingerprint:
+                _REGISTRY = cached['registry']
+                return _REGISTRY
+        except Exception:
+            pass
+        _REGISTRY = _build_registry()
+        try:
+            os.makedirs(osp.dirname(cache_file), exist_ok=True)
+            tmp_file = osp.join(osp.dirname(cache_file), f'.tmp_{os.getpid()}_dataset_registry.json')
+            with open(tmp_file, 'w') as fout:
+                json.dump(dict(fingerprint=fingerprint, registry=_REGISTRY), fout)
+            os.replace(tmp_file, cache_file)
+        except OSError as err:
+            warnings.warn(f'Failed to cache the dataset registry to {cache_file}: {err}')
+        return _REGISTRY
+
+
+def __getattr__(name):
+    if name in _DATASET_MODULE:
+        return dataset_class(name)
+    if name in _DATASET_LISTS:
+        return [dataset_class(x) for x in _DATASET_LISTS[name]]
+    if name == 'SUPPORTED_DATASETS':
+        return list(dataset_registry()['supported'])
+    if name == 'supported_video_datasets':
+        from .video_dataset_config import supported_video_datasets
+        return supported_video_datasets
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 def DATASET_TYPE(dataset, *, default: str = 'MCQ') -> str:
-    for cls in DATASET_CLASSES:
-        if dataset in cls.supported_datasets():
-            if hasattr(cls, 'TYPE'):
-                return cls.TYPE
+    entry = dataset_registry()['datasets'].get(dataset)
+    if entry is not None and entry['TYPE'] is not None:
+        return entry['TYPE']
     # Have to add specific routine to handle ConcatDataset
     if dataset in ConcatDataset.DATASET_SETS:
         dataset_list = ConcatDataset.DATASET_SETS[dataset]
@@ -274,10 +360,9 @@ def DATASET_MODALITY(dataset, *, default: str = 'IMAGE') -> str:
     if dataset is None:
         warnings.warn(f'Dataset is not specified, will treat modality as {default}. ')
         return default
-    for cls in DATASET_CLASSES:
-        if dataset in cls.supported_datasets():
-            if hasattr(cls, 'MODALITY'):
-                return cls.MODALITY
+    entry = dataset_registry()['datasets'].get(dataset)
+    if entry is not None and entry['MODALITY'] is not None:
+        return entry['MODALITY']
     # Have to add specific routine to handle ConcatDataset
     if dataset in ConcatDataset.DATASET_SETS:
         dataset_list = ConcatDataset.DATASET_SETS[dataset]
@@ -294,11 +379,12 @@ def DATASET_MODALITY(dataset, *, default: str = 'IMAGE') -> str:
 
 
 def build_dataset(dataset_name, **kwargs):
-    for cls in DATASET_CLASSES:
-        if dataset_name in supported_video_datasets:
-            return supported_video_datasets[dataset_name](**kwargs)
-        elif dataset_name in cls.supported_datasets():
-            return cls(dataset=dataset_name, **kwargs)
+    registry = dataset_registry()
+    if dataset_name in registry['video']:
+        from .video_dataset_config import supported_video_datasets
+        return supported_video_datasets[dataset_name](**kwargs)
+    elif dataset_name in registry['datasets']:
+        return dataset_class(registry['datasets'][dataset_name]['cls'])(dataset=dataset_name, **kwargs)
 
     warnings.warn(f'Dataset {dataset_name} is not officially supported. ')
     data_file = osp.join(LMUDataRoot(), f'{dataset_name}.tsv')
@@ -314,13 +400,13 @@ def build_dataset(dataset_name, **kwargs):
     if 'A' in data and 'B' in data:
         if 'image' in data or 'image_path' in data:
             warnings.warn(f'Will assume unsupported dataset {dataset_name} as a Custom MCQ dataset. ')
-            return CustomMCQDataset(dataset=dataset_name, **kwargs)
+            return dataset_class('CustomMCQDataset')(dataset=dataset_name, **kwargs)
         else:
             warnings.warn(f'Will assume unsupported dataset {dataset_name} as a Custom Text MCQ dataset. ')
-            return CustomTextMCQDataset(dataset=dataset_name, **kwargs)
+            return dataset_class('CustomTextMCQDataset')(dataset=dataset_name, **kwargs)
     else:
         warnings.warn(f'Will assume unsupported dataset {dataset_name} as a Custom VQA dataset. ')
-        return CustomVQADataset(dataset=dataset_name, **kwargs)
+        return dataset_class('CustomVQADataset')(dataset=dataset_name, **kwargs)
 
 
 def infer_dataset_basename(dataset_name):
@@ -330,4 +416,4 @@ def infer_dataset_basename(dataset_name):
 
 __all__ = [
     'build_dataset', 'img_root_map', 'build_judge', 'extract_answer_from_item', 'prefetch_answer', 'DEBUG_MESSAGE'
-] + [cls.__name__ for cls in DATASET_CLASSES]
+] + _DATASET_CLASSES
@@ -140,13 +140,14 @@ class CGBench_MCQ_Grounding_Mini(VideoBaseDataset):
 
     def prepare_dataset(self, dataset_name="CG-Bench_MCQ_Grounding_Mini", repo_id="CG-Bench/CG-Bench"):
 
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f"{dataset_name}.tsv")
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data["video"]:
@@ -433,7 +434,8 @@ class CGBench_MCQ_Grounding_Mini(VideoBaseDataset):
 
     def evaluate(self, eval_file, **judge_kwargs):
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], "data file should be a supported format"
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], \
+            "data file should be a supported format"
 
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
         score_file = get_intermediate_file_path(eval_file, '_score')
@@ -557,13 +559,14 @@ class CGBench_OpenEnded_Mini(VideoBaseDataset):
 
     def prepare_dataset(self, dataset_name="CG-Bench_OpenEnded_Mini", repo_id="CG-Bench/CG-Bench"):
 
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f"{dataset_name}.tsv")
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data["video"]:
@@ -761,7 +764,8 @@ class CGBench_OpenEnded_Mini(VideoBaseDataset):
 
         from .utils.cgbench import get_dimention_rating_open_ended, post_process_open
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], "data file should be a supported format"
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], \
+            "data file should be a supported format"
 
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
         score_file = get_intermediate_file_path(eval_file, '_score')
@@ -1017,13 +1021,14 @@ class CGBench_MCQ_Grounding(VideoBaseDataset):
 
     def prepare_dataset(self, dataset_name="CG-Bench_MCQ_Grounding", repo_id="CG-Bench/CG-Bench"):
 
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f"{dataset_name}.tsv")
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data["video"]:
@@ -1315,7 +1320,8 @@ class CGBench_MCQ_Grounding(VideoBaseDataset):
 
     def evaluate(self, eval_file, **judge_kwargs):
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], "data file should be a supported format"
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], \
+            "data file should be a supported format"
 
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
         score_file = get_intermediate_file_path(eval_file, '_score')
@@ -1439,13 +1445,14 @@ class CGBench_OpenEnded(VideoBaseDataset):
 
     def prepare_dataset(self, dataset_name="CG-Bench_OpenEnded", repo_id="CG-Bench/CG-Bench"):
 
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f"{dataset_name}.tsv")
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data["video"]:
@@ -1642,7 +1649,8 @@ class CGBench_OpenEnded(VideoBaseDataset):
 
         from .utils.cgbench import get_dimention_rating_open_ended, post_process_open
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], "data file should be a supported format"
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], \
+            "data file should be a supported format"
 
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
         score_file = get_intermediate_file_path(eval_file, '_score')
@@ -413,7 +413,7 @@ class ChartMimic(ImageBaseDataset):
         file_name = url.split("/")[-1]
         data_path = osp.join(data_root, file_name)
         self.data_path = data_path
-        if osp.exists(data_path) and (file_md5 is None or md5(data_path) == file_md5):
+        if osp.exists(data_path) and (file_md5 is None or cached_md5(data_path) == file_md5):
             pass
         else:
             warnings.warn("The dataset tsv is not downloaded")
@@ -206,6 +206,7 @@ class CMMMU(ImageBaseDataset):
 
     def dump_image(self, line):
         os.makedirs(self.img_root, exist_ok=True)
+        line = self.fetch_image(line)
 
         tgt_path_z = []
         if isinstance(line['image'], list):
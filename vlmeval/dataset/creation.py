@@ -627,6 +627,7 @@ class CreationMMBenchDataset(ImageBaseDataset):
     # It returns a dictionary
     def dump_image(self, line):
         os.makedirs(self.img_root, exist_ok=True)
+        line = self.fetch_image(line)
 
         if 'image' in line:
             if isinstance(line['image'], list):
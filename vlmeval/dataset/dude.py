@@ -79,7 +79,7 @@ class DUDE(ImageBaseDataset):
         os.makedirs(data_root, exist_ok=True)
         file_name = url.split('/')[-1]
         data_path = osp.join(data_root, file_name)
-        if osp.exists(data_path) and (file_md5 is None or md5(data_path) == file_md5):
+        if osp.exists(data_path) and (file_md5 is None or cached_md5(data_path) == file_md5):
             pass
         else:
             warnings.warn('The dataset tsv is not downloaded')
@@ -109,6 +109,7 @@ class DUDE(ImageBaseDataset):
         if skip_pdf_parse:
             line['image'] = line['image_path']
         else:
+            line = self.fetch_image(line)
             pdf_data = base64.b64decode(line['image'])
             pdf_file = io.BytesIO(pdf_data)
             encoded_images = []
@@ -31,6 +31,52 @@ def img_root_map(dataset):
     return dataset
 
 
+class LazyImageStore:
+    """The base64 images of a dataset, keyed by index and kept out of `dataset.data`.
+
+    Images are stored in an uncompressed Arrow IPC sidecar next to the TSV, with index-reference images already
+    resolved. The sidecar is memory-mapped, so an image is only read when it is fetched, and the pages are shared
+    by all ranks on the node through the page cache.
+    """
+
+    def __init__(self, path):
+        import pyarrow as pa
+        self.path = path
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        self.images = table.column('image')
+        self.pos = {k: i for i, k in enumerate(table.column('index').to_pylist())}
+
+    @classmethod
+    def build(cls, path, data):
+        import pyarrow as pa
+        data = data[~pd.isna(data['image'])]
+        indices = [str(x) for x in data['index']]
+        image_map = {x: str(y) for x, y in zip(indices, data['image'])}
+        # The image field can store the base64 encoded image or another question index (for saving space)
+        for k in image_map:
+            if len(image_map[k]) <= 64:
+                idx = image_map[k]
+                assert idx in image_map and len(image_map[idx]) > 64
+                image_map[k] = image_map[idx]
+        table = pa.table(dict(index=indices, image=[image_map[k] for k in indices]))
+        tmp = osp.join(osp.dirname(path), '.tmp_' + osp.basename(path))
+        with pa.OSFile(tmp, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+        return cls(path)
+
+    def __reduce__(self):
+        # Pickled by path: unpickling memory-maps the same file instead of copying the images
+        return (self.__class__, (self.path, ))
+
+    def __contains__(self, index):
+        return str(index) in self.pos
+
+    def __getitem__(self, index):
+        return self.images[self.pos[str(index)]].as_py()
+
+
 class ImageBaseDataset:
 
     MODALITY = 'IMAGE'
@@ -42,11 +88,15 @@ class ImageBaseDataset:
         # You can override this variable to save image files to a different directory
         self.dataset_name = dataset
         self.img_root = osp.join(ROOT, 'images', img_root_map(dataset))
+        # Set by `prepare_tsv` if the images are kept in a `LazyImageStore` rather than in `self.data`
+        self.image_store = None
 
         data = self.load_data(dataset)
         self.skip_noimg = skip_noimg
         if skip_noimg and 'image' in data:
             data = data[~pd.isna(data['image'])]
+        elif skip_noimg and self.image_store is not None:
+            data = data[[x in self.image_store for x in data['index']]]
 
         data['index'] = [str(x) for x in data['index']]
 
@@ -65,6 +115,8 @@ class ImageBaseDataset:
             images = [toliststr(image_map[k]) for k in data['index']]
             data['image'] = [x[0] if len(x) == 1 else x for x in images]
             self.meta_only = False
+        elif self.image_store is not None:
+            self.meta_only = False
 
         if 'image_path' in data:
             paths = [toliststr(x) for x in data['image_path']]
@@ -93,14 +145,14 @@ class ImageBaseDataset:
 
         self.data_path = data_path
         if osp.exists(data_path):
-            if file_md5 is None or md5(data_path) == file_md5:
+            if file_md5 is None or cached_md5(data_path) == file_md5:
                 pass
             else:
                 warnings.warn(f'The tsv file is in {data_root}, but the md5 does not match, will re-download')
                 download_file(url, data_path)
                 update_flag = True
         else:
-            if osp.exists(data_path_legacy) and (file_md5 is None or md5(data_path_legacy) == file_md5):
+            if osp.exists(data_path_legacy) and (file_md5 is None or cached_md5(data_path_legacy) == file_md5):
                 warnings.warn(
                     'Due to a modification in #1055, the local target file name has changed. '
                     f'We detected the tsv file with legacy name {data_path_legacy} exists and will do the rename. '
@@ -117,10 +169,88 @@ class ImageBaseDataset:
                 from ..tools import LOCALIZE
                 LOCALIZE(data_path, local_path)
             data_path = local_path
+        # With `VLMEVAL_LAZY_IMAGE=1`, base64 images are moved to a memory-mapped sidecar and fetched on demand
+        # by `dump_image`. Subclasses reading `line['image']` directly must call `fetch_image(line)` first
+        if os.environ.get('VLMEVAL_LAZY_IMAGE', '0') == '1':
+            return self.load_lazy(data_path)
         return load(data_path)
 
+    def load_lazy(self, data_path):
+        """Load the TSV without the image column, the images are kept in `self.image_store`."""
+        store_path = osp.splitext(data_path)[0] + '_images.arrow'
+        if osp.exists(store_path) and osp.getmtime(store_path) >= osp.getmtime(data_path):
+            columns = list(pd.read_csv(data_path, sep='\t', nrows=0).columns)
+            data = load(data_path, columns=[c for c in columns if c != 'image'])
+            self.image_store = LazyImageStore(store_path) if 'image' in columns else None
+            return data
+        data = load(data_path)
+        if 'image' in data:
+            self.image_store = LazyImageStore.build(store_path, data)
+            data.pop('image')
+        return data
+
+    def fetch_image(self, line):
+        """Return `line` with the image field, fetched from the lazy image store if it is not in `self.data`."""
+        if getattr(self, 'image_store', None) is None or 'image' in line:
+            return line
+        line = dict(line)
+        images = toliststr(self.image_store[line['index']])
+        line['image'] = images[0] if len(images) == 1 else images
+        return line
+
+    @property
+    def manifest_path(self):
+        return osp.join(self.img_root, '.manifest.journal')
+
+    @property
+    def manifest(self):
+        """{path relative to `img_root`: (size, md5)} of the images written by `materialize`."""
+        if getattr(self, '_manifest', None) is None:
+            self._manifest = load_journal(self.manifest_path)
+        return self._manifest
+
+    def image_ok(self, path):
+        """Whether the image file `path` is valid. Files in the manifest are checked by their size only
+        (except in paranoid mode, see `read_ok`)."""
+        entry = self.manifest.get(osp.relpath(path, self.img_root))
+        if entry is not None and os.environ.get('VLMEVAL_PARANOID', '0') != '1':
+            try:
+                return os.stat(path).st_size == entry[0]
+            except OSError:
+                return False
+        return read_ok(path)
+
+    def materialize(self, nproc=16):
+        """Decode and write all images of the dataset to `img_root` with `nproc` threads (files are written to a
+        temporary path then renamed). Written files are recorded in the manifest with their sizes and md5, so an
+        interrupted run resumes where it stopped, and `dump_image` skips validating them by decoding."""
+        from concurrent.futures import ThreadPoolExecutor
+        if self.meta_only:
+            return
+        os.makedirs(self.img_root, exist_ok=True)
+        manifest = self.manifest
+
+        def materialize_one(i):
+            paths = self.dump_image(self.data.iloc[i])
+            records = {}
+            for pth in toliststr(paths):
+                rel = osp.relpath(pth, self.img_root)
+                if rel not in manifest:
+                    records[rel] = (os.stat(pth).st_size, md5(pth))
+            return records
+
+        with ThreadPoolExecutor(max_workers=nproc) as executor:
+            futures = [executor.submit(materialize_one, i) for i in range(len(self.data))]
+            for future in tqdm(futures, desc=f'Materialize {self.dataset_name}'):
+                records = future.result()
+                if len(records):
+                    manifest.update(records)
+                    append_journal(records, self.manifest_path)
+        print(f'{len(manifest)} images of {self.dataset_name} are materialized in {self.img_root}')
+
     def dump_image(self, line):
         os.makedirs(self.img_root, exist_ok=True)
+        line = self.fetch_image(line)
 
         if 'image' in line:
             if isinstance(line['image'], list):
@@ -132,19 +262,19 @@ class ImageBaseDataset:
                     image_path = [f'{index}_{i}.png' for i in range(len(line['image']))]
                 for img, im_name in zip(line['image'], image_path):
                     path = osp.join(self.img_root, im_name)
-                    if not read_ok(path):
+                    if not self.image_ok(path):
                         decode_base64_to_image_file(img, path)
                     tgt_path.append(path)
 
             elif isinstance(line['image'], str) and 'image_path' in line:
                 assert isinstance(line['image_path'], str)
                 tgt_path = osp.join(self.img_root, line['image_path'])
-                if not read_ok(tgt_path):
+                if not self.image_ok(tgt_path):
                     decode_base64_to_image_file(line['image'], tgt_path)
                 tgt_path = [tgt_path]
             else:
                 tgt_path = osp.join(self.img_root, f"{line['index']}.jpg")
-                if not read_ok(tgt_path):
+                if not self.image_ok(tgt_path):
                     decode_base64_to_image_file(line['image'], tgt_path)
                 tgt_path = [tgt_path]
         else:
@@ -164,6 +294,8 @@ class ImageBaseDataset:
         if isinstance(line, int):
             line = self.data.iloc[line]
         assert isinstance(line, pd.Series) or isinstance(line, dict)
+        if getattr(self, 'image_store', None) is not None and 'image' not in line:
+            line = dict(line, image=self.image_store[line['index']])
         mmqa_display(line)
 
     # Return a list of dataset names that are supported by this class, can override
@@ -203,6 +335,12 @@ class ImageBaseDataset:
         msgs.append(dict(type='text', value=question))
         return msgs
 
+    # The rules resolving records without the judge during evaluation (see `judge_free_resolve`), can override.
+    # Each rule maps a record to its result, or None if the judge is needed
+    @classmethod
+    def judge_free_rules(cls):
+        return []
+
     # Given the prediction file, return the evaluation results in the format of a dictionary or pandas dataframe
     @abstractmethod
     def evaluate(self, eval_file, **judge_kwargs):
@@ -755,7 +755,7 @@ class GMAIMMBenchDataset(ImageMCQDataset):
                 url = self.DATASET_URL[part_name]
                 file_md5 = self.DATASET_MD5.get(part_name)
                 tsv_path = osp.join(LMUDataRoot(), f'{part_name}.tsv')
-                if not osp.exists(tsv_path) or (file_md5 and md5(tsv_path) != file_md5):
+                if not osp.exists(tsv_path) or (file_md5 and cached_md5(tsv_path) != file_md5):
                     download_file(url, filename=tsv_path)
                 local_path = tsv_path.replace('.tsv', '_local.tsv')
                 if not osp.exists(local_path) or os.environ.get('FORCE_LOCAL'):
@@ -887,13 +887,14 @@ class MMERealWorld(ImageMCQDataset):
         self, dataset="MME-RealWorld", repo_id="yifanzhang114/MME-RealWorld-Base64"
     ):
 
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f"{dataset}.tsv")
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.DATASET_MD5[dataset]:
+            if cached_md5(data_file) != self.DATASET_MD5[dataset]:
                 return False
             return True
 
@@ -1015,7 +1016,7 @@ class MMERealWorld(ImageMCQDataset):
     @classmethod
     def evaluate(self, eval_file, **judge_kwargs):
         from .utils.multiple_choice import extract_characters_regex, get_dimension_rating
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
         FAIL_MSG = 'Failed to obtain answer via API.'
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
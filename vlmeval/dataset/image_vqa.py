@@ -8,10 +8,10 @@ import pandas as pd
 from tqdm import tqdm
 
 from .image_base import ImageBaseDataset
-from .utils import build_judge, DEBUG_MESSAGE
+from .utils import build_judge, judge_free_resolve, DEBUG_MESSAGE
 from ..smp import *
 from ..smp.file import get_intermediate_file_path, get_file_extension
-from ..utils import track_progress_rich
+from ..utils import track_progress_rich, eval_map
 
 class KMMVisMathDataset(ImageBaseDataset):
     TYPE = 'VQA'
@@ -51,11 +51,10 @@ class KMMVisMathDataset(ImageBaseDataset):
         data['prediction'] = [str(x) for x in data['prediction']]
         data['answer'] = [str(x) for x in data['answer']]
         lt = len(data)
-        pool = mp.Pool(16)
         lines = [data.iloc[i] for i in range(lt)]
         
         if listinstr(['KMMVisMath'], dataset):
-            res = pool.map(partial(process_line,method='accuracy_for_kmmvismath'),lines)
+            res = eval_map(partial(process_line,method='accuracy_for_kmmvismath'),lines)
             
         data['eval_gt'] = [r['gt'] for r in res]
         data['eval_pred'] = [r['pred'] for r in res]
@@ -165,11 +164,10 @@ class ChartQAKORDataset(ImageBaseDataset):
         data['prediction'] = [str(x) for x in data['prediction']]
         data['answer'] = [str(x) for x in data['answer']]
         lt = len(data)
-        pool = mp.Pool(16)
         lines = [data.iloc[i] for i in range(lt)]
         
         if listinstr(['ChartQA_KOR'], dataset):
-            res = pool.map(partial(process_line,method='relaxed_accuracy_for_chartqa_kor'),lines)
+            res = eval_map(partial(process_line,method='relaxed_accuracy_for_chartqa_kor'),lines)
             
         data['eval_gt'] = [r['gt'] for r in res]
         data['eval_pred'] = [r['pred'] for r in res]
@@ -272,11 +270,10 @@ class ElementaryMathDataset(ImageBaseDataset):
         data['prediction'] = [str(x) for x in data['prediction']]
         data['answer'] = [str(x) for x in data['answer']]
         lt = len(data)
-        pool = mp.Pool(16)
         lines = [data.iloc[i] for i in range(lt)]
         
         if listinstr(['ELEMENTARY_MATH'], dataset):
-            res = pool.map(partial(process_line,method='relaxed_accuracy_for_elementary_math_kor'),lines)
+            res = eval_map(partial(process_line,method='relaxed_accuracy_for_elementary_math_kor'),lines)
             
         data['eval_gt'] = [r['gt'] for r in res]
         data['eval_pred'] = [r['pred'] for r in res]
@@ -378,18 +375,17 @@ class ImageVQADataset(ImageBaseDataset):
         data['prediction'] = [str(x) for x in data['prediction']]
         data['answer'] = [str(x) for x in data['answer']]
         lt = len(data)
-        pool = mp.Pool(16)
         lines = [data.iloc[i] for i in range(lt)]
         if listinstr(['TextVQA'], dataset):
-            res = pool.map(partial(process_line, method='vqa_score'), lines)
+            res = eval_map(partial(process_line, method='vqa_score'), lines)
         elif listinstr(['ChartQA'], dataset):
-            res = pool.map(partial(process_line, method='relaxed_accuracy'), lines)
+            res = eval_map(partial(process_line, method='relaxed_accuracy'), lines)
         elif listinstr(['OCRVQA', 'GQA'], dataset):
-            res = pool.map(partial(process_line, method='accuracy'), lines)
+            res = eval_map(partial(process_line, method='accuracy'), lines)
         elif listinstr(['DocVQA', 'InfoVQA'], dataset):
-            res = pool.map(partial(process_line, method='anls'), lines)
+            res = eval_map(partial(process_line, method='anls'), lines)
         else:  # default using vqa_score to calculate score
-            res = pool.map(process_line, lines)
+            res = eval_map(process_line, lines)
 
         data['eval_gt'] = [r['gt'] for r in res]
         data['eval_pred'] = [r['pred'] for r in res]
@@ -506,9 +502,8 @@ class VizWiz(ImageBaseDataset):
             data['answer'] = [str(x) for x in data['answers']]
 
             lt = len(data)
-            pool = mp.Pool(16)
             lines = [data.iloc[i] for i in range(lt)]
-            res = pool.map(process_line, lines)
+            res = eval_map(process_line, lines)
 
             hit = hit_calculate(res, 'VizWiz')
             ret = dict()
@@ -1048,6 +1043,7 @@ class Physics_yale(ImageBaseDataset):
     def build_prompt(self, line):
         if isinstance(line, int):
             line = self.data.iloc[line]
+        line = self.fetch_image(line)
 
         if pd.isna(line['image']):
             tgt_path = None
@@ -1160,6 +1156,7 @@ class OlympiadBench(ImageBaseDataset):
 
     def dump_image(self, line):
         os.makedirs(self.img_root, exist_ok=True)
+        line = self.fetch_image(line)
 
         tgt_path_z = []
         if isinstance(line['image'], list):
@@ -1695,6 +1692,7 @@ class MME_CoT(ImageBaseDataset):
 
     def dump_image(self, line):
         os.makedirs(self.img_root, exist_ok=True)
+        line = self.fetch_image(line)
 
         if 'image' in line:
             if isinstance(line['image'], list):
@@ -1936,6 +1934,11 @@ class MMVet(ImageBaseDataset):
         'MMVet_Hard': '63a598819a936a2e77c410a78a21ff16'
     }
 
+    @classmethod
+    def judge_free_rules(cls):
+        from .utils.mmvet import MMVet_prefetch
+        return [MMVet_prefetch]
+
     # It returns a DataFrame
     @classmethod
     def evaluate(self, eval_file, **judge_kwargs):
@@ -1947,19 +1950,23 @@ class MMVet(ImageBaseDataset):
         nproc = judge_kwargs.pop('nproc', 4)
         if not osp.exists(storage):
             data = load(eval_file)
-            model = build_judge(max_tokens=3, **judge_kwargs)
-            assert model.working(), 'MMVet evaluation requires a working OPENAI API\n' + DEBUG_MESSAGE
-
             lt = len(data)
             lines = [data.iloc[i] for i in range(lt)]
-            tups = [(model, line) for line in lines]
             indices = [line['index'] for line in lines]
 
             ans = load(tmp_file) if osp.exists(tmp_file) else {}
-            tups = [x for x, i in zip(tups, indices) if i not in ans]
+            lines = [x for x, i in zip(lines, indices) if i not in ans]
+            indices = [i for i in indices if i not in ans]
+
+            # Only the records not resolved by the judge-free rules are sent to the judge
+            ans.update(judge_free_resolve(lines, indices, self.judge_free_rules(), save=tmp_file))
+            lines = [x for x, i in zip(lines, indices) if i not in ans]
             indices = [i for i in indices if i not in ans]
 
             if len(indices):
+                model = build_judge(max_tokens=3, **judge_kwargs)
+                assert model.working(), 'MMVet evaluation requires a working OPENAI API\n' + DEBUG_MESSAGE
+                tups = [(model, line) for line in lines]
                 new_results = track_progress_rich(
                     MMVet_auxeval,
                     tups,
@@ -2076,9 +2083,8 @@ class WildDocBenchmark(ImageBaseDataset):
         data['prediction'] = [str(x) for x in data['prediction']]
         data['answer'] = [str(x) for x in data['answer']]
         lt = len(data)
-        pool = mp.Pool(16)
         lines = [data.iloc[i] for i in range(lt)]
-        DocVQA_res = pool.map(partial(process_line_WildDoc, method='anls'),
+        DocVQA_res = eval_map(partial(process_line_WildDoc, method='anls'),
                               lines)
         hit = hit_calculate(DocVQA_res, "DocVQA")
         DocVQA_overall = np.mean(hit) * 100
@@ -2090,9 +2096,8 @@ class WildDocBenchmark(ImageBaseDataset):
         data['prediction'] = [str(x) for x in data['prediction']]
         data['answer'] = [str(x) for x in data['answer']]
         lt = len(data)
-        pool = mp.Pool(16)
         lines = [data.iloc[i] for i in range(lt)]
-        ChartQA_res = pool.map(
+        ChartQA_res = eval_map(
             partial(process_line_WildDoc, method='relaxed_accuracy'), lines)
         hit = hit_calculate(ChartQA_res, "ChartQA")
         ChartQA_overall = np.mean(hit) * 100
@@ -2673,7 +2678,7 @@ class MMNIAH(ImageBaseDataset):
         file_name = 'MM_NIAH_VAL.tsv' if 'MM_NIAH_VAL' in url else 'MM_NIAH_TEST.tsv'
         data_path = osp.join(data_root, file_name)
         if osp.exists(data_path) and (file_md5 is None
-                                      or md5(data_path) == file_md5):
+                                      or cached_md5(data_path) == file_md5):
             pass
         elif file_name == 'MM_NIAH_TEST.tsv':
             warnings.warn('The dataset tsv is not downloaded')
@@ -3734,7 +3739,7 @@ class MMVMBench(ImageBaseDataset):
 
     @classmethod
     def evaluate(self, eval_file, **judge_kwargs):
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
         judge = judge_kwargs['model']
         nproc = judge_kwargs.pop('nproc', 4)
         tmp_file = get_intermediate_file_path(eval_file, f'_{judge}_tmp')
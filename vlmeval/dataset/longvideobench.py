@@ -105,12 +105,13 @@ class LongVideoBench(VideoBaseDataset):
         return ['LongVideoBench']
 
     def prepare_dataset(self, dataset_name='LongVideoBench', repo_id='longvideobench/LongVideoBench'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
             if not osp.exists(data_file):
                 return False
-            if md5(data_file) != self.MD5:
-                print("md5 mismatch", md5(data_file), self.MD5)
+            if cached_md5(data_file) != self.MD5:
+                print("md5 mismatch", cached_md5(data_file), self.MD5)
                 return False
             data = load(data_file)
             for video_pth in data['video_path']:
@@ -134,7 +135,7 @@ class LongVideoBench(VideoBaseDataset):
         else:
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if osp.exists(data_file) and md5(data_file) == self.MD5:
+                if osp.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
 
                 data_file = pd.read_json(osp.join(pth, 'lvb_val.json'))
@@ -278,7 +279,7 @@ class LongVideoBench(VideoBaseDataset):
     def evaluate(self, eval_file, **judge_kwargs):
         from .utils.longvideobench import get_dimension_rating, extract_characters_regex, extract_option
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
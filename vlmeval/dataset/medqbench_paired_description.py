@@ -193,6 +193,7 @@ class MedqbenchPairedDescriptionDataset(ImageBaseDataset):
 
     def prepare_dataset(self, dataset_name, repo_id='jiyaoliufd/MedQ-Bench'):
         """Prepare dataset from Huggingface Hub"""
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, self.DATASET_URL[dataset_name])
             return os.path.exists(data_file)
@@ -87,7 +87,7 @@ class MEGABench(VideoBaseDataset):
     def prepare_dataset(self, dataset_name='MEGABench', repo_id='TIGER-Lab/MEGA-Bench'):
         def not_integrity(dataset_path):
             zip_file = osp.join(dataset_path, 'data.zip')
-            return self.ZIP_MD5 != md5(zip_file)
+            return self.ZIP_MD5 != cached_md5(zip_file)
 
         def unzip_hf_zip(pth, hub_pth):
             dataset_path = osp.join(pth, 'images')  # LMUData/images
@@ -395,7 +395,7 @@ class MEGABench(VideoBaseDataset):
         return message
 
     def evaluate(self, eval_file, **judge_kwargs):
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
         data = load(eval_file)
         result = []
 
@@ -124,8 +124,9 @@ class MIABench(ImageBaseDataset):
             num_samples = len(data)
             lines = [data.loc[i] for i in range(num_samples)]
             prompts = [generate_prompt(line) for line in lines]
-            org_data = MIABench('MIA-Bench').data
-            img_map = {x: y for x, y in zip(org_data['index'], org_data['image'])}
+            org_dataset = MIABench('MIA-Bench')
+            org_data = org_dataset.data
+            img_map = {x: org_dataset.fetch_image(org_data.iloc[i])['image'] for i, x in enumerate(org_data['index'])}
             image_b64 = [img_map[idx] for idx in data['index']]
             indices = list(data['index'])
             mm_messages = [
@@ -79,13 +79,14 @@ class MLVU_MCQ(VideoBaseDataset):
         return ['MLVU_MCQ']
 
     def prepare_dataset(self, dataset_name='MLVU_MCQ', repo_id='MLVU/MVLU'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             data = load(data_file)
@@ -103,7 +104,7 @@ class MLVU_MCQ(VideoBaseDataset):
         else:
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if os.path.exists(data_file) and md5(data_file) == self.MD5:
+                if os.path.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
                 json_data_dir = os.path.join(dataset_path, 'MLVU', 'json')
                 self.data_list = []
@@ -211,7 +212,7 @@ class MLVU_MCQ(VideoBaseDataset):
 
     @classmethod
     def evaluate(self, eval_file, **judge_kwargs):
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         score_file = get_intermediate_file_path(eval_file, '_score')
@@ -294,13 +295,14 @@ class MLVU_OpenEnded(VideoBaseDataset):
         return ['MLVU_OpenEnded']
 
     def prepare_dataset(self, dataset_name='MLVU_OpenEnded', repo_id='MLVU/MVLU'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             data = load(data_file)
@@ -318,7 +320,7 @@ class MLVU_OpenEnded(VideoBaseDataset):
         else:
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if os.path.exists(data_file) and md5(data_file) == self.MD5:
+                if os.path.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
                 json_data_dir = os.path.join(dataset_path, 'MLVU', 'json')
                 self.data_list = []
@@ -68,9 +68,10 @@ Please directly reply with your response to the only question.
         return ['MMBench-Video']
 
     def prepare_dataset(self, dataset_name='MMBench-Video', repo_id='opencompass/MMBench-Video'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data['video_path']:
@@ -209,7 +210,7 @@ Please directly reply with your response to the only question.
     def evaluate(self, eval_file, **judge_kwargs):
         from .utils.mmbench_video import get_dimension_rating, system_prompt, build_prompt
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
         judge = judge_kwargs['model']
         nproc = judge_kwargs.pop('nproc', 4)
 
@@ -369,7 +369,8 @@ class MMIFEval(ImageBaseDataset):
     # @classmethod
 
     def evaluate(self, eval_file, **judge_kwargs):
-        raw_bench_data = MMIFEval("MM-IFEval").data
+        raw_bench = MMIFEval("MM-IFEval")
+        raw_bench_data = raw_bench.data
         global aux_data_dict
         model = judge_kwargs["model"]
         storage = get_intermediate_file_path(eval_file, f"_{model}", "jsonl")
@@ -387,7 +388,7 @@ class MMIFEval(ImageBaseDataset):
             else:
                 aux_data.append(line)
 
-            line["image"] = raw_bench_data.iloc[i]["image"]
+            line["image"] = raw_bench.fetch_image(raw_bench_data.iloc[i])["image"]
 
         aux_data_dict = {}
         for line in aux_data:
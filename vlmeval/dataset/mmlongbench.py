@@ -479,6 +479,7 @@ class MMLongBench(ImageBaseDataset):
         if skip_pdf_parse:
             line['image'] = line['image_path']
         else:
+            line = self.fetch_image(line)
             pdf_data = base64.b64decode(line['image'])
             pdf_file = io.BytesIO(pdf_data)
             encoded_images = []
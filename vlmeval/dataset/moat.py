@@ -61,7 +61,7 @@ class MOAT(ImageBaseDataset):
         zip_url = "https://huggingface.co/datasets/waltsun/MOAT/resolve/main/MOAT_images.zip"
         zip_md5 = 'c0818a3e0a3f0bc7ee2be89ff04d73a6'
         zip_path = osp.join(ROOT, "MOAT_images.zip")
-        if osp.exists(zip_path) and md5(zip_path) == zip_md5:
+        if osp.exists(zip_path) and cached_md5(zip_path) == zip_md5:
             pass
         else:
             warnings.warn('The dataset tsv is not downloaded')
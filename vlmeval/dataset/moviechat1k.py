@@ -43,9 +43,10 @@ class MovieChat1k(VideoBaseDataset):
         return ['MovieChat1k']
 
     def prepare_dataset(self, dataset_name='MovieChat1k', repo_id='Enxin/VLMEval-MovieChat1k'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data['video']:
@@ -216,7 +217,7 @@ class MovieChat1k(VideoBaseDataset):
     def evaluate(self, eval_file, **judge_kwargs):
         from .utils.moviechat1k import get_dimension_rating, prepare_score_prompt
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
         judge = judge_kwargs.setdefault('model', 'chatgpt-0125')
         assert judge in ['chatgpt-0125'], f'Invalid judge model for MovieChat1k: {judge}'
         nproc = judge_kwargs.pop('nproc', 4)
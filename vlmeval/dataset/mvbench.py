@@ -77,13 +77,14 @@ Based on your observations, select the best option that accurately addresses the
         return ['MVBench']
 
     def prepare_dataset(self, dataset_name='MVBench', repo_id='OpenGVLab/MVBench'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             data = load(data_file)
@@ -112,7 +113,7 @@ Based on your observations, select the best option that accurately addresses the
 
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if os.path.exists(data_file) and md5(data_file) == self.MD5:
+                if os.path.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
                 json_data_dir = os.path.join(pth, 'json')
                 self.data_list = []
@@ -362,7 +363,7 @@ Based on your observations, select the best option that accurately addresses the
     @classmethod
     def evaluate(self, eval_file, **judge_kwargs):
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
@@ -445,13 +446,14 @@ Based on your observations, select the best option that accurately addresses the
         return ['MVBench_MP4']
 
     def prepare_dataset(self, dataset_name='MVBench_MP4', repo_id='OpenGVLab/MVBench'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MP4_MD5:
+            if cached_md5(data_file) != self.MP4_MD5:
                 return False
 
             data = load(data_file)
@@ -469,7 +471,7 @@ Based on your observations, select the best option that accurately addresses the
         else:
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if os.path.exists(data_file) and md5(data_file) == self.MP4_MD5:
+                if os.path.exists(data_file) and cached_md5(data_file) == self.MP4_MD5:
                     return
                 json_data_path = os.path.join(dataset_path, 'test.json')
                 json_data = load(json_data_path)
@@ -609,7 +611,7 @@ Based on your observations, select the best option that accurately addresses the
     @classmethod
     def evaluate(self, eval_file, **judge_kwargs):
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
@@ -68,13 +68,14 @@ Please do not add any other answers beyond this.
         return ['QBench_Video_MCQ']
 
     def prepare_dataset(self, dataset_name='qbenchvideo_single_MCQ', repo_id='zhangzicheng/Q-Bench-Video'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             data = load(data_file)
@@ -159,7 +160,7 @@ Please do not add any other answers beyond this.
 
     @classmethod
     def evaluate(self, eval_file, **judge_kwargs):
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         score_file = get_intermediate_file_path(eval_file, '_score')
@@ -226,13 +227,14 @@ Please analyze these frames and provide a detailed and accurate answer from the
         return ['QBench_Video_VQA']
 
     def prepare_dataset(self, dataset_name='qbenchvideo_single_VQA', repo_id='zhangzicheng/Q-Bench-Video'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             data = load(data_file)
@@ -0,0 +1,56 @@
+import pickle
+from .image_base import ImageBaseDataset, LazyImageStore
+from ..smp import *
+
+
+def shared_prefix(dataset_name, work_dir=None):
+    """The path prefix of the files used to hand a dataset over to the other ranks on the node.
+
+    The files are put in `/dev/shm` (memory backed) if available, otherwise in `{LMUDataRoot()}/cache/shm`.
+    The prefix is keyed by the launch (rendezvous id, master port and the PID of the launcher, which is the
+    parent of all local ranks) and by `work_dir`, so that concurrent jobs on the same node never collide.
+    """
+    root = '/dev/shm' if osp.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+    if root is None:
+        root = osp.join(LMUDataRoot(), 'cache', 'shm')
+        os.makedirs(root, exist_ok=True)
+    run_id = '_'.join([
+        os.environ.get('TORCHELASTIC_RUN_ID', 'none'), os.environ.get('MASTER_PORT', 'none'), str(os.getppid())])
+    key = md5(f'{run_id}_{osp.abspath(work_dir) if work_dir else ""}_{dataset_name}')[:16]
+    return osp.join(root, f'vlmeval_{key}')
+
+
+def share_dataset(dataset, prefix):
+    """Publish a built dataset, so that other processes can attach to it with `attach_dataset` without rebuilding.
+
+    The base64 images (the bulk of an image dataset) are written to an Arrow IPC file served by a `LazyImageStore`:
+    attached processes memory-map it, so the images are shared zero-copy by all ranks on the node. The rest of the
+    dataset (the metadata frame and the other attributes) is pickled.
+
+    Returns:
+        list[str]: The files written, to be removed once all processes have attached.
+    """
+    state = dict(dataset.__dict__)
+    files = []
+    if isinstance(dataset, ImageBaseDataset) and 'image' in state['data']:
+        store_path = prefix + '_images.arrow'
+        state['image_store'] = LazyImageStore.build(store_path, state['data'])
+        state['data'] = state['data'].drop(columns=['image'])
+        files.append(store_path)
+    tmp = prefix + '.tmp.pkl'
+    with open(tmp, 'wb') as fout:
+        pickle.dump((type(dataset), state), fout, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, prefix + '.pkl')
+    files.append(prefix + '.pkl')
+    return files
+
+
+def attach_dataset(prefix):
+    """Attach to a dataset published by `share_dataset`. Returns None if nothing is published at `prefix`."""
+    if not osp.exists(prefix + '.pkl'):
+        return None
+    with open(prefix + '.pkl', 'rb') as fin:
+        cls, state = pickle.load(fin)
+    dataset = cls.__new__(cls)
+    dataset.__dict__.update(state)
+    return dataset
@@ -96,7 +96,7 @@ class SlideVQA(ImageBaseDataset):
     def dump_image(self, origin_line):
         os.makedirs(self.img_root, exist_ok=True)
 
-        line = origin_line.copy()
+        line = self.fetch_image(origin_line).copy()
         if not isinstance(line['image_path'], List):
             line['image_path'] = [line['image_path']]
         line['image_path'] = line['image_path'][:self.max_pages]
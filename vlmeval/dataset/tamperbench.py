@@ -85,6 +85,7 @@ class MVTamperBench(VideoBaseDataset):
         else:
             repo_id = f'Srikant86/{dataset_name}'
 
+        @integrity_cache
         def check_integrity(pth):
             """
             Verifies the completeness and consistency of the dataset located at the specified path.
@@ -103,7 +104,7 @@ class MVTamperBench(VideoBaseDataset):
                 # If the data file doesn't exist, immediately return False
                 return False
             # Verify the integrity of the data file by checking its MD5 hash
-            if md5(data_file) != self.MD5[dataset_name]:
+            if cached_md5(data_file) != self.MD5[dataset_name]:
                 return False
             # Load the data from the data file
             data = load(data_file)
@@ -130,7 +131,7 @@ class MVTamperBench(VideoBaseDataset):
 
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if os.path.exists(data_file) and md5(data_file) == self.MD5[dataset_name]:
+                if os.path.exists(data_file) and cached_md5(data_file) == self.MD5[dataset_name]:
                     return
                 json_data_dir = os.path.join(dataset_path, 'json')
                 self.data_list = []
@@ -436,7 +437,8 @@ class MVTamperBench(VideoBaseDataset):
         Evaluates the given evaluation file and generates ratings based on different dimensions.
 
         Args:
-            eval_file (str): Path to the evaluation file. The file should be in a supported format (xlsx/json/tsv).
+            eval_file (str): Path to the evaluation file.
+                The file should be in a supported format (xlsx/json/tsv/parquet/feather).
             **judge_kwargs: Additional keyword arguments for the judge model.
 
         Returns:
@@ -454,7 +456,7 @@ class MVTamperBench(VideoBaseDataset):
             - Ratings are generated for different dimensions and saved to respective files.
         """
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         tgt_task_type_file = get_intermediate_file_path(eval_file, '_task_type_rating', 'json')
@@ -72,13 +72,14 @@ class TempCompass_MCQ(VideoBaseDataset):
         return ['TempCompass_MCQ']
 
     def prepare_dataset(self, dataset_name='TempCompass_MCQ', repo_id='lmms-lab/TempCompass'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not osp.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             data = load(data_file)
@@ -107,7 +108,7 @@ class TempCompass_MCQ(VideoBaseDataset):
 
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if osp.exists(data_file) and md5(data_file) == self.MD5:
+                if osp.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
                 self.data_list = []
                 for k, v in self.type_data_list.items():
@@ -269,13 +270,14 @@ class TempCompass_Captioning(VideoBaseDataset):
         return ['TempCompass_Captioning']
 
     def prepare_dataset(self, dataset_name='TempCompass_Captioning', repo_id='lmms-lab/TempCompass'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not osp.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             data = load(data_file)
@@ -304,7 +306,7 @@ class TempCompass_Captioning(VideoBaseDataset):
 
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if osp.exists(data_file) and md5(data_file) == self.MD5:
+                if osp.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
                 self.data_list = []
                 for k, v in self.type_data_list.items():
@@ -466,13 +468,14 @@ class TempCompass_YorN(VideoBaseDataset):
         return ['TempCompass_YorN']
 
     def prepare_dataset(self, dataset_name='TempCompass_YorN', repo_id='lmms-lab/TempCompass'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not osp.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
 
             data = load(data_file)
@@ -501,7 +504,7 @@ class TempCompass_YorN(VideoBaseDataset):
 
             def generate_tsv(pth):
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if osp.exists(data_file) and md5(data_file) == self.MD5:
+                if osp.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
                 self.data_list = []
                 for k, v in self.type_data_list.items():
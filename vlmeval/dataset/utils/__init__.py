@@ -1,11 +1,11 @@
-from .judge_util import build_judge, DEBUG_MESSAGE
+from .judge_util import build_judge, judge_free_resolve, DEBUG_MESSAGE
 from .multiple_choice import extract_answer_from_item, prefetch_answer
 from .vqa_eval import levenshtein_distance
 from .spatial457 import Spatial457_utils
 
 
 __all__ = [
-    'build_judge', 'extract_answer_from_item', 'prefetch_answer',
+    'build_judge', 'judge_free_resolve', 'extract_answer_from_item', 'prefetch_answer',
     'levenshtein_distance', 'DEBUG_MESSAGE',
     'Spatial457_utils'
 ]
@@ -1,5 +1,6 @@
 import os
-from ...smp import load_env
+import os.path as osp
+from ...smp import load_env, load, dump, get_logger
 
 INTERNAL = os.environ.get('INTERNAL', 0)
 
@@ -31,15 +32,48 @@ def build_judge(**kwargs):
     else:
         model_version = LOCAL_LLM
 
+    # Judge responses are cached across runs, set `VLMEVAL_JUDGE_CACHE=0` to disable
+    kwargs.setdefault('cache', os.environ.get('VLMEVAL_JUDGE_CACHE', '1') == '1')
     if model in ['qwen-7b', 'qwen-72b', 'deepseek']:
         model = SiliconFlowAPI(model_version, **kwargs)
     elif model == 'llama31-8b':
+        kwargs.pop('cache')
         model = HFChatModel(model_version, **kwargs)
     else:
         model = OpenAIWrapper(model_version, **kwargs)
     return model
 
 
+def judge_free_resolve(lines, keys, rules, save=None):
+    """Resolve, without calling the judge, the records that a judge-free rule can decide.
+
+    Args:
+        lines (list[pd.Series]): The records.
+        keys (list): The keys of the records (usually the `index`).
+        rules (list[callable]): Each rule maps a record to its result (in the same format as the judge-based
+            function returns, with the reason recorded in the log), or None if it can not decide. The first rule
+            that decides wins. See `ImageBaseDataset.judge_free_rules`.
+        save (str, optional): The pkl file of `track_progress_rich`, the resolved results are added to it.
+
+    Returns:
+        dict: key -> result, for the resolved records. The other records still need the judge.
+    """
+    resolved = {}
+    for key, line in zip(keys, lines):
+        for rule in rules:
+            ret = rule(line)
+            if ret is not None:
+                resolved[key] = ret
+                break
+    if len(lines):
+        get_logger('Evaluation').info(f'{len(resolved)} / {len(lines)} records resolved without the judge. ')
+    if save is not None and len(resolved):
+        ans = load(save) if osp.exists(save) else {}
+        ans.update(resolved)
+        dump(ans, save)
+    return resolved
+
+
 DEBUG_MESSAGE = """
 To debug the OpenAI API, you can try the following scripts in python:
 ```python
@@ -42,6 +42,23 @@ and their actual physical characteristics. | 1.0
     return gpt4_prompt
 
 
+def MMVet_prefetch(line):
+    """The judge-free rule: full score if the prediction is exactly the ground truth (or one of its <OR> elements),
+    ignoring case, spacing and the final period."""
+    def normalize(s):
+        # Empty cells are loaded as NaN
+        return '' if pd.isna(s) else ' '.join(str(s).lower().split()).rstrip('.').strip()
+
+    gt = '' if pd.isna(line['answer']) else str(line['answer'])
+    if '<AND>' in gt:
+        return None
+    candidates = [normalize(x) for x in gt.split('<OR>')]
+    pred = normalize(line['prediction'])
+    if pred != '' and pred in candidates:
+        return dict(log='Prefetch succeed: exact match', score=1.0)
+    return None
+
+
 def MMVet_auxeval(model, line):
     def float_cvt(s):
         try:
@@ -1,5 +1,5 @@
 import pandas as pd
-from ...utils import can_infer, track_progress_rich, can_infer_lego
+from ...utils import can_infer, can_infer_many, track_progress_rich, can_infer_lego
 from ...smp import *
 import numpy as np
 import re
@@ -476,14 +476,18 @@ def mcq_vanilla_eval(model, data, meta, nproc, result_file, dataset_name=None):
 
     data = data[data['index'].isin(answer_map)]
     data['GT'] = [answer_map[idx] for idx in data['index']]
-    items = []
-
-    for i in range(len(data)):
-        # Dealing with the normal part
-        item = data.iloc[i]
-        if item['index'] not in result:
-            items.append(item)
+    pending = data[~data['index'].isin(result)]
+
+    # Resolve the predictions matched by the heuristics in batch, only the ambiguous ones are sent to the judge
+    if len(pending) and (dataset_name is None or 'LEGO' not in dataset_name):
+        prefetched = can_infer_many(pending['prediction'], pending)
+        for k, opt, pred, gt in zip(pending['index'].to_numpy(), prefetched, pending['prediction'], pending['GT']):
+            if opt:
+                result[k] = dict(hit=int(opt == gt), log=f'Match Log: {pred}. ')
+        dump(result, result_file)
+        pending = pending[[not x for x in prefetched]]
 
+    items = [pending.iloc[i] for i in range(len(pending))]
     tups = [dict(model=model, item=x, dataset_name=dataset_name) for x in items]
     keys = [x['index'] for x in items]
     if len(tups):
@@ -499,6 +503,35 @@ def mcq_vanilla_eval(model, data, meta, nproc, result_file, dataset_name=None):
     return data
 
 
+# For Circular Evaluation
+def prefetch_circular_groups(data):
+    """The vectorized version of `prefetch_circular_group`, applied to all groups in `data` at once.
+
+    Args:
+        data (pd.DataFrame): The records of the groups, with columns `g_index` and `GT`.
+
+    Returns:
+        dict: g_index -> the prefetched result (dict(hit=..., log=...)), or None if the judge is needed.
+    """
+    pred = pd.Series(can_infer_many(data['prediction'], data), index=data.index, dtype=object)
+    g_index = data['g_index']
+    matched = pd.Series(pred.to_numpy() == data['GT'].to_numpy(dtype=object), index=data.index)
+    failed = pred.astype(bool) & ~matched
+    # A group is resolved as a hit if all its records are matched, as a miss if any record is wrongly matched
+    ret = {k: None for k in pd.unique(g_index)}
+    for k, v in matched.groupby(g_index, sort=False).all().items():
+        if v:
+            ret[k] = dict(hit=1, log='Succeed During Pre-fetching')
+    rolling = data.groupby('g_index', sort=False).cumcount()
+    first_failed = failed[failed].groupby(g_index[failed], sort=False).head(1).index
+    for i in first_failed:
+        ret[g_index[i]] = dict(hit=0, log=(
+            f'Failed in Prefetching Rolling {rolling[i]}: Answer is {data.at[i, "GT"]}, '
+            f"Prediction is {data.at[i, 'prediction']}, Pre-fetched is {pred[i]}. "
+        ))
+    return ret
+
+
 # data, meta are pd.DataFrame, result_file is a path
 def mcq_circular_eval(model, data, meta, nproc, result_file, dataset_name=None):
     result = {}
@@ -513,65 +546,50 @@ def mcq_circular_eval(model, data, meta, nproc, result_file, dataset_name=None):
         data['g_index'] = [int(x % 1e6) for x in data['index']]
 
     # Only keep those lines in the meta data
-    data = data[data['index'].isin(answer_map)]
-    data['GT'] = [answer_map[idx] for idx in data['index']]
+    data = data[data['index'].isin(answer_map)].reset_index(drop=True)
+    data['GT'] = data['index'].map(answer_map)
+    data_main = data[data['index'] == data['g_index']].reset_index(drop=True)
 
-    data['tmp_flag'] = [x == y for x, y in zip(data['index'], data['g_index'])]
-    data_main = data[data['tmp_flag']]
-    data_main.pop('tmp_flag')
+    # The groups (keyed by the index of the main record) not evaluated yet, partitioned in a single pass
+    keys = [idx for idx in data_main['g_index'].to_numpy() if idx not in result]
+    pending = data[data['g_index'].isin(keys)]
 
-    data_groups = []
-    for i in range(len(data_main)):
-        # Dealing with the normal part
-        idx = data_main.iloc[i]['index']
-        if idx not in result:
-            sub_data = data[data['g_index'] == idx]
-            data_groups.append(sub_data)
-
-    if len(data_groups):
-        prefetched = [prefetch_circular_group(g, verbose=False) for g in data_groups]
+    if len(keys):
+        prefetched = prefetch_circular_groups(pending)
         remain = []
-        for dg, pf in zip(data_groups, prefetched):
-            if pf is not None:
-                result[dg.iloc[0]['g_index']] = pf
+        for k in keys:
+            if prefetched[k] is not None:
+                result[k] = prefetched[k]
             else:
-                remain.append(dg)
+                remain.append(k)
         dump(result, result_file)
 
-        tups = [dict(model=model, sub_data=x, dataset_name=dataset_name) for x in remain]
-        keys = [x.iloc[0]['g_index'] for x in remain]
-
-        if len(tups) == 0:
+        if len(remain) == 0:
             pass
         elif model is None:
             logger = get_logger('Evaluation')
             logger.warning('Exact Matching mode, will not do GPT-based answer matching. ')
-            for k in keys:
+            for k in remain:
                 result[k] = dict(
                     hit=0, log='Failed in Prefetch, no GPT-based answer matching under `exact_matching` policy.')
         else:
+            groups = dict(list(pending[pending['g_index'].isin(remain)].groupby('g_index', sort=False)))
+            tups = [dict(model=model, sub_data=groups[k], dataset_name=dataset_name) for k in remain]
             res = track_progress_rich(
                 eval_circular_group,
                 tups,
                 nproc=nproc,
                 chunksize=nproc,
                 save=result_file,
-                keys=keys)
+                keys=remain)
             result = load(result_file)
-            for k, v in zip(keys, res):
+            for k, v in zip(remain, res):
                 if k not in result:
                     result[k] = v
 
-    tmp_ext = get_pred_file_format()
-    tmp_pth = f'/tmp/{timestr()}.{tmp_ext}'
-    dump(data_main, tmp_pth)
-    data_main = load(tmp_pth)
-    indices = data_main['index']
-    data_main['hit'] = [result[i]['hit'] for i in indices]
-    data_main['log'] = [result[i]['log'] for i in indices]
-    if 'GT' in data_main:
-        data_main.pop('GT')
-
+    data_main['hit'] = [result[i]['hit'] for i in data_main['index']]
+    data_main['log'] = [result[i]['log'] for i in data_main['index']]
+    data_main.pop('GT')
     return data_main
 
 
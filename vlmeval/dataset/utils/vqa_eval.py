@@ -5,154 +5,153 @@
 from ...smp import *
 from typing import Optional
 import re
+import functools
+
+_ARTICLES = {'a', 'an', 'the'}
+_MANUAL_MAP = {
+    'none': '0',
+    'zero': '0',
+    'one': '1',
+    'two': '2',
+    'three': '3',
+    'four': '4',
+    'five': '5',
+    'six': '6',
+    'seven': '7',
+    'eight': '8',
+    'nine': '9',
+    'ten': '10',
+}
+_CONTRACTIONS = {
+    'aint': "ain't",
+    'arent': "aren't",
+    'cant': "can't",
+    'couldve': "could've",
+    'couldnt': "couldn't",
+    "couldn'tve": "couldn't've",
+    "couldnt've": "couldn't've",
+    'didnt': "didn't",
+    'doesnt': "doesn't",
+    'dont': "don't",
+    'hadnt': "hadn't",
+    "hadnt've": "hadn't've",
+    "hadn'tve": "hadn't've",
+    'hasnt': "hasn't",
+    'havent': "haven't",
+    'hed': "he'd",
+    "hed've": "he'd've",
+    "he'dve": "he'd've",
+    'hes': "he's",
+    'howd': "how'd",
+    'howll': "how'll",
+    'hows': "how's",
+    "Id've": "I'd've",
+    "I'dve": "I'd've",
+    'Im': "I'm",
+    'Ive': "I've",
+    'isnt': "isn't",
+    'itd': "it'd",
+    "itd've": "it'd've",
+    "it'dve": "it'd've",
+    'itll': "it'll",
+    "let's": "let's",
+    'maam': "ma'am",
+    'mightnt': "mightn't",
+    "mightnt've": "mightn't've",
+    "mightn'tve": "mightn't've",
+    'mightve': "might've",
+    'mustnt': "mustn't",
+    'mustve': "must've",
+    'neednt': "needn't",
+    'notve': "not've",
+    'oclock': "o'clock",
+    'oughtnt': "oughtn't",
+    "ow's'at": "'ow's'at",
+    "'ows'at": "'ow's'at",
+    "'ow'sat": "'ow's'at",
+    'shant': "shan't",
+    "shed've": "she'd've",
+    "she'dve": "she'd've",
+    "she's": "she's",
+    'shouldve': "should've",
+    'shouldnt': "shouldn't",
+    "shouldnt've": "shouldn't've",
+    "shouldn'tve": "shouldn't've",
+    "somebody'd": 'somebodyd',
+    "somebodyd've": "somebody'd've",
+    "somebody'dve": "somebody'd've",
+    'somebodyll': "somebody'll",
+    'somebodys': "somebody's",
+    'someoned': "someone'd",
+    "someoned've": "someone'd've",
+    "someone'dve": "someone'd've",
+    'someonell': "someone'll",
+    'someones': "someone's",
+    'somethingd': "something'd",
+    "somethingd've": "something'd've",
+    "something'dve": "something'd've",
+    'somethingll': "something'll",
+    'thats': "that's",
+    'thered': "there'd",
+    "thered've": "there'd've",
+    "there'dve": "there'd've",
+    'therere': "there're",
+    'theres': "there's",
+    'theyd': "they'd",
+    "theyd've": "they'd've",
+    "they'dve": "they'd've",
+    'theyll': "they'll",
+    'theyre': "they're",
+    'theyve': "they've",
+    'twas': "'twas",
+    'wasnt': "wasn't",
+    "wed've": "we'd've",
+    "we'dve": "we'd've",
+    'weve': "we've",
+    'werent': "weren't",
+    'whatll': "what'll",
+    'whatre': "what're",
+    'whats': "what's",
+    'whatve': "what've",
+    'whens': "when's",
+    'whered': "where'd",
+    'wheres': "where's",
+    'whereve': "where've",
+    'whod': "who'd",
+    "whod've": "who'd've",
+    "who'dve": "who'd've",
+    'wholl': "who'll",
+    'whos': "who's",
+    'whove': "who've",
+    'whyll': "why'll",
+    'whyre': "why're",
+    'whys': "why's",
+    'wont': "won't",
+    'wouldve': "would've",
+    'wouldnt': "wouldn't",
+    "wouldnt've": "wouldn't've",
+    "wouldn'tve": "wouldn't've",
+    'yall': "y'all",
+    "yall'll": "y'all'll",
+    "y'allll": "y'all'll",
+    "yall'd've": "y'all'd've",
+    "y'alld've": "y'all'd've",
+    "y'all'dve": "y'all'd've",
+    'youd': "you'd",
+    "youd've": "you'd've",
+    "you'dve": "you'd've",
+    'youll': "you'll",
+    'youre': "you're",
+    'youve': "you've",
+}
+
 
 def _process_digit_article(inText):
     outText = []
-    tempText = inText.lower().split()
-    articles = ['a', 'an', 'the']
-    manualMap = {
-        'none': '0',
-        'zero': '0',
-        'one': '1',
-        'two': '2',
-        'three': '3',
-        'four': '4',
-        'five': '5',
-        'six': '6',
-        'seven': '7',
-        'eight': '8',
-        'nine': '9',
-        'ten': '10',
-    }
-    contractions = {
-        'aint': "ain't",
-        'arent': "aren't",
-        'cant': "can't",
-        'couldve': "could've",
-        'couldnt': "couldn't",
-        "couldn'tve": "couldn't've",
-        "couldnt've": "couldn't've",
-        'didnt': "didn't",
-        'doesnt': "doesn't",
-        'dont': "don't",
-        'hadnt': "hadn't",
-        "hadnt've": "hadn't've",
-        "hadn'tve": "hadn't've",
-        'hasnt': "hasn't",
-        'havent': "haven't",
-        'hed': "he'd",
-        "hed've": "he'd've",
-        "he'dve": "he'd've",
-        'hes': "he's",
-        'howd': "how'd",
-        'howll': "how'll",
-        'hows': "how's",
-        "Id've": "I'd've",
-        "I'dve": "I'd've",
-        'Im': "I'm",
-        'Ive': "I've",
-        'isnt': "isn't",
-        'itd': "it'd",
-        "itd've": "it'd've",
-        "it'dve": "it'd've",
-        'itll': "it'll",
-        "let's": "let's",
-        'maam': "ma'am",
-        'mightnt': "mightn't",
-        "mightnt've": "mightn't've",
-        "mightn'tve": "mightn't've",
-        'mightve': "might've",
-        'mustnt': "mustn't",
-        'mustve': "must've",
-        'neednt': "needn't",
-        'notve': "not've",
-        'oclock': "o'clock",
-        'oughtnt': "oughtn't",
-        "ow's'at": "'ow's'at",
-        "'ows'at": "'ow's'at",
-        "'ow'sat": "'ow's'at",
-        'shant': "shan't",
-        "shed've": "she'd've",
-        "she'dve": "she'd've",
-        "she's": "she's",
-        'shouldve': "should've",
-        'shouldnt': "shouldn't",
-        "shouldnt've": "shouldn't've",
-        "shouldn'tve": "shouldn't've",
-        "somebody'd": 'somebodyd',
-        "somebodyd've": "somebody'd've",
-        "somebody'dve": "somebody'd've",
-        'somebodyll': "somebody'll",
-        'somebodys': "somebody's",
-        'someoned': "someone'd",
-        "someoned've": "someone'd've",
-        "someone'dve": "someone'd've",
-        'someonell': "someone'll",
-        'someones': "someone's",
-        'somethingd': "something'd",
-        "somethingd've": "something'd've",
-        "something'dve": "something'd've",
-        'somethingll': "something'll",
-        'thats': "that's",
-        'thered': "there'd",
-        "thered've": "there'd've",
-        "there'dve": "there'd've",
-        'therere': "there're",
-        'theres': "there's",
-        'theyd': "they'd",
-        "theyd've": "they'd've",
-        "they'dve": "they'd've",
-        'theyll': "they'll",
-        'theyre': "they're",
-        'theyve': "they've",
-        'twas': "'twas",
-        'wasnt': "wasn't",
-        "wed've": "we'd've",
-        "we'dve": "we'd've",
-        'weve': "we've",
-        'werent': "weren't",
-        'whatll': "what'll",
-        'whatre': "what're",
-        'whats': "what's",
-        'whatve': "what've",
-        'whens': "when's",
-        'whered': "where'd",
-        'wheres': "where's",
-        'whereve': "where've",
-        'whod': "who'd",
-        "whod've": "who'd've",
-        "who'dve": "who'd've",
-        'wholl': "who'll",
-        'whos': "who's",
-        'whove': "who've",
-        'whyll': "why'll",
-        'whyre': "why're",
-        'whys': "why's",
-        'wont': "won't",
-        'wouldve': "would've",
-        'wouldnt': "wouldn't",
-        "wouldnt've": "wouldn't've",
-        "wouldn'tve": "wouldn't've",
-        'yall': "y'all",
-        "yall'll": "y'all'll",
-        "y'allll": "y'all'll",
-        "yall'd've": "y'all'd've",
-        "y'alld've": "y'all'd've",
-        "y'all'dve": "y'all'd've",
-        'youd': "you'd",
-        "youd've": "you'd've",
-        "you'dve": "you'd've",
-        'youll': "you'll",
-        'youre': "you're",
-        'youve': "you've",
-    }
-    for word in tempText:
-        word = manualMap.setdefault(word, word)
-        if word not in articles:
-            outText.append(word)
-    for wordId, word in enumerate(outText):
-        if word in contractions:
-            outText[wordId] = contractions[word]
+    for word in inText.lower().split():
+        word = _MANUAL_MAP.get(word, word)
+        if word not in _ARTICLES:
+            outText.append(_CONTRACTIONS.get(word, word))
     outText = ' '.join(outText)
     return outText
 
@@ -211,7 +210,15 @@ def relaxed_correctness(target: str,
         return prediction.lower() == target.lower()
 
 
-def levenshtein_distance(s1, s2):
+def _levenshtein_python(s1, s2):
+    # The common prefix and suffix do not change the distance
+    start = 0
+    while start < min(len(s1), len(s2)) and s1[start] == s2[start]:
+        start += 1
+    end = 0
+    while end < min(len(s1), len(s2)) - start and s1[-1 - end] == s2[-1 - end]:
+        end += 1
+    s1, s2 = s1[start: len(s1) - end], s2[start: len(s2) - end]
     if len(s1) > len(s2):
         s1, s2 = s2, s1
 
@@ -227,15 +234,61 @@ def levenshtein_distance(s1, s2):
     return distances[-1]
 
 
+def _load_levenshtein_backends():
+    backends = {}
+    try:
+        from rapidfuzz.distance import Levenshtein as rf_levenshtein
+        backends['rapidfuzz'] = rf_levenshtein.distance
+    except ImportError:
+        pass
+    try:
+        import Levenshtein
+        backends['Levenshtein'] = Levenshtein.distance
+    except ImportError:
+        pass
+    backends['python'] = _levenshtein_python
+    return backends
+
+
+LEVENSHTEIN_BACKENDS = _load_levenshtein_backends()
+_LEVENSHTEIN = None
+
+
+def set_levenshtein_backend(name=None):
+    """Select the implementation of `levenshtein_distance`, one of `LEVENSHTEIN_BACKENDS`.
+
+    Defaults to the env variable `VLMEVAL_LEVENSHTEIN`, or the fastest backend installed:
+    rapidfuzz > python-Levenshtein > pure python.
+    """
+    global _LEVENSHTEIN
+    name = name or os.environ.get('VLMEVAL_LEVENSHTEIN', None) or list(LEVENSHTEIN_BACKENDS)[0]
+    assert name in LEVENSHTEIN_BACKENDS, f'Levenshtein backend {name} is not available: {list(LEVENSHTEIN_BACKENDS)}'
+    _LEVENSHTEIN = LEVENSHTEIN_BACKENDS[name]
+
+
+set_levenshtein_backend()
+
+
+def levenshtein_distance(s1, s2):
+    return _LEVENSHTEIN(s1, s2)
+
+
+@functools.lru_cache(maxsize=2 ** 16)
+def _anls_normalize(text):
+    return ' '.join(text.strip().lower().split())
+
+
 def anls_compute(groundtruth, prediction):
-    gt_answer = ' '.join(groundtruth.strip().lower().split())
-    det_answer = ' '.join(prediction.strip().lower().split())
+    gt_answer = _anls_normalize(groundtruth)
+    det_answer = _anls_normalize(prediction)
     dist = levenshtein_distance(gt_answer, det_answer)
     length = max(len(groundtruth.upper()), len(prediction.upper()))
     values = 0.0 if length == 0 else float(dist) / float(length)
     return values
 
 
+# The ground truth answers are normalized again for each evaluated model / judge run, hence the memoization
+@functools.lru_cache(maxsize=2 ** 16)
 def process_answer(answer):
     answer = answer.replace('\n', ' ')
     answer = answer.replace('\t', ' ')
@@ -245,6 +298,10 @@ def process_answer(answer):
     return answer
 
 
+_KMMVISMATH_UNITS = re.compile(r'(원|개|마리|통|묶음|송이|접시|조각|ml|분|L|시간|%|시|,|장)')
+_PERCENT = re.compile(r'(%)')
+
+
 def process_line(line, method='vqa_score'):
     ret = {}
     if istype(line['answer'], list):
@@ -278,20 +335,20 @@ def process_line(line, method='vqa_score'):
         ret['pred'] = line['prediction'].strip()
         ret['match'] = [(1.0 if (x.strip().lower() == ret['pred'].strip().lower()) else 0.0) for x in ret['gt']]
     elif method == 'accuracy_for_kmmvismath':
-        ret['gt'] = [re.sub(r'(원|개|마리|통|묶음|송이|접시|조각|ml|분|L|시간|%|시|,|장)', '', x.strip()).strip() for x in answers]
+        ret['gt'] = [_KMMVISMATH_UNITS.sub('', x.strip()).strip() for x in answers]
         ret['pred'] = line['prediction'].strip()
         if '<think>' in ret['pred'] and '</think>' in ret['pred']:
             end_idx = ret['pred'].rfind('</think') + len('</think>')
             ret['pred'] = ret['pred'][end_idx:].strip()
-        ret['pred'] = re.sub(r'(원|개|마리|통|묶음|송이|접시|조각|ml|분|L|시간|%|시|,|장)', '', ret['pred'].strip()).strip()
+        ret['pred'] = _KMMVISMATH_UNITS.sub('', ret['pred'].strip()).strip()
         ret['match'] = [(1.0 if (x.strip().lower() == ret['pred'].strip().lower()) else 0.0) for x in ret['gt']]
     elif method == 'relaxed_accuracy_for_chartqa_kor':
-        ret['gt'] = [re.sub(r'(%)', '', str(x).strip()).strip() for x in answers]
+        ret['gt'] = [_PERCENT.sub('', str(x).strip()).strip() for x in answers]
         ret['pred'] = str(line['prediction']).strip()
         if '<think>' in ret['pred'] and '</think>' in ret['pred']:
             end_idx = ret['pred'].rfind('</think') + len('</think>')
             ret['pred'] = ret['pred'][end_idx:].strip()
-        ret['pred'] = re.sub(r'(%)', '', ret['pred'].strip()).strip()
+        ret['pred'] = _PERCENT.sub('', ret['pred'].strip()).strip()
         ret['match'] = [relaxed_correctness(x, ret['pred']) for x in ret['gt']]
     elif method == 'relaxed_accuracy_for_elementary_math_kor':
         ret['gt'] = [str(x).strip() for x in answers]
@@ -44,6 +44,7 @@ Please analyze these images and provide the answer to the question about the vid
         return ['VCR-Bench']
 
     def prepare_dataset(self, dataset_name='VCR-Bench', repo_id='VLM-Reasoning/VCR-Bench'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
             data = load(data_file)
@@ -142,7 +143,7 @@ Please analyze these images and provide the answer to the question about the vid
         from .utils.vcrbench.eval import precision, recall
         from .utils.vcrbench.cau_total import calu_pre_recall
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
         judge = judge_kwargs.pop('model','gpt-4o-0806')
         nproc = judge_kwargs.pop('nproc', 4)
 
@@ -153,9 +153,10 @@ class VDC(VideoBaseDataset):
         return ['VDC']
 
     def prepare_dataset(self, dataset_name='VDC', repo_id='Enxin/VLMEval-VDC'):
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data['video']:
@@ -347,7 +348,7 @@ class VDC(VideoBaseDataset):
     def evaluate(self, eval_file, **judge_kwargs):
         from .utils.vdc import get_dimension_rating, prepare_response_prompt, prepare_score_prompt, SYSTEM_CAL_SCORE_PROMPT, SYSTEM_GENER_PRED_PROMPT
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'
         judge = judge_kwargs['model']
         nproc = judge_kwargs.pop('nproc', 4)
         _ = judge_kwargs.pop('verbose', None)
@@ -1,4 +1,9 @@
-from vlmeval.dataset import *
+from vlmeval.dataset import (
+    MMBenchVideo, MVBench, MVBench_MP4, MVTamperBench, VideoMME, LongVideoBench, MLVU, TempCompass,
+    CGBench_MCQ_Grounding_Mini, CGBench_OpenEnded_Mini, CGBench_MCQ_Grounding, CGBench_OpenEnded, WorldSense,
+    MEGABench, QBench_Video, MovieChat1k, VDC, Video_Holmes, VCRBench, CGAVCounting, Video_MMLU_CAP, Video_MMLU_QA,
+    EgoExoBench_MCQ
+)
 from functools import partial
 
 vcrbench_dataset = {
@@ -51,12 +51,13 @@ class Video_Holmes(VideoBaseDataset):
 
     def prepare_dataset(self, dataset_name='Video_Holmes', repo_id='TencentARC/Video-Holmes'):
 
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data['video_path']:
@@ -97,7 +98,7 @@ class Video_Holmes(VideoBaseDataset):
             def generate_tsv(pth):
 
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                if os.path.exists(data_file) and md5(data_file) == self.MD5:
+                if os.path.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
 
                 with open(os.path.join(pth, 'test_Video-Holmes.json'), 'r', encoding='utf-8') as f:
@@ -205,7 +206,7 @@ class Video_Holmes(VideoBaseDataset):
 
         from .utils.videoholmes import get_dimension_rating, extract_option
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
@@ -32,6 +32,7 @@ class VLM2Bench(ImageBaseDataset):
         """
         if isinstance(line, int):
             line = self.data.iloc[line]
+        line = self.fetch_image(line)
 
         # If there is no image_path, generate the image_path list based on the image field
         if "image_path" not in line:
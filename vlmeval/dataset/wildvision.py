@@ -149,8 +149,9 @@ class WildVision(ImageBaseDataset):
         nproc = judge_kwargs.pop('nproc', 4)
 
         if not osp.exists(storage):
-            raw_data = WildVision('WildVision').data
-            b64_map = {x: y for x, y in zip(raw_data['index'], raw_data['image'])}
+            raw_dataset = WildVision('WildVision')
+            raw_data = raw_dataset.data
+            b64_map = {x: raw_dataset.fetch_image(raw_data.iloc[i])['image'] for i, x in enumerate(raw_data['index'])}
             data = self.gen_eval_base(eval_file, b64_map)
 
             judge_kwargs['system_prompt'] = SYSTEM_PROMPT
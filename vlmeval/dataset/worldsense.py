@@ -51,13 +51,14 @@ Respond with only the letter (A, B, C, or D) of the correct option.
 
     def prepare_dataset(self, dataset_name='WorldSense', repo_id='honglyhly/WorldSense'):
 
+        @integrity_cache
         def check_integrity(pth):
             data_file = osp.join(pth, f'{dataset_name}.tsv')
 
             if not os.path.exists(data_file):
                 return False
 
-            if md5(data_file) != self.MD5:
+            if cached_md5(data_file) != self.MD5:
                 return False
             data = load(data_file)
             for video_pth in data['video_path']:
@@ -134,8 +135,7 @@ Respond with only the letter (A, B, C, or D) of the correct option.
             def generate_tsv(pth):
 
                 data_file = osp.join(pth, f'{dataset_name}.tsv')
-                print(data_file, md5(data_file))
-                if os.path.exists(data_file) and md5(data_file) == self.MD5:
+                if os.path.exists(data_file) and cached_md5(data_file) == self.MD5:
                     return
 
                 with open(osp.join(pth, 'worldsense_qa.json'), 'rb') as file:
@@ -283,7 +283,7 @@ Respond with only the letter (A, B, C, or D) of the correct option.
     def evaluate(self, eval_file, **judge_kwargs):
         from .utils.worldsense import get_dimension_rating, extract_characters_regex, extract_option
 
-        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv'], 'data file should be an supported format (xlsx/json/tsv) file'  # noqa: E501
+        assert get_file_extension(eval_file) in ['xlsx', 'json', 'tsv', 'parquet', 'feather'], 'data file should be an supported format (xlsx/json/tsv/parquet/feather) file'  # noqa: E501
 
         tmp_file = get_intermediate_file_path(eval_file, '_tmp', 'pkl')
         tgt_file = get_intermediate_file_path(eval_file, '_rating', 'json')
@@ -1,7 +1,9 @@
+import itertools
 import torch
 import torch.distributed as dist
 from vlmeval.config import supported_VLM
-from vlmeval.utils import track_progress_rich
+from vlmeval.utils import track_progress_rich, prefetch, WorkQueue
+from vlmeval.utils.batch_util import make_batches, generate_batch_with_fallback
 from vlmeval.smp import *
 
 FAIL_MSG = 'Failed to obtain answer via API.'
@@ -17,6 +19,14 @@ def parse_args():
     return args
 
 
+def is_api_model(model):
+    """Whether `model` (a built model, or its name in `supported_VLM`) is an API model, without building it."""
+    if isinstance(model, str):
+        model = supported_VLM[model]
+        model = getattr(model, 'func', model)
+    return getattr(model, 'is_api', False)
+
+
 # Only API model is accepted
 def infer_data_api(model, work_dir, model_name, dataset, index_set=None, api_nproc=4, ignore_failed=False):
     rank, world_size = get_rank_and_world_size()
@@ -38,7 +48,7 @@ def infer_data_api(model, work_dir, model_name, dataset, index_set=None, api_npr
         item = data.iloc[i]
         if hasattr(model, 'use_custom_prompt') and model.use_custom_prompt(dataset_name):
             assert hasattr(model, 'build_prompt')
-            struct = model.build_prompt(item, dataset=dataset_name)
+            struct = model.build_prompt(dataset.fetch_image(item), dataset=dataset_name)
         else:
             struct = dataset.build_prompt(item)
         structs.append(struct)
@@ -52,7 +62,7 @@ def infer_data_api(model, work_dir, model_name, dataset, index_set=None, api_npr
         if osp.exists(v11_pred):
             try:
                 reuse_inds = load('http://opencompass.openxlab.space/utils/mmb_reuse.pkl')
-                data = load(v11_pred)
+                data = load(v11_pred, columns=['index', 'prediction'])
                 ans_map = {x: y for x, y in zip(data['index'], data['prediction']) if x in reuse_inds}
                 dump(ans_map, out_file)
             except Exception as err:
@@ -68,6 +78,9 @@ def infer_data_api(model, work_dir, model_name, dataset, index_set=None, api_npr
     indices = [i for i in indices if i not in res]
 
     gen_func = model.generate
+    # Wrappers with a native async engine are driven from one event loop, `api_nproc` bounds in-flight requests
+    if getattr(model, 'ASYNC', False) and os.environ.get('VLMEVAL_API_ASYNC', '1') == '1':
+        gen_func = model.agenerate
     structs = [dict(message=struct, dataset=dataset_name) for struct in structs]
 
     if len(structs):
@@ -80,33 +93,43 @@ def infer_data_api(model, work_dir, model_name, dataset, index_set=None, api_npr
     return res
 
 
-def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, api_nproc=4, use_vllm=False):
+def infer_data(
+    model, model_name, work_dir, dataset, out_file, verbose=False, api_nproc=4, use_vllm=False, batch_size=1,
+    queue=None
+):
     dataset_name = dataset.dataset_name
-    prev_file = f'{work_dir}/{model_name}_{dataset_name}_PREV.pkl'
-    res = load(prev_file) if osp.exists(prev_file) else {}
-    if osp.exists(out_file):
-        res.update(load(out_file))
-
     rank, world_size = get_rank_and_world_size()
-    sheet_indices = list(range(rank, len(dataset), world_size))
-    lt = len(sheet_indices)
-    data = dataset.data.iloc[sheet_indices]
-    data_indices = [i for i in data['index']]
 
-    # If finished, will exit without building the model
-    all_finished = True
-    for i in range(lt):
-        idx = data.iloc[i]['index']
-        if idx not in res:
-            all_finished = False
-    if all_finished:
-        res = {k: res[k] for k in data_indices}
-        dump(res, out_file)
-        return model
-
-    # Data need to be inferred
-    data = data[~data['index'].isin(res)]
-    lt = len(data)
+    if queue is None:
+        prev_file = f'{work_dir}/{model_name}_{dataset_name}_PREV.pkl'
+        res = load(prev_file) if osp.exists(prev_file) else {}
+        res.update(load_records(out_file, repair=True))
+
+        sheet_indices = list(range(rank, len(dataset), world_size))
+        data = dataset.data.iloc[sheet_indices]
+        data_indices = [i for i in data['index']]
+
+        # If finished, will exit without building the model
+        if all(idx in res for idx in data_indices):
+            res = {k: res[k] for k in data_indices}
+            dump_records(res, out_file)
+            return model
+
+        # Data need to be inferred
+        positions = [pos for pos, idx in zip(sheet_indices, data_indices) if idx not in res]
+        data = dataset.data.iloc[positions]
+        lt = len(data)
+    else:
+        # Chunks of positions are pulled from the queue shared by all ranks, until it is drained.
+        # The previous records are merged by rank 0, this rank only keeps the records it produces
+        res = load_records(out_file, repair=True)
+        chunk = queue.pop()
+        # If the queue is drained, will exit without building the model
+        if chunk is None:
+            dump_records(res, out_file)
+            return model
+        positions = itertools.chain(chunk, itertools.chain.from_iterable(iter(queue.pop, None)))
+        lt = None
 
     kwargs = {}
     if model_name is not None and (
@@ -127,6 +150,9 @@ def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, ap
 
     is_api = getattr(model, 'is_api', False)
     if is_api:
+        if queue is not None:
+            # API models are not sharded dynamically (see `infer_data_job`), still serve the positions pulled
+            data = dataset.data.iloc[list(positions)]
         lt, indices = len(data), list(data['index'])
         supp = infer_data_api(
             model=model,
@@ -138,50 +164,99 @@ def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, ap
         for idx in indices:
             assert idx in supp
         res.update(supp)
-        res = {k: res[k] for k in data_indices}
-        dump(res, out_file)
+        if queue is None:
+            res = {k: res[k] for k in data_indices}
+        dump_records(res, out_file)
         return model
     else:
         model.set_dump_image(dataset.dump_image)
 
-    for i in tqdm(range(lt), desc=f'Infer {model_name}/{dataset_name}, Rank {rank}/{world_size}'):
-        idx = data.iloc[i]['index']
-        if idx in res:
-            continue
-
-        if hasattr(model, 'use_custom_prompt') and model.use_custom_prompt(dataset_name):
-            struct = model.build_prompt(data.iloc[i], dataset=dataset_name)
-        else:
-            struct = dataset.build_prompt(data.iloc[i])
-
+    custom_prompt = hasattr(model, 'use_custom_prompt') and model.use_custom_prompt(dataset_name)
+
+    # Run in the background threads: only the dataset side (decoding / dumping the images, building the prompt)
+    def prepare_struct(pos):
+        line = dataset.data.iloc[pos]
+        if custom_prompt:
+            # Models may read the image field of the record, fetch it if the images are kept out of `dataset.data`
+            line = dataset.fetch_image(line)
+            dataset.dump_image(line)
+            return line, None
+        return line, dataset.build_prompt(line)
+
+    # Run in the main thread: `model.build_prompt` may change the generation settings of the model (e.g. `self.kwargs`)
+    def build_struct(prepared):
+        line, struct = prepared
+        if struct is None:
+            struct = model.build_prompt(line, dataset=dataset_name)
+        return line['index'], struct
+
+    def generate_one(struct):
         # If `SKIP_ERR` flag is set, the model will skip the generation if error is encountered
         if os.environ.get('SKIP_ERR', False) == '1':
             FAIL_MSG = 'Failed to obtain answer'
             try:
-                response = model.generate(message=struct, dataset=dataset_name)
+                return model.generate(message=struct, dataset=dataset_name)
             except RuntimeError as err:
                 torch.cuda.synchronize()
                 warnings.warn(f'{type(err)} {str(err)}')
-                response = f'{FAIL_MSG}: {type(err)} {str(err)}'
-        else:
-            response = model.generate(message=struct, dataset=dataset_name)
-        torch.cuda.empty_cache()
+                return f'{FAIL_MSG}: {type(err)} {str(err)}'
+        return model.generate(message=struct, dataset=dataset_name)
+
+    # Images and prompts of the upcoming samples are prepared in background threads while the model is generating,
+    # set `VLMEVAL_PREFETCH=0` to prepare them serially. Custom prompts of the model are built in the main thread
+    nproc = int(os.environ.get('VLMEVAL_PREFETCH', 4))
+    batched = batch_size > 1 and hasattr(model, 'generate_batch_inner')
+    # Samples are bucketed within windows in batched mode, so that results are dumped regularly
+    window = batch_size * 8
+    items = map(build_struct, prefetch(
+        prepare_struct, positions, depth=window if batched and nproc > 0 else nproc, nproc=nproc))
+
+    # Each response is appended to the journal `{out_file}.journal` (synced every 10 samples / each window), rather
+    # than re-dumping all records. The journal is folded into `out_file` when the rank finishes, or when resuming
+    journal = out_file + '.journal'
+    # Models implementing `generate_batch_inner` are fed with length-bucketed batches
+    if batched:
+        pbar = tqdm(total=lt, desc=f'Infer {model_name}/{dataset_name}, Rank {rank}/{world_size}, BS {batch_size}')
+        while True:
+            window_items = list(itertools.islice(items, window))
+            if not len(window_items):
+                break
+            window_structs = [struct for _, struct in window_items]
+            window_res = {}
+            for batch in make_batches(window_structs, batch_size):
+                responses = generate_batch_with_fallback(
+                    model, [window_structs[j] for j in batch], dataset=dataset_name, generate_one=generate_one)
+                torch.cuda.empty_cache()
+                for j, response in zip(batch, responses):
+                    if verbose:
+                        print(response, flush=True)
+                    window_res[window_items[j][0]] = response
+                pbar.update(len(batch))
+            res.update(window_res)
+            append_journal(window_res, journal, sync=True)
+        pbar.close()
+    else:
+        desc = f'Infer {model_name}/{dataset_name}, Rank {rank}/{world_size}'
+        for i, (idx, struct) in tqdm(enumerate(items), total=lt, desc=desc):
+            response = generate_one(struct)
+            torch.cuda.empty_cache()
 
-        if verbose:
-            print(response, flush=True)
+            if verbose:
+                print(response, flush=True)
 
-        res[idx] = response
-        if (i + 1) % 10 == 0:
-            dump(res, out_file)
+            res[idx] = response
+            append_journal({idx: response}, journal, sync=(i + 1) % 10 == 0)
 
-    res = {k: res[k] for k in data_indices}
-    dump(res, out_file)
+    if queue is None:
+        res = {k: res[k] for k in data_indices}
+    dump_records(res, out_file)
     return model
 
 
 # A wrapper for infer_data, do the pre & post processing
 def infer_data_job(
-    model, work_dir, model_name, dataset, verbose=False, api_nproc=4, ignore_failed=False, use_vllm=False
+    model, work_dir, model_name, dataset, verbose=False, api_nproc=4, ignore_failed=False, use_vllm=False,
+    batch_size=1
 ):
     rank, world_size = get_rank_and_world_size()
     dataset_name = dataset.dataset_name
@@ -191,7 +266,7 @@ def infer_data_job(
     prev_file = f'{work_dir}/{model_name}_{dataset_name}_PREV.pkl'
     if osp.exists(result_file):
         if rank == 0:
-            data = load(result_file)
+            data = load(result_file, columns=['index', 'prediction'])
             # breakpoint()
             results = {k: v for k, v in zip(data['index'], data['prediction'])}
             if not ignore_failed:
@@ -203,23 +278,39 @@ def infer_data_job(
     tmpl = osp.join(work_dir, '{}' + f'{world_size}_{dataset_name}.pkl')
     out_file = tmpl.format(rank)
 
+    # With multiple ranks, samples are pulled dynamically from a shared work queue, so that a rank drawing
+    # expensive samples does not keep all others waiting. Set `VLMEVAL_DYNAMIC_SHARD=0` to shard statically.
+    # API models keep the static sharding, their requests are already issued concurrently
+    queue = None
+    if world_size > 1 and not is_api_model(model) and os.environ.get('VLMEVAL_DYNAMIC_SHARD', '1') == '1':
+        queue_file = osp.join(work_dir, f'{world_size}_{dataset_name}_queue.pkl')
+        if rank == 0:
+            finished = set(load(prev_file)) if osp.exists(prev_file) else set()
+            for i in range(world_size):
+                finished.update(load_records(tmpl.format(i)))
+            todo = [pos for pos, idx in enumerate(dataset.data['index']) if idx not in finished]
+            WorkQueue.create(queue_file, todo, world_size, min_chunk=batch_size)
+        dist.barrier()
+        queue = WorkQueue(queue_file)
+
     model = infer_data(
         model=model, work_dir=work_dir, model_name=model_name, dataset=dataset,
-        out_file=out_file, verbose=verbose, api_nproc=api_nproc, use_vllm=use_vllm)
+        out_file=out_file, verbose=verbose, api_nproc=api_nproc, use_vllm=use_vllm, batch_size=batch_size,
+        queue=queue)
     if world_size > 1:
         dist.barrier()
 
     if rank == 0:
-        data_all = {}
+        # Records are merged by key, regardless of which rank produced them
+        data_all = load(prev_file) if queue is not None and osp.exists(prev_file) else {}
         for i in range(world_size):
-            data_all.update(load(tmpl.format(i)))
+            data_all.update(load_records(tmpl.format(i)))
 
         data = dataset.data
         for x in data['index']:
             assert x in data_all
+        split_func = None
         if os.getenv('SPLIT_THINK', False):
-            prediction = [str(data_all[x]) for x in data['index']]
-
             def split_thinking(s):
                 if '</think>' in s:
                     splits = s.split('</think>')
@@ -236,17 +327,26 @@ def infer_data_job(
                 return (prediction, thinking)
             split_func = model.split_thinking if hasattr(model, 'split_thinking') else split_thinking
             print(f'Prediction format: {os.getenv("SPLIT_THINK")},splitting func: {split_func}')
-            tups = [split_func(x) for x in prediction]
-            data['prediction'] = [x[0] for x in tups]
-            data['thinking'] = [x[1] for x in tups]
-        else:
-            data['prediction'] = [str(data_all[x]) for x in data['index']]
-        if 'image' in data:
-            data.pop('image')
 
-        dump(data, result_file)
+        # The result file is written chunk by chunk, without the image column and without copying `dataset.data`
+        def result_chunks(chunk_size=4096):
+            columns = [c for c in data.columns if c != 'image']
+            for start in range(0, len(data), chunk_size):
+                chunk = data.iloc[start: start + chunk_size][columns]
+                prediction = [str(data_all[x]) for x in chunk['index']]
+                if split_func is not None:
+                    tups = [split_func(x) for x in prediction]
+                    chunk['prediction'] = [x[0] for x in tups]
+                    chunk['thinking'] = [x[1] for x in tups]
+                else:
+                    chunk['prediction'] = prediction
+                yield chunk
+
+        dump_stream(result_chunks(), result_file)
         for i in range(world_size):
             os.remove(tmpl.format(i))
+        if queue is not None:
+            queue.remove()
     if world_size > 1:
         dist.barrier()
     return model
@@ -1,7 +1,7 @@
 import torch
 import torch.distributed as dist
 from vlmeval.config import supported_VLM
-from vlmeval.utils import track_progress_rich
+from vlmeval.utils import track_progress_rich, prefetch
 from vlmeval.smp import *
 
 FAIL_MSG = 'Failed to obtain answer via API.'
@@ -138,16 +138,26 @@ def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, ap
     else:
         model.set_dump_image(dataset.dump_image)
 
-    for i in tqdm(range(lt)):
-        idx = data.iloc[i]['index']
-        if idx in res:
-            continue
-
-        if hasattr(model, 'use_custom_prompt') and model.use_custom_prompt(dataset_name):
-            struct = model.build_prompt(data.iloc[i], dataset=dataset_name)
-        else:
-            struct = dataset.build_prompt(data.iloc[i])
-
+    custom_prompt = hasattr(model, 'use_custom_prompt') and model.use_custom_prompt(dataset_name)
+
+    # Run in the background threads: only the dataset side (decoding / dumping the images, building the prompt)
+    def prepare_struct(i):
+        if custom_prompt:
+            # Models may read the image field of the record, fetch it if the images are kept out of `dataset.data`
+            line = dataset.fetch_image(data.iloc[i])
+            dataset.dump_image(line)
+            return line
+        return dataset.build_prompt(data.iloc[i])
+
+    # Run in the main thread: `model.build_prompt` may change the generation settings of the model
+    def build_struct(i, prepared):
+        return model.build_prompt(prepared, dataset=dataset_name) if custom_prompt else prepared
+
+    # Images and prompts of the upcoming samples are prepared in background threads while the model is generating,
+    # set `VLMEVAL_PREFETCH=0` to prepare them serially. Custom prompts of the model are built in the main thread
+    structs = map(build_struct, range(lt), prefetch(
+        prepare_struct, range(lt), depth=int(os.environ.get('VLMEVAL_PREFETCH', 4))))
+    for i, (idx, struct) in tqdm(enumerate(zip(data['index'], structs)), total=lt):
         response = chat_mt(model, struct, dataset_name)
         torch.cuda.empty_cache()
 
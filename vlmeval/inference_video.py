@@ -1,7 +1,8 @@
+import itertools
 import torch
 import torch.distributed as dist
 from vlmeval.config import supported_VLM
-from vlmeval.utils import track_progress_rich
+from vlmeval.utils import track_progress_rich, prefetch, WorkQueue
 from vlmeval.smp import *
 
 FAIL_MSG = 'Failed to obtain answer via API.'
@@ -77,8 +78,9 @@ def infer_data_api(model, work_dir, model_name, dataset, samples_dict={}, api_np
     return res
 
 
-def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, api_nproc=4, use_vllm=False):
-    res = load(out_file) if osp.exists(out_file) else {}
+def infer_data(
+        model, model_name, work_dir, dataset, out_file, verbose=False, api_nproc=4, use_vllm=False, queue=None):
+    res = load_records(out_file, repair=True)
     rank, world_size = get_rank_and_world_size()
     dataset_name = dataset.dataset_name
 
@@ -86,10 +88,19 @@ def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, ap
     samples = list(dataset.videos) if getattr(dataset, 'pack', False) else list(range(len(dataset.data)))
     sample_map = {i: s for i, s in zip(sample_indices, samples)}
 
-    sample_indices_sub = sample_indices[rank::world_size]
-    if np.all([idx in res for idx in sample_indices_sub]):
-        return model
-    sample_indices_subrem = [x for x in sample_indices_sub if x not in res]
+    if queue is None:
+        sample_indices_sub = sample_indices[rank::world_size]
+        if np.all([idx in res for idx in sample_indices_sub]):
+            dump_records(res, out_file)
+            return model
+        sample_indices_subrem = [x for x in sample_indices_sub if x not in res]
+    else:
+        # Chunks of sample indices are pulled from the queue shared by all ranks, until it is drained
+        chunk = queue.pop()
+        if chunk is None:
+            dump_records(res, out_file)
+            return model
+        sample_indices_subrem = itertools.chain(chunk, itertools.chain.from_iterable(iter(queue.pop, None)))
 
     kwargs = {}
     if model_name is not None and (
@@ -111,7 +122,7 @@ def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, ap
 
     is_api = getattr(model, 'is_api', False)
     if is_api:
-        assert world_size == 1
+        assert world_size == 1 and queue is None
         supp = infer_data_api(
             model=model,
             work_dir=work_dir,
@@ -122,7 +133,7 @@ def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, ap
         for k in sample_indices_subrem:
             assert k in supp
         res.update(supp)
-        dump(res, out_file)
+        dump_records(res, out_file)
         return model
 
     assert not getattr(dataset, 'pack', False), 'Current model not supported pack mode!'
@@ -133,48 +144,62 @@ def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, ap
         )
         setattr(model, 'VIDEO_LLM', False)
 
-    for i, idx in tqdm(enumerate(sample_indices_subrem)):
-        if idx in res:
-            continue
-        if getattr(model, 'nframe', None) is not None and getattr(model, 'nframe', 0) > 0:
-            if dataset.nframe > 0:
-                if getattr(model, 'nframe', 0) != dataset.nframe:
-                    print(f'{model_name} is a video-llm model, nframe is set to {dataset.nframe}, not using default')
-                    setattr(model, 'nframe', dataset.nframe)
-            elif getattr(model, 'fps', 0) == 0:
-                raise ValueError(f'fps is not suitable for {model_name}')
-            else:
-                setattr(model, 'nframe', None)
-        if getattr(model, 'fps', None) is not None and getattr(model, 'fps', 0) > 0:
-            if dataset.fps > 0:
-                if getattr(model, 'fps', 0) != dataset.fps:
-                    print(f'{model_name} is a video-llm model, fps is set to {dataset.fps}, not using default')
-                    setattr(model, 'fps', dataset.fps)
-            elif getattr(model, 'nframe', 0) == 0:
-                raise ValueError(f'nframe is not suitable for {model_name}')
-            else:
-                setattr(model, 'fps', None)
-        if (
-            'Qwen2-VL' in model_name
-            or 'Qwen2.5-VL' in model_name
-            or 'Qwen2.5-Omni' in model_name
-        ):
-            if getattr(model, 'nframe', None) is None and dataset.nframe > 0:
-                print(f'using {model_name} default setting for video, dataset.nframe is ommitted')
-            if getattr(model, 'fps', None) is None and dataset.fps > 0:
-                print(f'using {model_name} default setting for video, dataset.fps is ommitted')
-        if 'SUB_DATASET' in dataset.data.iloc[sample_map[idx]]:
-            dataset_name = dataset.data.iloc[sample_map[idx]]['SUB_DATASET']
-        if hasattr(model, 'use_custom_prompt') and model.use_custom_prompt(dataset_name):
+    if getattr(model, 'nframe', None) is not None and getattr(model, 'nframe', 0) > 0:
+        if dataset.nframe > 0:
+            if getattr(model, 'nframe', 0) != dataset.nframe:
+                print(f'{model_name} is a video-llm model, nframe is set to {dataset.nframe}, not using default')
+                setattr(model, 'nframe', dataset.nframe)
+        elif getattr(model, 'fps', 0) == 0:
+            raise ValueError(f'fps is not suitable for {model_name}')
+        else:
+            setattr(model, 'nframe', None)
+    if getattr(model, 'fps', None) is not None and getattr(model, 'fps', 0) > 0:
+        if dataset.fps > 0:
+            if getattr(model, 'fps', 0) != dataset.fps:
+                print(f'{model_name} is a video-llm model, fps is set to {dataset.fps}, not using default')
+                setattr(model, 'fps', dataset.fps)
+        elif getattr(model, 'nframe', 0) == 0:
+            raise ValueError(f'nframe is not suitable for {model_name}')
+        else:
+            setattr(model, 'fps', None)
+    if (
+        'Qwen2-VL' in model_name
+        or 'Qwen2.5-VL' in model_name
+        or 'Qwen2.5-Omni' in model_name
+    ):
+        if getattr(model, 'nframe', None) is None and dataset.nframe > 0:
+            print(f'using {model_name} default setting for video, dataset.nframe is ommitted')
+        if getattr(model, 'fps', None) is None and dataset.fps > 0:
+            print(f'using {model_name} default setting for video, dataset.fps is ommitted')
+
+    def custom_prompt(line):
+        sub_dataset_name = line['SUB_DATASET'] if 'SUB_DATASET' in line else dataset_name
+        return hasattr(model, 'use_custom_prompt') and model.use_custom_prompt(sub_dataset_name)
+
+    # Run in the background threads: only the dataset side (extracting the frames, building the prompt)
+    def prepare_item(idx):
+        line = dataset.data.iloc[sample_map[idx]]
+        sub_dataset_name = line['SUB_DATASET'] if 'SUB_DATASET' in line else dataset_name
+        if custom_prompt(line):
+            return idx, sub_dataset_name, None
+        struct = dataset.build_prompt(sample_map[idx], video_llm=getattr(model, 'VIDEO_LLM', False))
+        return idx, sub_dataset_name, struct
+
+    # Run in the main thread: `model.build_prompt` may change the generation settings of the model
+    def build_item(prepared):
+        idx, sub_dataset_name, struct = prepared
+        line = dataset.data.iloc[sample_map[idx]]
+        if custom_prompt(line):
             if dataset.nframe == 0:
                 raise ValueError(f'nframe must be set for custom prompt, fps is not suitable for {model_name}')
-            struct = model.build_prompt(
-                dataset.data.iloc[sample_map[idx]], dataset=dataset, video_llm=getattr(model, 'VIDEO_LLM', False)
-            )
-        else:
-            struct = dataset.build_prompt(
-                sample_map[idx], video_llm=getattr(model, 'VIDEO_LLM', False)
-            )
+            struct = model.build_prompt(line, dataset=dataset, video_llm=getattr(model, 'VIDEO_LLM', False))
+        return idx, sub_dataset_name, struct
+
+    # Frames of the upcoming samples are extracted in background threads while the model is generating,
+    # set `VLMEVAL_PREFETCH=0` to extract them serially. Custom prompts of the model are built in the main thread
+    items = map(build_item, prefetch(
+        prepare_item, sample_indices_subrem, depth=int(os.environ.get('VLMEVAL_PREFETCH', 4))))
+    for i, (idx, sub_dataset_name, struct) in tqdm(enumerate(items)):
         if struct is None:
             continue
 
@@ -182,24 +207,25 @@ def infer_data(model, model_name, work_dir, dataset, out_file, verbose=False, ap
         if os.environ.get('SKIP_ERR', False) == '1':
             FAIL_MSG = 'Failed to obtain answer'
             try:
-                response = model.generate(message=struct, dataset=dataset_name)
+                response = model.generate(message=struct, dataset=sub_dataset_name)
             except RuntimeError as err:
                 torch.cuda.synchronize()
                 warnings.error(f'{type(err)} {str(err)}')
                 response = f'{FAIL_MSG}: {type(err)} {str(err)}'
         else:
-            response = model.generate(message=struct, dataset=dataset_name)
+            response = model.generate(message=struct, dataset=sub_dataset_name)
         torch.cuda.empty_cache()
 
         if verbose:
             print(response, flush=True)
 
         res[idx] = response
-        if (i + 1) % 20 == 0:
-            dump(res, out_file)
+        # Appended to the journal `{out_file}.journal`, which is folded into `out_file` when the rank finishes
+        append_journal({idx: response}, out_file + '.journal', sync=(i + 1) % 20 == 0)
 
-    res = {k: res[k] for k in sample_indices_sub}
-    dump(res, out_file)
+    if queue is None:
+        res = {k: res[k] for k in sample_indices_sub}
+    dump_records(res, out_file)
     return model
 
 
@@ -224,6 +250,20 @@ def infer_data_job_video(
     tmpl = osp.join(work_dir, '{}' + f'{world_size}_{osp.splitext(result_file_name)[0]}.pkl')
     out_file = tmpl.format(rank)
 
+    # With multiple ranks, videos are pulled dynamically from a shared work queue (see `infer_data_job`),
+    # set `VLMEVAL_DYNAMIC_SHARD=0` to shard statically
+    queue = None
+    if world_size > 1 and os.environ.get('VLMEVAL_DYNAMIC_SHARD', '1') == '1':
+        queue_file = osp.join(work_dir, f'{world_size}_{osp.splitext(result_file_name)[0]}_queue.pkl')
+        if rank == 0:
+            finished = set()
+            for i in range(world_size):
+                finished.update(load_records(tmpl.format(i)))
+            sample_indices = list(dataset.videos) if getattr(dataset, 'pack', False) else list(dataset.data['index'])
+            WorkQueue.create(queue_file, [x for x in sample_indices if x not in finished], world_size)
+        dist.barrier()
+        queue = WorkQueue(queue_file)
+
     model = infer_data(
         model=model,
         model_name=model_name,
@@ -232,7 +272,8 @@ def infer_data_job_video(
         out_file=out_file,
         verbose=verbose,
         api_nproc=api_nproc,
-        use_vllm=use_vllm)
+        use_vllm=use_vllm,
+        queue=queue)
 
     if world_size > 1:
         dist.barrier()
@@ -240,7 +281,7 @@ def infer_data_job_video(
     if rank == 0:
         data_all = {}
         for i in range(world_size):
-            data_all.update(load(tmpl.format(i)))
+            data_all.update(load_records(tmpl.format(i)))
 
         meta = dataset.data
         if dataset_name == 'MMBench-Video' and getattr(dataset, 'pack', False):
@@ -256,4 +297,6 @@ def infer_data_job_video(
         dump(meta, result_file)
         for i in range(world_size):
             os.remove(tmpl.format(i))
+        if queue is not None:
+            queue.remove()
     return model
@@ -0,0 +1,15 @@
+"""Lazy references (`LazyClass`) to all model classes of `vlmeval.vlm` and `vlmeval.api`.
+
+`vlmeval.config` defines `supported_VLM` with them, so listing or looking up models does not import the model
+modules (and torch / transformers), the module of a model is only imported when the model is instantiated.
+"""
+from .smp.misc import LazyClass
+from .vlm import MODEL_MODULES
+from .api import API_MODULES
+
+__all__ = []
+for _package, _modules in [('vlmeval.vlm', MODEL_MODULES), ('vlmeval.api', API_MODULES)]:
+    for _classes in _modules.values():
+        for _name in _classes:
+            globals()[_name] = LazyClass(f'{_package}.{_name}')
+            __all__.append(_name)
@@ -1,3 +1,4 @@
+import sys
 import logging
 logging.basicConfig(
     format='[%(asctime)s] %(levelname)s - %(filename)s: %(funcName)s - %(lineno)d: %(message)s',
@@ -18,14 +19,12 @@ def get_logger(name, log_file=None, log_level=logging.INFO, file_mode='w'):
     stream_handler = logging.StreamHandler()
     handlers = [stream_handler]
 
-    try:
+    rank = 0
+    # torch.distributed can only be initialized after torch is imported, do not import it just for the check
+    if 'torch' in sys.modules:
         import torch.distributed as dist
         if dist.is_available() and dist.is_initialized():
             rank = dist.get_rank()
-        else:
-            rank = 0
-    except ImportError:
-        rank = 0
 
     if rank == 0 and log_file is not None:
         file_handler = logging.FileHandler(log_file, file_mode)
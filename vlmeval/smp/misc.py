@@ -5,6 +5,7 @@ import csv
 import multiprocessing as mp
 import os
 import os.path as osp
+import re
 from pathlib import Path
 import copy as cp
 import random as rd
@@ -17,7 +18,6 @@ from collections import OrderedDict, defaultdict
 from multiprocessing import Pool, current_process
 from tqdm import tqdm
 import datetime
-import matplotlib.pyplot as plt
 from tabulate import tabulate
 from json import JSONDecoder
 from huggingface_hub import scan_cache_dir
@@ -30,22 +30,27 @@ def modelscope_flag_set():
     return os.environ.get('VLMEVALKIT_USE_MODELSCOPE', None) in ['1', 'True']
 
 
+_PUNCT = [
+    ';', r'/', '[', ']', '"', '{', '}', '(', ')', '=', '+', '\\', '_', '-',
+    '>', '<', '@', '`', ',', '?', '!'
+]
+_COMMA_STRIP = re.compile(r'(\d)(,)(\d)')
+_PERIOD_STRIP = re.compile(r'(?<!\d)\.(?!\d)')
+
+
 def process_punctuation(inText):
-    import re
     outText = inText
-    punct = [
-        ';', r'/', '[', ']', '"', '{', '}', '(', ')', '=', '+', '\\', '_', '-',
-        '>', '<', '@', '`', ',', '?', '!'
-    ]
-    commaStrip  = re.compile(r'(\d)(,)(\d)')
-    periodStrip = re.compile(r'(?<!\d)\.(?!\d)')
-    for p in punct:
-        if (p + ' ' in inText or ' ' + p in inText) or (re.search(
-                commaStrip, inText) is not None):
+    comma_strip = _COMMA_STRIP.search(inText) is not None
+    for p in _PUNCT:
+        if p not in inText:
+            continue
+        if comma_strip or p + ' ' in inText or ' ' + p in inText:
             outText = outText.replace(p, '')
         else:
             outText = outText.replace(p, ' ')
-    outText = periodStrip.sub('', outText, re.UNICODE)
+    # At most 32 periods are stripped, as the VQA reference implementation passes `re.UNICODE` as the count
+    if '.' in outText:
+        outText = _PERIOD_STRIP.sub('', outText, count=re.UNICODE)
     return outText
 
 def h2r(value):
@@ -276,3 +281,34 @@ def get_gpu_memory():
     except Exception as e:
         print(f'{type(e)}: {str(e)}')
         return []
+
+
+class LazyClass:
+    """A reference to a class by its dotted path (e.g. `vlmeval.vlm.InternVLChat`).
+
+    The module is imported on first use: when the reference is called (instantiated) or one of the class
+    attributes is accessed. Can be used as the `func` of a `functools.partial`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.cls = None
+
+    def resolve(self):
+        if self.cls is None:
+            import importlib
+            module, name = self.path.rsplit('.', 1)
+            self.cls = getattr(importlib.import_module(module), name)
+        return self.cls
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Dunder lookups (copy / pickle protocols) and lookups before `__init__` should not trigger the import
+        if name.startswith('__') or 'path' not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return f'LazyClass({self.path})'
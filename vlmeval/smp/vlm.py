@@ -8,6 +8,13 @@ import os.path as osp
 import base64
 from PIL import Image
 import sys
+import time
+import atexit
+import hashlib
+import functools
+import inspect
+import threading
+from collections import OrderedDict
 
 Image.MAX_IMAGE_PIXELS = 1e9
 
@@ -96,6 +103,12 @@ def resize_image_by_factor(img, factor=1):
     return img
 
 
+def _encode_image(img, fmt):
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format=fmt)
+    return base64.b64encode(img_buffer.getvalue()).decode('utf-8')
+
+
 def encode_image_to_base64(img, target_size=-1, fmt='JPEG'):
     # if target_size == -1, will not do resizing
     # else, will set the max_size ot (target_size, target_size)
@@ -103,31 +116,21 @@ def encode_image_to_base64(img, target_size=-1, fmt='JPEG'):
         img = img.convert('RGB')
     if target_size > 0:
         img.thumbnail((target_size, target_size))
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format=fmt)
-    image_data = img_buffer.getvalue()
-    ret = base64.b64encode(image_data).decode('utf-8')
-    max_size = os.environ.get('VLMEVAL_MAX_IMAGE_SIZE', 1e9)
-    min_edge = os.environ.get('VLMEVAL_MIN_IMAGE_EDGE', 1e2)
-    max_size = int(max_size)
-    min_edge = int(min_edge)
+    ret = _encode_image(img, fmt)
+    max_size = int(os.environ.get('VLMEVAL_MAX_IMAGE_SIZE', 1e9))
+    min_edge = int(os.environ.get('VLMEVAL_MIN_IMAGE_EDGE', 1e2))
 
     if min(img.size) < min_edge:
         factor = min_edge / min(img.size)
-        image_new = resize_image_by_factor(img, factor)
-        img_buffer = io.BytesIO()
-        image_new.save(img_buffer, format=fmt)
-        image_data = img_buffer.getvalue()
-        ret = base64.b64encode(image_data).decode('utf-8')
+        ret = _encode_image(resize_image_by_factor(img, factor), fmt)
 
     factor = 1
     while len(ret) > max_size:
-        factor *= 0.7  # Half Pixels Per Resize, approximately
+        # The encoded size is roughly proportional to the number of pixels, so the budget is usually met by a
+        # single resize; the margin (and the loop) covers images that compress worse when downscaled
+        factor *= min(0.9, (max_size / len(ret)) ** 0.5 * 0.95)
         image_new = resize_image_by_factor(img, factor)
-        img_buffer = io.BytesIO()
-        image_new.save(img_buffer, format=fmt)
-        image_data = img_buffer.getvalue()
-        ret = base64.b64encode(image_data).decode('utf-8')
+        ret = _encode_image(image_new, fmt)
 
     if factor < 1:
         new_w, new_h = image_new.size
@@ -139,9 +142,186 @@ def encode_image_to_base64(img, target_size=-1, fmt='JPEG'):
     return ret
 
 
+class EncodedImageCache:
+    """A process-wide, content-addressed cache of encoded images.
+
+    Payloads are keyed by the md5 of the image file and the encoding arguments, so the same image is encoded once
+    no matter how many samples (e.g., circular MCQ variants, sub-datasets of a ConcatDataset) or wrappers refer to
+    it. The memory tier is an LRU bounded by the total length of the payloads. If `disk_dir` is set, payloads are
+    also written there and shared across processes and runs. Concurrent requests of the same payload wait for a
+    single encoding.
+    """
+
+    def __init__(self, max_size, disk_dir=None):
+        self.max_size = max_size
+        self.disk_dir = disk_dir
+        self.size = 0
+        self.data = OrderedDict()
+        self.hashes = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stats = dict(hits=0, disk_hits=0, misses=0, encode_time=0., saved_time=0., saved_bytes=0)
+
+    def content_hash(self, image_path):
+        st = os.stat(image_path)
+        key = (osp.abspath(image_path), st.st_mtime_ns, st.st_size)
+        if key not in self.hashes:
+            hash = hashlib.md5()
+            with open(image_path, 'rb') as fin:
+                for chunk in iter(lambda: fin.read(2 ** 20), b''):
+                    hash.update(chunk)
+            self.hashes[key] = hash.hexdigest()
+        return self.hashes[key]
+
+    def _get(self, key):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                payload, cost = self.data[key]
+                self.stats['hits'] += 1
+                self.stats['saved_time'] += cost
+                self.stats['saved_bytes'] += len(payload)
+                return payload
+        return None
+
+    def _put(self, key, payload, cost):
+        with self.lock:
+            if key in self.data or len(payload) > self.max_size:
+                return
+            self.data[key] = (payload, cost)
+            self.size += len(payload)
+            while self.size > self.max_size:
+                _, (old, _) = self.data.popitem(last=False)
+                self.size -= len(old)
+
+    def get_or_encode(self, image_path, key, encode):
+        """Return the cached payload of (the content of `image_path`, `key`), or compute it with `encode()`."""
+        key = (self.content_hash(image_path), ) + tuple(key)
+        while True:
+            payload = self._get(key)
+            if payload is not None:
+                return payload
+            with self.lock:
+                event = self.pending.get(key)
+                if event is None:
+                    self.pending[key] = threading.Event()
+                    break
+            event.wait()
+        try:
+            disk_path = None
+            if self.disk_dir is not None:
+                digest = hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+                disk_path = osp.join(self.disk_dir, digest[:2], digest + '.b64')
+                if osp.exists(disk_path):
+                    with open(disk_path) as fin:
+                        payload = fin.read()
+                    with self.lock:
+                        self.stats['disk_hits'] += 1
+                        self.stats['saved_bytes'] += len(payload)
+                    self._put(key, payload, 0)
+                    return payload
+            t = time.time()
+            payload = encode()
+            cost = time.time() - t
+            with self.lock:
+                self.stats['misses'] += 1
+                self.stats['encode_time'] += cost
+            self._put(key, payload, cost)
+            if disk_path is not None:
+                os.makedirs(osp.dirname(disk_path), exist_ok=True)
+                tmp = osp.join(osp.dirname(disk_path), f'.{uuid4().hex}.b64')
+                with open(tmp, 'w') as fout:
+                    fout.write(payload)
+                os.replace(tmp, disk_path)
+            return payload
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats, entries=len(self.data), size=self.size)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0
+        return stats
+
+
+_ENCODE_CACHE = None
+_ENCODE_CACHE_LOCK = threading.Lock()
+
+
+def get_encoded_image_cache():
+    """Get the process-wide encoded image cache. The memory tier is bounded by `VLMEVAL_ENCODE_CACHE_MB` (default
+    256). The disk tier is enabled by setting `VLMEVAL_ENCODE_CACHE_DIR` (or `VLMEVAL_ENCODE_CACHE_DIR=1` for
+    `{LMUDataRoot()}/cache/encoded_images`)."""
+    global _ENCODE_CACHE
+    with _ENCODE_CACHE_LOCK:
+        if _ENCODE_CACHE is None:
+            disk_dir = os.environ.get('VLMEVAL_ENCODE_CACHE_DIR', None) or None
+            if disk_dir == '1':
+                from .file import LMUDataRoot
+                disk_dir = osp.join(LMUDataRoot(), 'cache', 'encoded_images')
+            max_size = int(os.environ.get('VLMEVAL_ENCODE_CACHE_MB', 256)) * 2 ** 20
+            _ENCODE_CACHE = EncodedImageCache(max_size, disk_dir=disk_dir)
+            atexit.register(_log_encode_stats)
+    return _ENCODE_CACHE
+
+
+def encoded_image_cache_stats():
+    """The statistics of the encoded image cache: hits / disk_hits / misses, the time spent on encoding, and the
+    encoding time and payload bytes saved by the cache."""
+    return get_encoded_image_cache().get_stats()
+
+
+def _log_encode_stats():
+    stats = _ENCODE_CACHE.get_stats()
+    if stats['hits'] + stats['disk_hits']:
+        from .log import get_logger
+        get_logger('ChatAPI').info(
+            f"Encoded image cache: {stats['hits']} hits, {stats['disk_hits']} disk hits, {stats['misses']} misses, "
+            f"saved {stats['saved_time']:.1f}s of encoding and {stats['saved_bytes'] / 2 ** 20:.1f} MB of payloads. ")
+
+
+def cache_encoded_image(func):
+    """Decorate an image encoder `func(image_path, *args, **kwargs) -> str`, so that its results are cached in the
+    process-wide encoded image cache, keyed by the content of the image and the arguments."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(image_path, *args, **kwargs):
+        arguments = signature.bind(image_path, *args, **kwargs)
+        arguments.apply_defaults()
+        key = (func.__module__, func.__qualname__) + tuple(arguments.arguments.items())[1:]
+        return get_encoded_image_cache().get_or_encode(image_path, key, lambda: func(image_path, *args, **kwargs))
+    return wrapper
+
+
+def _passthrough_ok(image, fmt, target_size, file_size):
+    # The original bytes can be sent as is, if re-encoding would not change the format, the mode or the size
+    if image.format != fmt.upper().replace('JPG', 'JPEG') or image.mode not in ('RGB', 'L'):
+        return False
+    # The EXIF orientation would be dropped by re-encoding, but honored by some providers if present
+    if image.format == 'JPEG' and image.getexif().get(0x0112, 1) != 1:
+        return False
+    if target_size > 0 and max(image.size) > target_size:
+        return False
+    if min(image.size) < int(os.environ.get('VLMEVAL_MIN_IMAGE_EDGE', 1e2)):
+        return False
+    return (file_size + 2) // 3 * 4 <= int(os.environ.get('VLMEVAL_MAX_IMAGE_SIZE', 1e9))
+
+
+@cache_encoded_image
 def encode_image_file_to_base64(image_path, target_size=-1, fmt='JPEG'):
-    image = Image.open(image_path)
-    return encode_image_to_base64(image, target_size=target_size, fmt=fmt)
+    """Encode the image file to base64 (in `fmt`), resized to fit within `target_size` (if > 0).
+
+    Files already in `fmt` that need no conversion or resizing are passed through without re-encoding. Payloads
+    are cached by the content of the file and the arguments (see `EncodedImageCache`).
+    """
+    with Image.open(image_path) as image:
+        if _passthrough_ok(image, fmt, target_size, os.stat(image_path).st_size):
+            with open(image_path, 'rb') as fin:
+                return base64.b64encode(fin.read()).decode('utf-8')
+        return encode_image_to_base64(image, target_size=target_size, fmt=fmt)
 
 
 def decode_base64_to_image(base64_string, target_size=-1):
@@ -159,7 +339,14 @@ def decode_base64_to_image_file(base64_string, image_path, target_size=-1):
     base_dir = osp.dirname(image_path)
     if not osp.exists(base_dir):
         os.makedirs(base_dir, exist_ok=True)
-    image.save(image_path)
+    # Save to a temporary file then rename, so that concurrent readers never see a partially written image
+    tmp_path = osp.join(base_dir, f'.{uuid4().hex}_{osp.basename(image_path)}')
+    try:
+        image.save(tmp_path)
+        os.replace(tmp_path, image_path)
+    finally:
+        if osp.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 def build_option_str(option_dict):
@@ -174,15 +361,56 @@ def isimg(s):
     return osp.exists(s) or s.startswith('http')
 
 
-def read_ok(img_path):
-    if not osp.exists(img_path):
-        return False
+_READ_OK_CACHE = None
+_READ_OK_LOCK = threading.Lock()
+
+
+def _read_ok_cache():
+    # {abspath: (size, mtime_ns, decode_verified)} of validated images, persisted as a journal under LMUDataRoot()
+    global _READ_OK_CACHE
+    with _READ_OK_LOCK:
+        if _READ_OK_CACHE is None:
+            from .file import LMUDataRoot, load_journal
+            path = osp.join(LMUDataRoot(), 'cache', 'read_ok.journal')
+            # Each miss appends a record, compact the journal once it holds stale records
+            _READ_OK_CACHE = (path, load_journal(path, compact=True))
+    return _READ_OK_CACHE
+
+
+def read_ok(img_path, paranoid=None):
+    """Check whether `img_path` is a valid image.
+
+    Validated images are recorded with their size and mtime in a cache persisted under `LMUDataRoot()`, so checking
+    an unchanged file later only costs a `stat`. Other files are probed by parsing the header with PIL. In paranoid
+    mode (`paranoid=True` or `VLMEVAL_PARANOID=1`), images are fully decoded instead, and files only validated by
+    the header probe are verified again.
+    """
+    if paranoid is None:
+        paranoid = os.environ.get('VLMEVAL_PARANOID', '0') == '1'
     try:
-        im = Image.open(img_path)
-        assert im.size[0] > 0 and im.size[1] > 0
+        st = os.stat(img_path)
+    except OSError:
+        return False
+    cache_path, cache = _read_ok_cache()
+    key = osp.abspath(img_path)
+    entry = cache.get(key)
+    if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns) and (entry[2] or not paranoid):
         return True
+    try:
+        with Image.open(img_path) as im:
+            assert im.size[0] > 0 and im.size[1] > 0
+            if paranoid:
+                im.load()
     except:
         return False
+    cache[key] = (st.st_size, st.st_mtime_ns, paranoid)
+    try:
+        from .file import append_journal
+        os.makedirs(osp.dirname(cache_path), exist_ok=True)
+        append_journal({key: cache[key]}, cache_path)
+    except OSError:
+        pass
+    return True
 
 
 def gpt_key_set():
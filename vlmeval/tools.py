@@ -5,7 +5,8 @@ from vlmeval.config import *
 from vlmeval.smp import *
 
 # Define valid modes
-MODES = ('dlist', 'mlist', 'missing', 'circular', 'localize', 'check', 'run', 'eval', 'merge_pkl', 'scan')
+MODES = (
+    'dlist', 'mlist', 'missing', 'circular', 'localize', 'check', 'run', 'eval', 'merge_pkl', 'scan', 'materialize')
 
 CLI_HELP_MSG = \
     f"""
@@ -38,6 +39,8 @@ CLI_HELP_MSG = \
             vlmutil merge_pkl [pkl_dir] [world_size]
         10. Scan evaluation results and detect api failure
             vlmutil scan --model [model_list.txt or model_names] --data [dataset_names] --root [root_dir]
+        11. Decode and write all images of datasets before inference (resumable)
+            vlmutil materialize [dataset_names] --nproc [num_workers] [--paranoid]
     GitHub: https://github.com/open-compass/VLMEvalKit
     """  # noqa: E501
 
@@ -453,6 +456,16 @@ def parse_args_eval():
     return args
 
 
+def parse_args_materialize():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('cmd', type=str)
+    parser.add_argument('data', type=str, nargs='+')
+    parser.add_argument('--nproc', type=int, default=16)
+    parser.add_argument('--paranoid', action='store_true')
+    args = parser.parse_args()
+    return args
+
+
 def parse_args_scan():
     parser = argparse.ArgumentParser()
     parser.add_argument('--model', type=str, nargs='+')
@@ -477,14 +490,17 @@ def MERGE_PKL(pkl_dir, world_size=1):
         prefs.extend([f'{i}{ws}_' for i in range(ws)])
     prefs = set(prefs)
     files = os.listdir(pkl_dir)
-    files = [x for x in files if x[:3] in prefs]
+    # Records of an interrupted run may still be in the journal `{file}.journal`
+    files = set(x[:-len('.journal')] if x.endswith('.journal') else x for x in files if x[:3] in prefs)
     # Merge the files
     res_all = defaultdict(dict)
     for f in files:
         full_path = osp.join(pkl_dir, f)
         key = f[3:]
-        res_all[key].update(load(full_path))
-        os.remove(full_path)
+        res_all[key].update(load_records(full_path))
+        for pth in [full_path, full_path + '.journal']:
+            if osp.exists(pth):
+                os.remove(pth)
 
     dump_prefs = [f'{i}{world_size}_' for i in range(world_size)]
     for k in res_all:
@@ -639,6 +655,17 @@ def cli():
         args[2] = int(args[2])
         assert args[2] in [1, 2, 4, 8]
         MERGE_PKL(args[1], args[2])
+    elif args[0].lower() == 'materialize':
+        from vlmeval.dataset import build_dataset
+        args = parse_args_materialize()
+        if args.paranoid:
+            os.environ['VLMEVAL_PARANOID'] = '1'
+        for dataset_name in args.data:
+            dataset = build_dataset(dataset_name)
+            if not hasattr(dataset, 'materialize'):
+                logger.warning(f'{dataset_name} does not support materialize, skipped. ')
+                continue
+            dataset.materialize(nproc=args.nproc)
     elif args[0].lower() == 'scan':
         args, unknownargs = parse_args_scan()
         # The default value is only for the maintainer usage
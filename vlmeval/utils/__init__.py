@@ -1,7 +1,10 @@
-from .matching_util import can_infer, can_infer_option, can_infer_text, can_infer_sequence, can_infer_lego
-from .mp_util import track_progress_rich
+from .matching_util import (
+    can_infer, can_infer_many, can_infer_option, can_infer_text, can_infer_sequence, can_infer_lego
+)
+from .mp_util import track_progress_rich, prefetch, WorkQueue, eval_map, get_eval_pool
 
 
 __all__ = [
-    'can_infer', 'can_infer_option', 'can_infer_text', 'track_progress_rich', 'can_infer_sequence', 'can_infer_lego',
+    'can_infer', 'can_infer_many', 'can_infer_option', 'can_infer_text', 'track_progress_rich', 'can_infer_sequence',
+    'can_infer_lego', 'prefetch', 'WorkQueue', 'eval_map', 'get_eval_pool',
 ]
@@ -0,0 +1,71 @@
+import warnings
+
+# The cost of an image / video in `message_cost`, roughly the number of characters of a typical visual token sequence
+VISUAL_COST = 1024
+
+
+def message_cost(message):
+    """A rough, model-agnostic estimate of the sequence length of a message:
+    the number of text characters plus a fixed cost for each image / video."""
+    if isinstance(message, str):
+        return len(message)
+    cost = 0
+    for item in message:
+        if isinstance(item, str):
+            cost += len(item)
+        elif item['type'] == 'text':
+            cost += len(item['value'])
+        else:
+            cost += VISUAL_COST
+    return cost
+
+
+def message_layout(message):
+    """The (#images, #videos) of a message. Most models can only batch inputs with the same layout."""
+    if isinstance(message, str):
+        return (0, 0)
+    types = [item['type'] for item in message if isinstance(item, dict)]
+    return (types.count('image'), types.count('video'))
+
+
+def make_batches(messages, batch_size):
+    """Split the messages into batches (lists of positions) of at most `batch_size` messages.
+
+    Messages are first bucketed by their layout, then sorted by `message_cost` within each bucket, so that each
+    batch holds messages of similar lengths and little compute is wasted on padding. Positions of all messages
+    are covered exactly once, and the batches of each bucket are ordered from short to long.
+    """
+    assert batch_size >= 1
+    buckets = {}
+    for i, msg in enumerate(messages):
+        buckets.setdefault(message_layout(msg), []).append(i)
+    batches = []
+    for layout in sorted(buckets):
+        positions = sorted(buckets[layout], key=lambda i: message_cost(messages[i]))
+        batches.extend(positions[i: i + batch_size] for i in range(0, len(positions), batch_size))
+    return batches
+
+
+def generate_batch_with_fallback(model, messages, dataset=None, generate_one=None):
+    """Generate with `model.generate_batch`. If the batched call fails, fall back to per-sample generation.
+
+    Args:
+        model: The VLM, which should implement `generate_batch`.
+        messages (list): The input messages.
+        dataset (str, optional): The name of the dataset. Defaults to None.
+        generate_one (callable, optional): The function used for per-sample generation.
+            Defaults to `model.generate(message=..., dataset=dataset)`.
+
+    Returns:
+        list[str]: The responses, in the same order as `messages`.
+    """
+    if generate_one is None:
+        def generate_one(message):
+            return model.generate(message=message, dataset=dataset)
+    try:
+        responses = model.generate_batch(messages, dataset=dataset)
+        assert len(responses) == len(messages), f'Expect {len(messages)} responses, got {len(responses)}. '
+        return list(responses)
+    except Exception as err:
+        warnings.warn(f'Batched generation failed ({type(err)}: {err}), will fall back to per-sample generation. ')
+        return [generate_one(msg) for msg in messages]
@@ -1,6 +1,7 @@
 import string
 import copy as cp
 import os
+import numpy as np
 from ..smp import *
 import re
 
@@ -117,6 +118,74 @@ def can_infer(answer, choices):
     return copt if copt else can_infer_text(answer, choices)
 
 
+# The separators used by `can_infer_option`: whitespaces and the punctuations replaced by spaces
+_OPTION_SEP = r'\s.()\[\],:;!*#{}'
+_OPTION_TOKEN = re.compile(f'[^{_OPTION_SEP}]+')
+_OPTION_REJECT = [
+    "Sorry, I can't help with images of people yet.",
+    "I can't process this file.",
+    "I'm sorry, but without the image provided",
+    'Cannot determine the answer'
+]
+
+
+def _first_token(answers, ch):
+    """The position of the first token `ch` in each answer (as split by `can_infer_option`), NaN if absent."""
+    prefix = answers.str.extract(f'^(.*?)(?<![^{_OPTION_SEP}]){ch}(?![^{_OPTION_SEP}])', flags=re.S)[0]
+    return prefix.str.count(_OPTION_TOKEN.pattern)
+
+
+def can_infer_many(predictions, choices_frame):
+    """The batch version of `can_infer`, returns the same as `[can_infer(p, build_choices(row)) for ...]`.
+
+    Args:
+        predictions (list[str] | pd.Series): The predictions.
+        choices_frame (pd.DataFrame): The options, in the columns named by choice labels (A, B, ...), NaN if
+            an option does not exist. Aligned with `predictions` by position.
+
+    Returns:
+        list: The inferred choice label (or 'Z') of each prediction, False if it cannot be inferred.
+    """
+    answers = pd.Series([str(x) for x in predictions], dtype=object)
+    n = len(answers)
+    if n == 0:
+        return []
+    labels = [ch for ch in string.ascii_uppercase if ch in choices_frame]
+    options = choices_frame[labels].reset_index(drop=True)
+    valid = options.notna()
+
+    # Heuristic 1 (`can_infer_option`): a single choice label as a separate token, near the end of the answer
+    ntok = answers.str.count(_OPTION_TOKEN.pattern)
+    pos = {ch: _first_token(answers, ch) for ch in set(labels) | {'A', 'Z'}}
+    found = pd.DataFrame({ch: pos[ch].notna() & valid[ch] for ch in labels}, index=answers.index, dtype=bool)
+    count = found.sum(axis=1)
+    ret = pd.Series(False, index=answers.index, dtype=object)
+    for ch in labels:
+        ret[(count == 1) & found[ch] & (pos[ch] > ntok - 5)] = ch
+    ret[(count == 0) & pos['Z'].notna()] = 'Z'
+    failed = answers.str.contains('Failed to obtain answer via API', regex=False)
+    rejected = pd.concat([answers.str.contains(err, regex=False) for err in _OPTION_REJECT], axis=1).any(axis=1)
+    if os.environ.get('VERBOSE', 0):
+        quantifier = (count == 1) & pos['A'].notna() & (ntok > 3) & ~failed & ~rejected
+        for answer in answers[quantifier]:
+            get_logger('Evaluation').info(f'A might be a quantifier in the string: {answer}.')
+        ret[quantifier] = False
+    ret[rejected] = 'Z'
+    ret[failed] = False
+
+    # Heuristic 2 (`can_infer_text`): the content of a single option appears in the answer
+    lower = answers.str.lower()
+    texts = options.astype(object).where(valid, '').astype(str)
+    total = texts.apply(lambda col: col.str.len()).sum(axis=1)
+    todo = (ret == False) & (lower.str.len() <= 2 * total)  # noqa: E712
+    texts, valid = texts.to_numpy(dtype=object), valid.to_numpy()
+    for i in np.flatnonzero(todo.to_numpy()):
+        cands = [ch for ch, v, m in zip(labels, texts[i], valid[i]) if m and v.lower() in lower[i]]
+        if len(cands) == 1:
+            ret[i] = cands[0]
+    return ret.tolist()
+
+
 def can_infer_lego(answer, question_type, choices):
     answer = str(answer)
     if question_type == 'sort':
@@ -6,9 +6,64 @@ from rich.progress import (BarColumn, MofNCompleteColumn, Progress, Task,
                            TaskProgressColumn, TextColumn, TimeRemainingColumn)
 from rich.text import Text
 import os.path as osp
-import time
+import atexit
+import asyncio
+import inspect
+import threading
 import portalocker
-from ..smp import load, dump
+from ..smp import load, dump, append_journal, load_journal, dump_records
+
+
+def _journal_path(save):
+    return save + '.journal'
+
+
+def _recover(save):
+    """Load the records in `save`, and fold in the journal left by an interrupted run (if any).
+
+    Returns:
+        tuple(dict, set): All records, and the keys recovered from the journal.
+    """
+    journal = _journal_path(save)
+    if not osp.exists(save):
+        # `save` was removed on purpose, the stale journal should not resurrect old records
+        if osp.exists(journal):
+            os.remove(journal)
+        dump({}, save)
+    res = load(save)
+    recovered = set()
+    if osp.exists(journal):
+        records = load_journal(journal)
+        recovered = {k for k in records if k not in res}
+        res.update(records)
+        dump_records(res, save)
+    return res, recovered
+
+
+async def _track_progress_async(func, tasks, nproc, todo, results, on_finish):
+    from tqdm import tqdm
+    sem = asyncio.Semaphore(nproc)
+    pbar = tqdm(total=len(tasks), initial=len(tasks) - len(todo))
+
+    async def run(idx):
+        inputs = tasks[idx]
+        if not isinstance(inputs, (tuple, list, dict)):
+            inputs = (inputs, )
+        async with sem:
+            if isinstance(inputs, dict):
+                results[idx] = await func(**inputs)
+            else:
+                results[idx] = await func(*inputs)
+        on_finish(idx)
+        pbar.update(1)
+
+    try:
+        await asyncio.gather(*[run(idx) for idx in todo])
+    finally:
+        pbar.close()
+        # `asyncio.run` closes the loop when we return, close the HTTP client bound to it first
+        from ..api.base import close_async_client
+        await close_async_client()
 
 
 def track_progress_rich(
@@ -18,13 +73,18 @@ def track_progress_rich(
         save=None,
         keys=None,
         **kwargs) -> list:
+    """Apply `func` to all `tasks` with `nproc` workers, and return the results in order.
 
-    from concurrent.futures import ThreadPoolExecutor
+    If `save` and `keys` are given, `save` will contain {key: result} for all finished tasks when the function
+    returns. Meanwhile, each finished result is appended to the journal `{save}.journal`, so an interrupted run
+    loses nothing: the journal is folded into `save` at the next call, and the tasks it covers are not re-run.
+    Coroutine functions (e.g., `BaseAPI.agenerate`) are driven from a single event loop with at most `nproc`
+    calls in flight.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     from tqdm import tqdm
     if save is not None:
         assert osp.exists(osp.dirname(save)) or osp.dirname(save) == ''
-        if not osp.exists(save):
-            dump({}, save)
     if keys is not None:
         assert len(keys) == len(tasks)
     if not callable(func):
@@ -33,40 +93,177 @@ def track_progress_rich(
         raise TypeError(
             f'tasks must be an iterable object, but got {type(tasks)}')
     assert nproc > 0, 'nproc must be a positive number'
-    res = load(save) if save is not None else {}
+    tasks = list(tasks)
+    res, recovered = _recover(save) if save is not None else ({}, set())
     results = [None for _ in range(len(tasks))]
 
-    with ThreadPoolExecutor(max_workers=nproc) as executor:
-        futures = []
+    todo = []
+    for idx in range(len(tasks)):
+        if keys is not None and keys[idx] in recovered:
+            results[idx] = res[keys[idx]]
+        else:
+            todo.append(idx)
 
-        for inputs in tasks:
-            if not isinstance(inputs, (tuple, list, dict)):
-                inputs = (inputs, )
-            if isinstance(inputs, dict):
-                future = executor.submit(func, **inputs)
-            else:
-                future = executor.submit(func, *inputs)
-            futures.append(future)
-
-        unfinished = set(range(len(tasks)))
-        pbar = tqdm(total=len(unfinished))
-        while len(unfinished):
-            new_finished = set()
-            for idx in unfinished:
-                if futures[idx].done():
-                    results[idx] = futures[idx].result()
-                    new_finished.add(idx)
-                    if keys is not None:
-                        res[keys[idx]] = results[idx]
-            if len(new_finished):
-                if save is not None:
-                    dump(res, save)
-                pbar.update(len(new_finished))
-                for k in new_finished:
-                    unfinished.remove(k)
-            time.sleep(0.1)
-        pbar.close()
+    def on_finish(idx):
+        if keys is not None:
+            res[keys[idx]] = results[idx]
+            if save is not None:
+                append_journal({keys[idx]: results[idx]}, _journal_path(save))
+
+    if inspect.iscoroutinefunction(func):
+        asyncio.run(_track_progress_async(func, tasks, nproc, todo, results, on_finish))
+    else:
+        with ThreadPoolExecutor(max_workers=nproc) as executor:
+            futures = {}
+            for idx in todo:
+                inputs = tasks[idx]
+                if not isinstance(inputs, (tuple, list, dict)):
+                    inputs = (inputs, )
+                if isinstance(inputs, dict):
+                    future = executor.submit(func, **inputs)
+                else:
+                    future = executor.submit(func, *inputs)
+                futures[future] = idx
+
+            pbar = tqdm(total=len(tasks), initial=len(tasks) - len(todo))
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+                on_finish(idx)
+                pbar.update(1)
+            pbar.close()
 
     if save is not None:
-        dump(res, save)
+        dump_records(res, save)
     return results
+
+
+def prefetch(func, items, depth=4, nproc=None):
+    """Yield `func(item)` for each item, in order, while computing up to `depth` items ahead in a thread pool
+    of `nproc` workers (defaults to `depth`).
+
+    Used to overlap prompt building (image decoding / dumping, frame extraction) with model generation.
+    At most `depth` results are buffered, so a slow consumer throttles the producers. If `depth` <= 0,
+    items are processed serially in the calling thread.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    if depth <= 0:
+        for item in items:
+            yield func(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=nproc or depth)
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) > depth:
+                yield pending.popleft().result()
+        while len(pending):
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Below this number of items, `eval_map` runs in-process: pickling the items costs more than it saves
+EVAL_MIN_PARALLEL = 256
+
+_EVAL_POOL = None
+_EVAL_POOL_LOCK = threading.Lock()
+
+
+def eval_nproc():
+    """The number of processes of the shared evaluation pool: the env variable `VLMEVAL_EVAL_NPROC` if set, else
+    the number of CPUs this process may run on."""
+    nproc = int(os.environ.get('VLMEVAL_EVAL_NPROC', 0))
+    if nproc > 0:
+        return nproc
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_eval_pool():
+    """Get the process pool shared by the `evaluate` of all datasets, create it at the first call.
+
+    Creating a pool per evaluation pays the fork / teardown costs for each dataset, and several pools running at
+    the same time oversubscribe the CPUs. The pool lives until the interpreter exits.
+    """
+    global _EVAL_POOL
+    with _EVAL_POOL_LOCK:
+        if _EVAL_POOL is None:
+            _EVAL_POOL = Pool(eval_nproc())
+            atexit.register(_EVAL_POOL.terminate)
+    return _EVAL_POOL
+
+
+def eval_map(func, items, chunksize=None, min_parallel=EVAL_MIN_PARALLEL):
+    """Apply `func` to all `items` in the shared evaluation pool, and return the results in order.
+
+    Items are submitted in chunks (`chunksize` defaults to about 4 chunks per process, at most 64 items each).
+    With fewer than `min_parallel` items, or a single process, `func` is applied in-process instead.
+    """
+    items = list(items)
+    nproc = eval_nproc()
+    if nproc <= 1 or len(items) < min_parallel:
+        return [func(x) for x in items]
+    if chunksize is None:
+        chunksize = max(1, min(64, len(items) // (4 * nproc)))
+    return list(get_eval_pool().imap(func, items, chunksize=chunksize))
+
+
+class WorkQueue:
+    """A queue of work chunks shared by all ranks of a job through the file system.
+
+    Rank 0 creates the queue with `WorkQueue.create`, then (after a barrier) every rank pulls chunks with `pop`
+    until it returns None. The chunks are written once; only the position of the next chunk is shared, and it is
+    guarded by a `portalocker` file lock. Fast ranks simply pull more chunks, so no rank ends up as the straggler
+    that everyone waits for. Chunk sizes are guided: large chunks first (few lock round-trips), small chunks at
+    the tail (ranks finish at about the same time).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.chunks = load(path)
+
+    @staticmethod
+    def make_chunks(items, world_size, min_chunk=1):
+        items, chunks = list(items), []
+        while len(items):
+            size = max(min_chunk, -(-len(items) // (2 * world_size)))
+            chunks.append(items[:size])
+            items = items[size:]
+        return chunks
+
+    @classmethod
+    def create(cls, path, items, world_size, min_chunk=1):
+        dump(cls.make_chunks(items, world_size, min_chunk), path)
+        cls._set_next(path, 0)
+        return cls(path)
+
+    @staticmethod
+    def _set_next(path, pos):
+        # Replace the counter atomically, so that it is never seen half-written
+        with open(path + '.next.tmp', 'w') as fout:
+            fout.write(str(pos))
+        os.replace(path + '.next.tmp', path + '.next')
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def pop(self):
+        """Pull the next chunk, return None if the queue is drained."""
+        with portalocker.Lock(self.path + '.lock', 'w', timeout=600):
+            with open(self.path + '.next') as fin:
+                pos = int(fin.read())
+            if pos >= len(self.chunks):
+                return None
+            self._set_next(self.path, pos + 1)
+        return self.chunks[pos]
+
+    def remove(self):
+        for suffix in ['', '.next', '.lock']:
+            if osp.exists(self.path + suffix):
+                os.remove(self.path + suffix)
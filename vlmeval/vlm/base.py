@@ -108,12 +108,35 @@ class BaseModel:
         Returns:
             str: The generated message.
         """
+        message = self._check_message(message)
+        return self.generate_inner(message, dataset)
+
+    def generate_batch(self, messages, dataset=None):
+        """Generate the output messages for a batch of inputs.
+
+        Models that support batched inference should implement `generate_batch_inner(messages, dataset=None)`,
+        which receives a list of preprocessed messages and returns a list of outputs.
+        Otherwise, `generate_inner` will be called on each message.
+
+        Args:
+            messages (list[list[dict]]): The input messages.
+            dataset (str, optional): The name of the dataset. Defaults to None.
+
+        Returns:
+            list[str]: The generated messages.
+        """
+        messages = [self._check_message(message) for message in messages]
+        if hasattr(self, 'generate_batch_inner'):
+            return self.generate_batch_inner(messages, dataset)
+        return [self.generate_inner(message, dataset) for message in messages]
+
+    def _check_message(self, message):
         assert self.check_content(message) in ['str', 'dict', 'liststr', 'listdict'], f'Invalid input type: {message}'
         message = self.preproc_content(message)
         assert message is not None and self.check_content(message) == 'listdict'
         for item in message:
             assert item['type'] in self.allowed_types, f'Invalid input type: {item["type"]}'
-        return self.generate_inner(message, dataset)
+        return message
 
     def chat(self, messages, dataset=None):
         """The main function for multi-turn chatting. Will call `chat_inner` with the preprocessed input messages."""